@@ -8,6 +8,7 @@ import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List
 
@@ -23,6 +24,10 @@ from decoder.sentiment_flow_analyzer import SentimentFlowAnalyzer, ForecastingMo
 from decoder.institutional_flow_detector import InstitutionalFlowDetector
 from decoder.ml_pattern_recognizer import MLPatternRecognizer
 from decoder.smart_alert_manager import SmartAlertManager
+from decoder.alert_batch import AlertBatch, VectorAlertPipeline
+from decoder.alert_history import AlertHistoryStore
+from decoder.streaming_indicators import StreamingIndicatorEngine
+from decoder.rule_compiler import compile_rules, rule_fingerprint
 
 # Import Phase 5 advanced features
 from executor.community_simulator import CommunitySimulator
@@ -32,15 +37,27 @@ from utils.telegram_bot import TelegramEngagementBot
 
 # Import Phase 1-4 AI Strategist features
 from utils.event_normalizer import EventNormalizer
-from decoder.knowledge_graph import KG, AutoLinker
+from utils.asset_matcher import AssetMatcher
+from utils.cycle_snapshot import CycleSnapshotStore
+from utils.event_pipeline import EventBatchNormalizer, NormalizedEventBatch
+from decoder.knowledge_graph import AutoLinker
+from decoder.kg_store import KnowledgeGraphStore
 from decoder.regime_engine import RegimeEngine
+from decoder.regime_tracker import RegimeTracker
 from decoder.causal_engine import CausalEngine
+from decoder.batch_causal import BatchCausalScreener
 
 # Import Phases 5-8 features
 from decoder.decision_policy import DecisionPolicy
 from utils.post_mortem import Verdicts
 from decoder.gpt_integration import GPTIntegrator
+from decoder.llm_gateway import LLMGateway
 from decoder.advanced_models import AdvancedModels
+from decoder.batch_forecaster import BatchForecaster
+from utils.stage_cache import StageCache, fingerprint, table_watermark
+from utils.cycle_profiler import CycleProfiler
+from utils.cycle_budget import CycleBudgetRunner
+from utils.feature_scheduler import FeatureScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -62,9 +79,56 @@ class AdvancedTradingOrchestrator:
         self.institutional_detector = InstitutionalFlowDetector(self.config, db_path)
         self.ml_recognizer = MLPatternRecognizer(self.config, db_path)
         self.alert_manager = SmartAlertManager(self.config, db_path)
+        self.alert_pipeline = VectorAlertPipeline(self.config)
+        self.get_alert_history()
+        self.indicator_engine = StreamingIndicatorEngine(self.config)
+        self.rule_plan = compile_rules(self.config)
+        
+        # Cross-cycle stage output cache keyed by input fingerprints, with per-stage TTLs as an upper bound
+        cache_config = self.config.get('orchestrator', {}).get('stage_cache', {})
+        self.stage_cache = StageCache(
+            max_age_seconds=cache_config.get('max_age_seconds', 300),
+            enabled=cache_config.get('enabled', True),
+            ttl_seconds=cache_config.get('ttl_seconds', {})
+        )
+        self.config_version = fingerprint(self.config)
+        self.input_watermarks: Dict = {}
+        
+        # Per-stage latency histograms and opt-in cycle profiling
+        profiling_config = self.config.get('orchestrator', {}).get('profiling', {})
+        self.profiler = CycleProfiler(
+            histogram_window=profiling_config.get('histogram_window', 500),
+            profiling_enabled=profiling_config.get('enabled', False),
+            backend=profiling_config.get('backend', 'cprofile'),
+            top_functions=profiling_config.get('top_functions', 30)
+        )
+        
+        # Deadline-aware stage execution with stale fallbacks
+        budget_config = self.config.get('orchestrator', {}).get('cycle_budget', {})
+        self.cycle_budget = CycleBudgetRunner(
+            total_seconds=budget_config.get('total_seconds', 25),
+            default_stage_seconds=budget_config.get('default_stage_seconds', 10),
+            stage_seconds=budget_config.get('stage_seconds', {}),
+            demote_after_overruns=budget_config.get('demote_after_overruns', 3),
+            promote_after_successes=budget_config.get('promote_after_successes', 5),
+            max_interval_cycles=budget_config.get('max_interval_cycles', 16),
+            enabled=budget_config.get('enabled', True)
+        )
+        # Cycles share profiler, budget deadline and cProfile state, so only one runs at a time
+        self.cycle_lock = asyncio.Lock()
+        self.cycles_waited = 0
+        
+        # Frequency tiers for feature groups that do not need per-cycle freshness
+        self.feature_scheduler = FeatureScheduler(
+            self.config.get('orchestrator', {}).get('feature_cadence', {})
+        )
         
         # Initialize Phase 5 advanced features
         self.forecasting_module = ForecastingModule(self.sentiment_analyzer)
+        self.batch_forecaster = BatchForecaster(
+            self.config,
+            fallback=lambda symbol, horizon: self.forecasting_module.predict_events(symbol, horizon, 'market')
+        )
         self.reddit_poster = RedditPoster()
         self.community_simulator = CommunitySimulator(self.reddit_poster)
         self.user_acquisition = UserAcquisition(self.reddit_poster)
@@ -72,10 +136,14 @@ class AdvancedTradingOrchestrator:
         
         # Initialize Phase 1-4 AI Strategist features
         self.event_normalizer = EventNormalizer(db_path)
-        self.knowledge_graph = KG(db_path)
+        self.knowledge_graph = KnowledgeGraphStore(
+            db_path, self.config.get('ai_strategist_features', {}).get('knowledge_graph', {})
+        )
         self.auto_linker = AutoLinker(self.knowledge_graph)
         self.regime_engine = RegimeEngine(db_path, equity_scanner=None, binance_scanner=None)
+        self.regime_tracker = RegimeTracker(self.config)
         self.causal_engine = CausalEngine(db_path, equity_scanner=None, binance_scanner=None)
+        self.causal_screener = BatchCausalScreener(self.config)
         
         # Initialize Phases 5-8 features
         self.decision_policy = DecisionPolicy(db_path)
@@ -84,6 +152,7 @@ class AdvancedTradingOrchestrator:
         # Check for OpenAI API key and initialize GPT integration
         openai_key = os.getenv('OPENAI_API_KEY')
         self.gpt_integrator = GPTIntegrator(openai_key or "")
+        self.llm_gateway = LLMGateway(self.gpt_integrator, self.config)
         
         self.advanced_models = AdvancedModels()
         
@@ -98,6 +167,16 @@ class AdvancedTradingOrchestrator:
             # Create default configurations if they don't exist
             self.create_default_configs()
         
+        # Compiled once here; normalize_events rebuilds it when assets-config.json changes
+        self.asset_matcher = AssetMatcher(self.assets_config, config_path='assets-config.json')
+        
+        # Batch normalization stage shared by the decoders
+        self.event_pipeline = EventBatchNormalizer(self.config, asset_matcher=self.asset_matcher)
+        self.last_event_batch = None
+        
+        # Last completed cycle, served by the API without recomputation
+        self.cycle_snapshots = CycleSnapshotStore()
+        
         # Get symbol list (top assets for analysis)
         self.symbols = self.get_analysis_symbols()
         
@@ -252,10 +331,59 @@ class AdvancedTradingOrchestrator:
             logger.error(f"Error getting enhancement status: {e}")
             return {'error': str(e)}
     
+    # Inputs each analysis stage reads; the stage cache hashes their fingerprints
+    STAGE_INPUTS = {
+        'multi_timeframe': ('market',),
+        'correlation_matrix': ('market',),
+        'signal_generation': ('market', 'sentiment', 'regime'),
+        'portfolio_optimization': ('market', 'regime'),
+        'sentiment_flow': ('sentiment',),
+        'institutional_flow': ('market',),
+        'ml_patterns': ('market', 'regime')
+    }
+    SENTIMENT_TABLES = ('news_articles',)
+    
+    def refresh_input_watermarks(self):
+        """Sample the sentiment tables once per cycle rather than once per stage"""
+        self.input_watermarks = {
+            table: table_watermark(self.db_path, table) for table in self.SENTIMENT_TABLES
+        }
+    
+    def get_stage_inputs(self, stage: str, symbols: List[str]) -> Dict:
+        """Fingerprints of the inputs declared for a stage"""
+        inputs = {'symbols': list(symbols), 'config_version': self.config_version}
+        declared = self.STAGE_INPUTS.get(stage, ('market', 'sentiment', 'regime'))
+        
+        if 'market' in declared:
+            inputs['last_bar'] = self.indicator_engine.last_bar_times(symbols)
+        if 'sentiment' in declared:
+            inputs['sentiment_rows'] = self.input_watermarks
+            inputs['sentiment_updates'] = self.indicator_engine.sentiment_counts(symbols)
+        if 'regime' in declared:
+            inputs['regime_version'] = self.regime_tracker.version
+        
+        return inputs
+    
+    async def run_budgeted(self, stage: str, compute, symbol: str = None):
+        """Run a stage inside its profiler span and cycle budget"""
+        key = f'{stage}:{symbol}' if symbol else stage
+        with self.profiler.span(stage, symbol):
+            return await self.cycle_budget.run(stage, compute, key=key)
+    
+    async def run_stage(self, stage: str, symbols: List[str], compute, symbol: str = None):
+        """Run one analysis stage through the profiler, cycle budget and stage cache"""
+        cache_key = f'{stage}:{symbol}' if symbol else stage
+        return await self.run_budgeted(
+            stage,
+            lambda: self.stage_cache.get_or_compute(cache_key, self.get_stage_inputs(stage, symbols), compute),
+            symbol=symbol
+        )
+    
     async def run_full_analysis(self) -> Dict:
         """Run complete advanced analysis across all systems"""
         self.logger.info("Starting comprehensive advanced market analysis...")
         
+        analysis_start = time.perf_counter()
         results = {
             'analysis_start_time': datetime.now().isoformat(),
             'symbols_analyzed': self.symbols,
@@ -263,12 +391,18 @@ class AdvancedTradingOrchestrator:
         }
         
         try:
+            await asyncio.to_thread(self.refresh_input_watermarks)
+            
             # 1. Multi-timeframe analysis
             self.logger.info("Running multi-timeframe analysis...")
             timeframe_results = {}
             for symbol in self.symbols[:5]:  # Analyze top 5 symbols
                 try:
-                    timeframe_results[symbol] = await self.multi_timeframe.analyze_multi_timeframe(symbol)
+                    timeframe_results[symbol] = await self.run_stage(
+                        'multi_timeframe', [symbol],
+                        lambda symbol=symbol: self.multi_timeframe.analyze_multi_timeframe(symbol),
+                        symbol=symbol
+                    )
                 except Exception as e:
                     self.logger.error(f"Multi-timeframe analysis failed for {symbol}: {e}")
                     timeframe_results[symbol] = {'error': str(e)}
@@ -279,8 +413,9 @@ class AdvancedTradingOrchestrator:
             # 2. Correlation analysis
             self.logger.info("Running correlation matrix analysis...")
             try:
-                correlation_results = await self.correlation_engine.run_correlation_analysis(
-                    self.symbols, self.sectors_config
+                correlation_results = await self.run_stage(
+                    'correlation_matrix', self.symbols,
+                    lambda: self.correlation_engine.run_correlation_analysis(self.symbols, self.sectors_config)
                 )
                 results['correlation_analysis'] = correlation_results
                 results['features_analyzed'].append('correlation_matrix')
@@ -291,7 +426,15 @@ class AdvancedTradingOrchestrator:
             # 3. Signal generation
             self.logger.info("Generating advanced trading signals...")
             try:
-                signal_results = await self.signal_engine.run_signal_generation(self.symbols)
+                signal_results = await self.run_stage(
+                    'signal_generation', self.symbols,
+                    lambda: self.signal_engine.run_signal_generation(self.symbols)
+                )
+                if isinstance(signal_results, dict):
+                    # Copy so live indicator state is never written into the cached stage output
+                    signal_results = dict(signal_results)
+                    signal_results['indicator_snapshot'] = self.indicator_engine.snapshot()
+                    signal_results['rule_signals'] = self.evaluate_signal_rules()
                 results['trading_signals'] = signal_results
                 results['features_analyzed'].append('signal_generation')
             except Exception as e:
@@ -301,8 +444,9 @@ class AdvancedTradingOrchestrator:
             # 4. Portfolio optimization
             self.logger.info("Running portfolio optimization...")
             try:
-                portfolio_results = await self.portfolio_optimizer.run_portfolio_optimization(
-                    self.symbols[:8], self.sectors_config
+                portfolio_results = await self.run_stage(
+                    'portfolio_optimization', self.symbols[:8],
+                    lambda: self.portfolio_optimizer.run_portfolio_optimization(self.symbols[:8], self.sectors_config)
                 )
                 results['portfolio_optimization'] = portfolio_results
                 results['features_analyzed'].append('portfolio_optimization')
@@ -315,7 +459,11 @@ class AdvancedTradingOrchestrator:
             sentiment_results = {}
             for symbol in self.symbols[:3]:  # Top 3 symbols for sentiment analysis
                 try:
-                    sentiment_results[symbol] = await self.sentiment_analyzer.analyze_sentiment_flow(symbol)
+                    sentiment_results[symbol] = await self.run_stage(
+                        'sentiment_flow', [symbol],
+                        lambda symbol=symbol: self.sentiment_analyzer.analyze_sentiment_flow(symbol),
+                        symbol=symbol
+                    )
                 except Exception as e:
                     self.logger.error(f"Sentiment analysis failed for {symbol}: {e}")
                     sentiment_results[symbol] = {'error': str(e)}
@@ -326,8 +474,9 @@ class AdvancedTradingOrchestrator:
             # 6. Institutional flow detection
             self.logger.info("Detecting institutional flows...")
             try:
-                institutional_results = await self.institutional_detector.run_institutional_detection(
-                    self.symbols[:8]
+                institutional_results = await self.run_stage(
+                    'institutional_flow', self.symbols[:8],
+                    lambda: self.institutional_detector.run_institutional_detection(self.symbols[:8])
                 )
                 results['institutional_analysis'] = institutional_results
                 results['features_analyzed'].append('institutional_flow')
@@ -338,7 +487,10 @@ class AdvancedTradingOrchestrator:
             # 7. ML pattern recognition
             self.logger.info("Running ML pattern recognition...")
             try:
-                ml_results = await self.ml_recognizer.run_ml_pattern_recognition(self.symbols[:6])
+                ml_results = await self.run_stage(
+                    'ml_patterns', self.symbols[:6],
+                    lambda: self.ml_recognizer.run_ml_pattern_recognition(self.symbols[:6])
+                )
                 results['ml_pattern_analysis'] = ml_results
                 results['features_analyzed'].append('ml_patterns')
             except Exception as e:
@@ -351,10 +503,7 @@ class AdvancedTradingOrchestrator:
         
         results['analysis_end_time'] = datetime.now().isoformat()
         
-        analysis_duration = (
-            datetime.fromisoformat(results['analysis_end_time']) - 
-            datetime.fromisoformat(results['analysis_start_time'])
-        ).total_seconds()
+        analysis_duration = time.perf_counter() - analysis_start
         
         results['analysis_duration_seconds'] = analysis_duration
         results['features_completed'] = len(results['features_analyzed'])
@@ -362,7 +511,9 @@ class AdvancedTradingOrchestrator:
         # 8. AI Strategist Features (Phase 1-4)
         self.logger.info("Running AI Strategist features...")
         try:
-            ai_strategist_results = await self.run_ai_strategist_features()
+            ai_strategist_results = await self.feature_scheduler.run_if_due(
+                'ai_strategist', lambda: self.run_budgeted('ai_strategist', self.run_ai_strategist_features)
+            )
             results['ai_strategist_features'] = ai_strategist_results
             results['features_analyzed'].append('ai_strategist')
         except Exception as e:
@@ -372,7 +523,9 @@ class AdvancedTradingOrchestrator:
         # 9. Phase 5 Advanced Features
         self.logger.info("Running Phase 5 advanced features...")
         try:
-            phase5_results = await self.run_phase5_features()
+            phase5_results = await self.feature_scheduler.run_if_due(
+                'phase5_advanced', lambda: self.run_budgeted('phase5_advanced', self.run_phase5_features)
+            )
             results['phase5_features'] = phase5_results
             results['features_analyzed'].append('phase5_advanced')
         except Exception as e:
@@ -382,7 +535,9 @@ class AdvancedTradingOrchestrator:
         # 10. Phases 5-8 Enhanced Features
         self.logger.info("Running Phases 5-8 enhanced features...")
         try:
-            phases_5_8_results = await self.run_phases_5_8_features()
+            phases_5_8_results = await self.feature_scheduler.run_if_due(
+                'phases_5_8', lambda: self.run_budgeted('phases_5_8', self.run_phases_5_8_features)
+            )
             results['phases_5_8_features'] = phases_5_8_results
             results['features_analyzed'].append('phases_5_8')
         except Exception as e:
@@ -394,31 +549,86 @@ class AdvancedTradingOrchestrator:
         
         return results
     
+    def normalize_events(self, events: List[Dict]) -> NormalizedEventBatch:
+        """Dedupe and tag a scanner batch once for every downstream decoder"""
+        self.asset_matcher.refresh()
+        batch = self.event_pipeline.normalize(events)
+        self.last_event_batch = batch
+        return batch
+    
+    def on_market_tick(self, symbol: str, price: float, volume: float = 0.0,
+                       high: float = None, low: float = None, timestamp: float = None,
+                       market: str = 'global', asset: str = None):
+        """Update streaming indicators and the market regime with a tick; rules are evaluated by evaluate_signal_rules"""
+        try:
+            if asset:
+                self.indicator_engine.link_symbol(symbol, asset)
+            self.indicator_engine.update(symbol, price, volume, high, low, timestamp)
+            self.regime_tracker.update(market, symbol, price, volume, timestamp)
+        except Exception as e:
+            self.logger.error(f"Streaming indicator update failed for {symbol}: {e}")
+    
+    def evaluate_signal_rules(self, symbols: List[str] = None) -> List[Dict]:
+        """Evaluate all compiled signal rules over the symbol universe in one vectorized pass"""
+        try:
+            rules = self.config.get('signal_engine', {}).get('rules', {})
+            if rule_fingerprint(rules) != self.rule_plan.fingerprint:
+                self.rule_plan = compile_rules(self.config)
+            
+            # Column arrays are maintained by the engine on every tick; no per-batch pivot
+            universe, columns = self.indicator_engine.feature_columns(symbols)
+            if not universe:
+                return []
+            
+            signals = self.rule_plan.to_signals(universe, columns)
+            return [signal for signal in signals
+                    if self.indicator_engine.check_cooldown(signal['symbol'], signal['rule'], signal['timestamp'])]
+        except Exception as e:
+            self.logger.error(f"Compiled rule evaluation failed: {e}")
+            return []
+    
+    def on_text_events(self, batch: NormalizedEventBatch) -> List[str]:
+        """Score news/social text in a normalized batch and fold it into each tagged asset's sentiment"""
+        try:
+            return self.indicator_engine.ingest_sentiment(batch.text_rows())
+        except Exception as e:
+            self.logger.error(f"Streaming sentiment ingestion failed: {e}")
+            return []
+    
+    def get_alert_history(self) -> AlertHistoryStore:
+        """Bounded, indexed alert history shared with the smart alert manager"""
+        history = getattr(self.alert_manager, 'alert_history', None)
+        if not isinstance(history, AlertHistoryStore):
+            # Re-wrap if the manager replaced its history with a plain list
+            capacity = self.config.get('smart_alerts', {}).get('history_capacity', 10000)
+            history = AlertHistoryStore(capacity, history or [])
+            self.alert_manager.alert_history = history
+        return history
+    
     async def process_advanced_alerts(self, analysis_results: Dict) -> Dict:
         """Process and send alerts based on advanced analysis results"""
-        raw_alerts = []
+        batch = AlertBatch()
         
         try:
-            # Extract alerts from different analyzers
+            # Extract alerts from different analyzers into one columnar batch;
+            # messages are rendered only for alerts that survive clustering
             
             # Multi-timeframe alerts
             for symbol, tf_result in analysis_results.get('multi_timeframe_analysis', {}).items():
                 if isinstance(tf_result, dict) and tf_result.get('overall_confidence', 0) > 0.7:
-                    raw_alerts.append({
-                        'alert_type': 'MULTI_TIMEFRAME',
-                        'symbol': symbol,
-                        'confidence': tf_result['overall_confidence'],
-                        'message': f"🎯 Multi-timeframe confirmation for {symbol}: {tf_result.get('overall_signal', 'UNKNOWN')}\\n"
-                                  f"Confidence: {tf_result['overall_confidence']:.0%}\\n"
-                                  f"Timeframes aligned: {tf_result.get('confirmation_ratio', 0):.0%}",
-                        'timestamp': datetime.now().timestamp()
-                    })
+                    batch.add(
+                        'MULTI_TIMEFRAME', symbol, tf_result['overall_confidence'],
+                        "🎯 Multi-timeframe confirmation for {symbol}: {overall_signal}\\n"
+                        "Confidence: {confidence:.0%}\\n"
+                        "Timeframes aligned: {confirmation_ratio:.0%}",
+                        overall_signal=tf_result.get('overall_signal', 'UNKNOWN'),
+                        confirmation_ratio=tf_result.get('confirmation_ratio', 0)
+                    )
             
             # Correlation break alerts
             corr_analysis = analysis_results.get('correlation_analysis', {})
             if isinstance(corr_analysis, dict):
-                corr_alerts = corr_analysis.get('correlation_alerts', [])
-                raw_alerts.extend(corr_alerts)
+                batch.extend_records(corr_analysis.get('correlation_alerts', []))
             
             # Trading signal alerts
             trading_signals = analysis_results.get('trading_signals', {})
@@ -426,37 +636,34 @@ class AdvancedTradingOrchestrator:
                 signals = trading_signals.get('signals', [])
                 for signal in signals:
                     if signal.get('confidence', 0) > 0.6:
-                        raw_alerts.append({
-                            'alert_type': 'TRADING_SIGNAL',
-                            'symbol': signal['symbol'],
-                            'confidence': signal['confidence'],
-                            'message': f"⚡ Trading signal for {signal['symbol']}: {signal['action']}\\n"
-                                      f"Confidence: {signal['confidence']:.0%}\\n"
-                                      f"Entry: ${signal.get('entry_price', 'TBD')}",
-                            'timestamp': datetime.now().timestamp()
-                        })
+                        batch.add(
+                            'TRADING_SIGNAL', signal['symbol'], signal['confidence'],
+                            "⚡ Trading signal for {symbol}: {action}\\n"
+                            "Confidence: {confidence:.0%}\\n"
+                            "Entry: ${entry_price}",
+                            action=signal['action'],
+                            entry_price=signal.get('entry_price', 'TBD')
+                        )
             
             # Portfolio rebalancing alerts
             portfolio_result = analysis_results.get('portfolio_optimization', {})
             if isinstance(portfolio_result, dict) and portfolio_result.get('rebalancing_needed', False):
-                raw_alerts.append({
+                batch.extend_records([{
                     'alert_type': 'PORTFOLIO_REBALANCING',
                     'symbol': 'PORTFOLIO',
                     'confidence': 0.8,
-                    'message': portfolio_result.get('alert_message', '📊 Portfolio rebalancing recommended'),
-                    'timestamp': datetime.now().timestamp()
-                })
+                    'message': portfolio_result.get('alert_message', '📊 Portfolio rebalancing recommended')
+                }])
             
             # Sentiment flow alerts
             for symbol, sentiment_result in analysis_results.get('sentiment_analysis', {}).items():
                 if isinstance(sentiment_result, dict) and sentiment_result.get('prediction', {}).get('confidence', 0) > 0.7:
-                    raw_alerts.append({
+                    batch.extend_records([{
                         'alert_type': 'SENTIMENT_FLOW',
                         'symbol': symbol,
                         'confidence': sentiment_result['prediction']['confidence'],
-                        'message': sentiment_result.get('alert_message', f'💬 Sentiment alert for {symbol}'),
-                        'timestamp': datetime.now().timestamp()
-                    })
+                        'message': sentiment_result.get('alert_message', f'💬 Sentiment alert for {symbol}')
+                    }])
             
             # Institutional flow alerts
             institutional_result = analysis_results.get('institutional_analysis', {})
@@ -464,33 +671,35 @@ class AdvancedTradingOrchestrator:
                 for symbol in institutional_result.get('high_activity_symbols', []):
                     symbol_data = institutional_result.get('institutional_flow_analysis', {}).get(symbol, {})
                     if symbol_data.get('alert_generated', False):
-                        raw_alerts.append({
+                        batch.extend_records([{
                             'alert_type': 'INSTITUTIONAL_FLOW',
                             'symbol': symbol,
                             'confidence': symbol_data.get('institutional_score', 0.8),
-                            'message': symbol_data.get('alert_message', f'🏛️ Institutional activity detected for {symbol}'),
-                            'timestamp': datetime.now().timestamp()
-                        })
+                            'message': symbol_data.get('alert_message', f'🏛️ Institutional activity detected for {symbol}')
+                        }])
             
             # ML pattern alerts
             ml_result = analysis_results.get('ml_pattern_analysis', {})
             if isinstance(ml_result, dict):
                 for symbol in ml_result.get('high_anomaly_symbols', []):
-                    raw_alerts.append({
-                        'alert_type': 'ML_ANOMALY',
-                        'symbol': symbol,
-                        'confidence': 0.75,
-                        'message': f'🤖 ML anomaly detected for {symbol}\\nPattern recognition suggests unusual market behavior',
-                        'timestamp': datetime.now().timestamp()
-                    })
+                    batch.add(
+                        'ML_ANOMALY', symbol, 0.75,
+                        '🤖 ML anomaly detected for {symbol}\\nPattern recognition suggests unusual market behavior'
+                    )
             
         except Exception as e:
             self.logger.error(f"Error extracting alerts: {e}")
         
-        # Process alerts through smart alert manager
+        # Vectorized clustering pass; the smart alert manager is the only filter and sender
         try:
+            reduced = self.alert_pipeline.process(batch)
+            raw_alerts = reduced['alerts']
             processed_alerts = await self.alert_manager.process_smart_alerts(raw_alerts)
-            self.logger.info(f"Generated {len(processed_alerts.get('processed_alerts', []))} processed alerts from {len(raw_alerts)} raw alerts")
+            self.get_alert_history()
+            reduced['summary']['sent'] = self.alert_pipeline.record_sent(processed_alerts.get('processed_alerts', []))
+            processed_alerts['batch_summary'] = reduced['summary']
+            self.logger.info(f"Generated {len(processed_alerts.get('processed_alerts', []))} processed alerts from "
+                             f"{len(batch)} candidates ({reduced['summary']['clusters']} clusters)")
             return processed_alerts
         except Exception as e:
             self.logger.error(f"Error processing alerts: {e}")
@@ -500,31 +709,51 @@ class AdvancedTradingOrchestrator:
                 'processing_timestamp': datetime.now().isoformat()
             }
 
+    # Phase 5 scheduler feature name -> key in the Phase 5 results
+    PHASE5_RESULT_KEYS = {
+        'ai_forecasting': 'forecasting',
+        'community_simulation': 'community',
+        'user_acquisition': 'user_acquisition',
+        'telegram_engagement': 'telegram'
+    }
+    
+    def reuse_scheduled_result(self, feature_name: str, results: Dict):
+        """Carry a not-yet-due feature's previous result into this cycle's results"""
+        previous = self.feature_scheduler.last_result(feature_name)
+        if previous is not None:
+            results[self.PHASE5_RESULT_KEYS[feature_name]] = {
+                **previous, 'schedule': self.feature_scheduler.describe(feature_name)
+            }
+    
     async def run_phase5_features(self) -> Dict:
         """Run Phase 5 advanced features: AI Forecasting, Community, User Acquisition, Telegram"""
         try:
             results = {}
             
             # 1. AI Predictive Forecasting
-            if self.phase5_features.get('ai_forecasting'):
+            if self.phase5_features.get('ai_forecasting') and not self.feature_scheduler.is_due('ai_forecasting'):
+                self.reuse_scheduled_result('ai_forecasting', results)
+            elif self.phase5_features.get('ai_forecasting'):
                 try:
-                    forecast_results = {}
+                    horizons = self.config.get('phase5_features', {}).get('ai_forecasting', {}).get('forecast_horizons', {})
                     
-                    # Generate market predictions for top symbols
-                    for symbol in self.symbols[:3]:  # Limit to top 3 for performance
-                        prediction = self.forecasting_module.predict_events(symbol, 7, 'market')
-                        if 'error' not in prediction:
-                            forecast_results[symbol] = prediction
+                    # Batched market predictions for the whole symbol universe, fitted on daily bars
+                    series = {symbol: self.indicator_engine.get_bars(symbol) for symbol in self.symbols}
+                    forecast_results = await self.batch_forecaster.forecast_universe(series, horizons.get('market', 7))
                     
-                    # Generate geopolitical forecast
-                    geo_forecast = self.forecasting_module.predict_geopolitical_events('global', 30)
-                    if 'error' not in geo_forecast:
+                    # Geopolitical forecast refreshes once per day
+                    geo_forecast = await self.batch_forecaster.cached_single(
+                        'geopolitical', horizons.get('geopolitics', 30), datetime.now().date().isoformat(),
+                        lambda key, horizon: self.forecasting_module.predict_geopolitical_events('global', horizon)
+                    )
+                    if geo_forecast:
                         forecast_results['geopolitical'] = geo_forecast
                     
                     results['forecasting'] = {
                         'success': True,
                         'predictions_generated': len(forecast_results),
-                        'results': forecast_results
+                        'results': forecast_results,
+                        'batch_stats': self.batch_forecaster.get_stats()
                     }
                     
                 except Exception as e:
@@ -532,7 +761,9 @@ class AdvancedTradingOrchestrator:
                     results['forecasting'] = {'success': False, 'error': str(e)}
             
             # 2. Community Simulation
-            if self.phase5_features.get('community_simulation'):
+            if self.phase5_features.get('community_simulation') and not self.feature_scheduler.is_due('community_simulation'):
+                self.reuse_scheduled_result('community_simulation', results)
+            elif self.phase5_features.get('community_simulation'):
                 try:
                     # Generate community insights
                     community_insights = self.community_simulator.get_community_insights()
@@ -559,7 +790,9 @@ class AdvancedTradingOrchestrator:
                     results['community'] = {'success': False, 'error': str(e)}
             
             # 3. User Acquisition
-            if self.phase5_features.get('user_acquisition'):
+            if self.phase5_features.get('user_acquisition') and not self.feature_scheduler.is_due('user_acquisition'):
+                self.reuse_scheduled_result('user_acquisition', results)
+            elif self.phase5_features.get('user_acquisition'):
                 try:
                     # Get acquisition analytics
                     acquisition_analytics = self.user_acquisition.get_acquisition_analytics()
@@ -578,7 +811,9 @@ class AdvancedTradingOrchestrator:
                     results['user_acquisition'] = {'success': False, 'error': str(e)}
             
             # 4. Telegram Engagement
-            if self.phase5_features.get('telegram_engagement'):
+            if self.phase5_features.get('telegram_engagement') and not self.feature_scheduler.is_due('telegram_engagement'):
+                self.reuse_scheduled_result('telegram_engagement', results)
+            elif self.phase5_features.get('telegram_engagement'):
                 try:
                     # Get engagement analytics
                     engagement_analytics = self.telegram_bot.get_engagement_analytics()
@@ -593,6 +828,11 @@ class AdvancedTradingOrchestrator:
                     logger.error(f"Error in Telegram engagement: {e}")
                     results['telegram'] = {'success': False, 'error': str(e)}
             
+            for feature_name, result_key in self.PHASE5_RESULT_KEYS.items():
+                result = results.get(result_key, {})
+                if result.get('success') and not result.get('stale') and self.feature_scheduler.is_due(feature_name):
+                    self.feature_scheduler.mark_run(feature_name, result)
+            
             # Generate Phase 5 summary
             successful_features = sum(1 for feature_result in results.values() if feature_result.get('success', False))
             
@@ -624,20 +864,28 @@ class AdvancedTradingOrchestrator:
             # 1. Event Normalization
             if self.ai_strategist_features.get('event_normalization'):
                 try:
-                    # Simulate event normalization with latest news/market events
-                    sample_event = {
-                        'title': 'Market volatility increases amid policy uncertainty',
-                        'summary': 'Central bank policies creating market instability',
-                        'timestamp': datetime.now().isoformat(),
-                        'source': 'ai_strategist',
-                        'confidence': 0.75
-                    }
-                    
-                    normalized_event = self.event_normalizer.normalize(sample_event)
+                    # Report on the real scanner batches; the legacy normalizer sees the latest text event
+                    batch = self.last_event_batch
+                    normalized_event = None
+                    if batch is not None:
+                        text_rows = [row for row, kind in enumerate(batch.kinds) if kind == 'text']
+                        if text_rows:
+                            latest = batch.raw[text_rows[-1]]
+                            payload = latest.get('payload', {})
+                            normalized_event = self.event_normalizer.normalize({
+                                'title': payload.get('title', ''),
+                                'summary': payload.get('summary', '') or payload.get('selftext', ''),
+                                'timestamp': latest.get('timestamp', datetime.now().isoformat()),
+                                'source': latest.get('source', 'unknown'),
+                                'event_type': batch.event_types[text_rows[-1]],
+                                'assets': list(batch.assets[text_rows[-1]])
+                            })
                     
                     results['event_normalization'] = {
                         'success': True,
-                        'events_processed': 1,
+                        'events_processed': len(batch) if batch is not None else 0,
+                        'batch_summary': batch.summary() if batch is not None else {},
+                        'pipeline': self.event_pipeline.get_stats(),
                         'sample_event': normalized_event,
                         'status': 'operational'
                     }
@@ -649,16 +897,19 @@ class AdvancedTradingOrchestrator:
             # 2. Knowledge Graph Analysis
             if self.ai_strategist_features.get('knowledge_graph'):
                 try:
-                    # Get knowledge graph statistics and insights
-                    kg_stats = self.knowledge_graph.get_stats()
+                    # Incremental prune of already-expired edges; decay itself is lazy
+                    maintenance = self.knowledge_graph.decay_and_prune()
                     
-                    # Perform graph decay maintenance
-                    self.knowledge_graph.decay_and_prune()
+                    # Commit this cycle's linking writes as one group
+                    self.knowledge_graph.flush()
+                    
+                    # Counter-based statistics, no graph scan
+                    kg_stats = self.knowledge_graph.get_stats()
                     
                     results['knowledge_graph'] = {
                         'success': True,
                         'graph_stats': kg_stats,
-                        'maintenance': 'decay_completed',
+                        'maintenance': maintenance,
                         'status': 'operational'
                     }
                     
@@ -669,22 +920,30 @@ class AdvancedTradingOrchestrator:
             # 3. Market Regime Detection
             if self.ai_strategist_features.get('regime_detection'):
                 try:
-                    # Detect current market regime
-                    current_regime = self.regime_engine.detect_current_regime()
-                    
-                    # Check regime stability
-                    regime_stable = self.regime_engine.is_regime_stable()
+                    # Live snapshot from the streaming tracker; the engine only covers a cold start
+                    live_regime = self.regime_tracker.current()
+                    if live_regime:
+                        current_regime = {key: live_regime[key] for key in ('risk', 'liquidity', 'volatility', 'trend', 'confidence')}
+                        regime_stable = live_regime['stable']
+                        source = 'streaming'
+                    else:
+                        detected = self.regime_engine.detect_current_regime()
+                        current_regime = {
+                            'risk': detected.risk,
+                            'liquidity': detected.liquidity,
+                            'volatility': detected.volatility,
+                            'trend': detected.trend,
+                            'confidence': detected.confidence
+                        }
+                        regime_stable = self.regime_engine.is_regime_stable()
+                        source = 'regime_engine'
                     
                     results['regime_detection'] = {
                         'success': True,
-                        'current_regime': {
-                            'risk': current_regime.risk,
-                            'liquidity': current_regime.liquidity,
-                            'volatility': current_regime.volatility,
-                            'trend': current_regime.trend,
-                            'confidence': current_regime.confidence
-                        },
+                        'current_regime': current_regime,
                         'stability': regime_stable,
+                        'source': source,
+                        'markets': self.regime_tracker.snapshot()['markets'],
                         'status': 'operational'
                     }
                     
@@ -698,15 +957,24 @@ class AdvancedTradingOrchestrator:
                     # Get active causal hypotheses
                     active_hypotheses = self.causal_engine.get_active_hypotheses(min_confidence=0.6)
                     
-                    # Test sample asset pair relationships
-                    test_pairs = [('BTC', 'ETH'), ('NIFTY', 'BANKNIFTY')]
-                    causal_tests = self.causal_engine.test_hypothesis_batch(test_pairs)
+                    # One bar per cycle from the streaming indicator prices, then screen every pair
+                    snapshot = self.indicator_engine.snapshot()
+                    self.causal_screener.update_prices({
+                        symbol: features['price'] for symbol, features in snapshot.items() if features.get('price')
+                    })
+                    causal_tests = self.causal_screener.screen(top_k=20)
+                    
+                    configured_pairs = [tuple(pair) for pair in self.config.get('ai_strategist_features', {}).get('causal_analysis', {}).get('test_pairs', [])]
+                    configured_tests = self.causal_screener.screen(configured_pairs)
                     
                     results['causal_analysis'] = {
                         'success': True,
                         'active_hypotheses_count': len(active_hypotheses),
                         'sample_hypotheses': active_hypotheses[:3],  # First 3 for demo
                         'recent_tests': causal_tests,
+                        'configured_pair_tests': configured_tests,
+                        'screened_hypotheses': self.causal_screener.get_active_hypotheses(),
+                        'screener': self.causal_screener.get_stats(),
                         'status': 'operational'
                     }
                     
@@ -787,7 +1055,8 @@ class AdvancedTradingOrchestrator:
                 sample_title = "Central Bank raises interest rates"
                 sample_summary = "Federal Reserve increases rates by 0.25% amid inflation concerns"
                 
-                event_type = self.gpt_integrator.type_event(sample_title, sample_summary)
+                # Gateway batches, caches and budgets GPT calls so repeated headlines are free
+                event_type = await self.llm_gateway.type_event(sample_title, sample_summary)
                 
                 # Test narrative building with sample decision
                 sample_decision = {
@@ -795,13 +1064,14 @@ class AdvancedTradingOrchestrator:
                     'confidence': 0.75,
                     'rationale': ['Market sentiment positive', 'Technical indicators bullish']
                 }
-                narrative = self.gpt_integrator.build_narrative(sample_decision)
+                narrative = await self.llm_gateway.build_narrative(sample_decision)
                 
                 results['gpt_integration'] = {
                     'success': True,
                     'event_typing_sample': event_type,
                     'narrative_sample': narrative,
-                    'status': 'operational' if self.gpt_integrator.client else 'simulation'
+                    'status': 'operational' if self.gpt_integrator.client else 'simulation',
+                    'gateway': self.llm_gateway.get_stats()
                 }
                 
             except Exception as e:
@@ -895,15 +1165,29 @@ class AdvancedTradingOrchestrator:
             return {'error': str(e)}
     
     async def run_analysis_cycle(self) -> Dict:
-        """Run complete analysis cycle with alert processing"""
+        """Run complete analysis cycle with alert processing; overlapping callers queue behind the running cycle"""
+        if self.cycle_lock.locked():
+            self.cycles_waited += 1
+            self.logger.info("Analysis cycle already running; waiting for it before starting another")
+        async with self.cycle_lock:
+            return await self.execute_analysis_cycle()
+    
+    async def execute_analysis_cycle(self) -> Dict:
+        """One analysis cycle; callers go through run_analysis_cycle so cycles never overlap"""
         try:
             self.logger.info("🚀 Starting advanced trading analysis cycle...")
+            self.profiler.start_cycle()
+            self.cycle_budget.start_cycle()
             
-            # Run full analysis
-            analysis_results = await self.run_full_analysis()
-            
-            # Process alerts
-            alert_results = await self.process_advanced_alerts(analysis_results)
+            try:
+                # Run full analysis
+                analysis_results = await self.run_full_analysis()
+                
+                # Process alerts
+                with self.profiler.span('alert_processing'):
+                    alert_results = await self.process_advanced_alerts(analysis_results)
+            finally:
+                cycle_duration = self.profiler.end_cycle()
             
             # Combine results
             cycle_results = {
@@ -914,23 +1198,38 @@ class AdvancedTradingOrchestrator:
                     'features_operational': analysis_results.get('features_completed', 0),
                     'total_features': 7,
                     'alerts_generated': len(alert_results.get('processed_alerts', [])),
-                    'analysis_duration': analysis_results.get('analysis_duration_seconds', 0)
+                    'analysis_duration': analysis_results.get('analysis_duration_seconds', 0),
+                    'cycle_duration': cycle_duration,
+                    'cycle_budget': self.cycle_budget.get_status(),
+                    'cycles_waited': self.cycles_waited,
+                    'feature_schedule': self.feature_scheduler.get_status(),
+                    'stage_cache': self.stage_cache.get_stats(),
+                    'alert_pipeline': self.alert_pipeline.get_stats(),
+                    'alert_history': self.get_alert_history().get_stats()
                 }
             }
             
+            stage_timings = ', '.join(
+                f"{stage}={seconds:.3f}s" for stage, seconds in self.profiler.last_cycle_totals().items()
+            )
+            self.logger.info(f"Cycle timings ({cycle_duration:.2f}s): {stage_timings}")
+            
             self.logger.info(f"✅ Analysis cycle completed successfully")
             self.logger.info(f"Features operational: {cycle_results['system_status']['features_operational']}/7")
             self.logger.info(f"Alerts generated: {cycle_results['system_status']['alerts_generated']}")
             
+            self.cycle_snapshots.publish(cycle_results)
             return cycle_results
             
         except Exception as e:
             self.logger.error(f"❌ Analysis cycle failed: {e}")
-            return {
+            failed = {
                 'cycle_timestamp': datetime.now().isoformat(),
                 'error': str(e),
                 'system_status': {'operational': False}
             }
+            self.cycle_snapshots.publish(failed)
+            return failed
 
 # Global orchestrator instance
 orchestrator = None
@@ -10,6 +10,7 @@ import asyncio
 import threading
 import time
 import functools
+import uuid
 import sqlite3
 from datetime import datetime
 from openpyxl import Workbook
@@ -20,7 +21,6 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_caching import Cache
 from flask_talisman import Talisman
-from concurrent.futures import ThreadPoolExecutor
 import logging
 from pydantic import BaseModel, ValidationError
 
@@ -30,14 +30,23 @@ from scanner.news_scanner import NewsScanner
 from scanner.india_equity_scanner import IndiaEquityScanner
 from decoder.pattern_analyzer import PatternAnalyzer
 from decoder.viral_scorer import ViralScorer
+from decoder.viral_batch import BatchViralScorer
 from decoder.ai_analyzer import AIAnalyzer
 from decoder.rss_analyzer import RSSAnalyzer
 from executor.reddit_poster import RedditPoster
 from executor.trade_executor import TradeExecutor
 from executor.alert_sender import AlertSender
 from utils.state_manager import StateManager
+from utils.state_journal import StateJournal
 from utils.github_backup import GitHubBackup
 from utils.rss_scheduler import RSSScheduler
+from utils.scan_scheduler import ScanScheduler
+from utils.offset_checkpoints import OffsetCheckpointStore
+from utils.event_bus import EventBus
+from utils.action_dispatcher import ActionDispatcher
+from utils.async_runtime import AsyncRuntime
+from utils.job_manager import JobManager
+from utils.cycle_snapshot import etag_matches
 from advanced_trading_orchestrator import AdvancedTradingOrchestrator
 from paper_trading import PaperTradingEngine
 from config import Config
@@ -201,11 +210,13 @@ class TradingPlatform:
         
         # Initialize decoders (Decode layer)
         self.pattern_analyzer = PatternAnalyzer()
-        self.viral_scorer = ViralScorer()
         self.ai_analyzer = AIAnalyzer()
         self.rss_analyzer = RSSAnalyzer()
         self.rss_scheduler = RSSScheduler(self.rss_analyzer)
         self.advanced_orchestrator = AdvancedTradingOrchestrator()
+        # Batch scoring on the decode path; the per-pattern scorer keeps its other duties
+        self.viral_scorer = BatchViralScorer(ViralScorer(), self.advanced_orchestrator.config,
+                                             alert_threshold=Config.VIRAL_THRESHOLD)
         
         # Initialize executors (Action layer)
         self.reddit_poster = RedditPoster()
@@ -213,9 +224,50 @@ class TradingPlatform:
         self.alert_sender = AlertSender()
         self.paper_trading_engine = PaperTradingEngine()
         
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        # Scanner offsets are checkpointed once each scanned batch has been decoded, not only at backup time
+        self.checkpoints = OffsetCheckpointStore('checkpoints.db', self.advanced_orchestrator.config)
+        
+        # Per-source scan schedules (Data layer cadence)
+        self.scan_scheduler = ScanScheduler(self.advanced_orchestrator.config, default_interval=Config.SCAN_INTERVAL,
+                                            checkpoints=self.checkpoints)
+        for source in ('reddit', 'binance', 'news', 'india_equity'):
+            self.scan_scheduler.add_source(source, getattr(self, f'{source}_scanner').scan,
+                                           offset=functools.partial(self.get_scanner_offset, source))
+        
+        # Decode → score → action stages, each with its own bounded queue and workers
+        self.event_bus = EventBus(self.advanced_orchestrator.config)
+        self.event_bus.add_stage('decode', self.decode_batch, workers=1, maxsize=50)
+        self.event_bus.add_stage('score', self.score_patterns, workers=2, maxsize=50)
+        
+        # Action lanes: trades first on their own workers, alerts coalesced and fire-and-forget
+        self.action_dispatcher = ActionDispatcher(self.event_bus, self.advanced_orchestrator.config)
+        # Order placement is never cancelled mid-flight; a slow order becomes an unknown outcome to reconcile
+        self.action_dispatcher.add_action('trade', self.trade_executor.execute_trade, priority=0, timeout=10,
+                                          workers=2, maxsize=50, overflow='block', cancel_on_timeout=False)
+        self.action_dispatcher.add_action('alert', self.alert_sender.send_alert, priority=1, timeout=15,
+                                          workers=4, maxsize=200, coalesce_seconds=5)
+        self.action_dispatcher.add_action('post', self.reddit_poster.safe_post, priority=2, timeout=30,
+                                          workers=1, maxsize=50)
+        
+        # One long-lived loop owns every coroutine touching platform objects;
+        # blocking I/O and CPU work go to its bounded executors
+        self.runtime = AsyncRuntime('platform-loop', self.advanced_orchestrator.config)
+        self.scan_future = None
+        
+        # Periodic advanced analysis runs beside the decode stage so market decoding never waits on it
+        analysis_config = self.advanced_orchestrator.config.get('orchestrator', {}).get('analysis_loop', {})
+        self.analysis_interval = analysis_config.get('interval_seconds', 60)
+        self.analysis_min_events = analysis_config.get('min_new_events', 6)
+        self.events_since_analysis = 0
+        self.analysis_future = None
+        
+        # Long-running API operations (analysis refresh, backtests, backups, deploys)
+        self.jobs = JobManager('jobs.db', self.advanced_orchestrator.config, runtime=self.runtime)
         self.last_backup = None
         
+        # Saves append changed sections to a journal; API handlers read its in-memory model
+        self.state_journal = StateJournal(self.state_manager, self.advanced_orchestrator.config)
+        
         # Load existing state
         self.load_state()
         
@@ -223,17 +275,15 @@ class TradingPlatform:
         self.initialize_enhancements()
     
     def load_state(self):
-        """Load platform state from state.json"""
+        """Load platform state from the state.json snapshot plus the state journal"""
         try:
-            state = self.state_manager.load_state()
+            state = self.state_journal.load()
             logger.info(f"Loaded state from {state.get('last_run_id', 'unknown')}")
             
-            # Restore scanner offsets
-            scanner_state = state.get('scanner', {})
-            if 'last_offsets' in scanner_state:
-                self.reddit_scanner.set_last_offset(scanner_state['last_offsets'].get('reddit'))
-                self.binance_scanner.set_last_offset(scanner_state['last_offsets'].get('binance'))
-                self.news_scanner.set_last_offset(scanner_state['last_offsets'].get('news'))
+            # Resume scanners from checkpoints only: state.json holds live offsets that can run ahead
+            # of decoding, so a source without a checkpoint starts from no offset and replays
+            for source, offset in self.checkpoints.load().items():
+                self.restore_scanner_offset(source, offset)
             
             # Restore decoder state
             decoder_state = state.get('decoder', {})
@@ -248,136 +298,253 @@ class TradingPlatform:
         except Exception as e:
             logger.warning(f"Failed to load state: {e}. Starting fresh.")
     
+    def get_scanner_offset(self, source):
+        """Current resume position of a scanner"""
+        if source == 'india_equity':
+            return getattr(self.india_equity_scanner, 'last_scan_time', datetime.utcnow()).isoformat() + 'Z'
+        return getattr(self, f'{source}_scanner').get_last_offset()
+    
+    def restore_scanner_offset(self, source, offset):
+        if offset is None:
+            return
+        if source == 'india_equity':
+            self.india_equity_scanner.last_scan_time = datetime.fromisoformat(str(offset).rstrip('Z'))
+        elif hasattr(self, f'{source}_scanner'):
+            getattr(self, f'{source}_scanner').set_last_offset(offset)
+    
     def save_state(self):
-        """Save current platform state"""
+        """Journal the state sections that changed since the last save"""
         try:
-            state = {
-                "last_run_id": datetime.utcnow().isoformat() + "Z",
-                "scanner": {
-                    "sources": ["reddit", "binance", "news", "india_equity"],
-                    "last_offsets": {
-                        "reddit": self.reddit_scanner.get_last_offset(),
-                        "binance": self.binance_scanner.get_last_offset(),
-                        "news": self.news_scanner.get_last_offset(),
-                        "india_equity": getattr(self.india_equity_scanner, 'last_scan_time', datetime.utcnow()).isoformat() + 'Z'
-                    }
-                },
-                "decoder": {
-                    "correlation_snapshot": self.pattern_analyzer.get_correlations(),
-                    "recent_alerts": self.viral_scorer.get_recent_alerts()
-                },
-                "executor": {
-                    "open_trades": self.trade_executor.get_open_trades(),
-                    "recent_posts": self.reddit_poster.get_recent_posts()
-                },
+            run_id = datetime.utcnow().isoformat() + "Z"
+            changed = self.state_journal.record({
+                "last_run_id": run_id,
+                "scanner.sources": ["reddit", "binance", "news", "india_equity"],
+                "scanner.last_offsets": {source: self.get_scanner_offset(source)
+                                         for source in ("reddit", "binance", "news", "india_equity")},
+                "decoder.correlation_snapshot": self.pattern_analyzer.get_correlations(),
+                "decoder.recent_alerts": self.viral_scorer.get_recent_alerts(),
+                "executor.open_trades": self.trade_executor.get_open_trades(),
+                "executor.recent_posts": self.reddit_poster.get_recent_posts(),
+                "executor.unknown_outcomes": self.action_dispatcher.get_unknown_outcomes(),
                 "config_version": "v1.2.0"
-            }
-            
-            self.state_manager.save_state(state)
-            logger.info(f"State saved at {state['last_run_id']}")
+            })
+            logger.info(f"State saved at {run_id} ({changed} sections changed)")
             
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
     
     async def scan_loop(self):
         """Main scanning loop - Data collection phase"""
-        while self.running:
-            try:
-                # Collect data from all sources
-                tasks = [
-                    self.reddit_scanner.scan(),
-                    self.binance_scanner.scan(),
-                    self.news_scanner.scan(),
-                    self.india_equity_scanner.scan()
-                ]
-                
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Process results and feed to decoder
-                for result in results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Scanner error: {result}")
-                    elif result:
-                        # Pass raw events to decoder
-                        await self.decode_events(result)
-                
-                # Save state periodically
-                if self.should_backup():
-                    await self.backup_state()
-                
-                await asyncio.sleep(30)  # 30-second scan interval
-                
-            except Exception as e:
-                logger.error(f"Error in scan loop: {e}")
-                await asyncio.sleep(5)
+        # Each scanner runs on its own schedule; this loop only drains their shared queue
+        self.event_bus.start()
+        self.action_dispatcher.start()
+        self.scan_scheduler.start()
+        try:
+            while self.running:
+                try:
+                    batch = await self.scan_scheduler.next_batch(timeout=5)
+                    if batch:
+                        source, events, token = batch
+                        # Hand raw events to the decode stage; waits only when decoding is saturated
+                        await self.event_bus.publish('decode', (events, token))
+                    
+                    # Commit the last decoded offsets even when no newer batch arrives to trigger it
+                    self.checkpoints.flush_due()
+                    
+                    # Save state periodically
+                    if self.should_backup():
+                        await self.backup_state()
+                    
+                except Exception as e:
+                    logger.error(f"Error in scan loop: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            # Producers first; decode and score then drain so their checkpoints complete and
+            # their actions reach the lanes before the dispatcher flushes and the workers stop
+            drain_timeout = self.advanced_orchestrator.config.get('event_bus', {}).get('shutdown_drain_seconds', 15)
+            await self.scan_scheduler.stop()
+            await self.event_bus.drain(drain_timeout)
+            await self.action_dispatcher.stop(drain_timeout)
+            await self.event_bus.stop(drain_timeout=drain_timeout)
+            self.checkpoints.flush()
+    
+    async def decode_batch(self, item):
+        """Decode stage: decode a scanned batch, then let its scanner's checkpoint advance past it"""
+        events, token = item
+        attempts = self.checkpoints.max_decode_attempts
+        for attempt in range(1, attempts + 1):
+            if await self.decode_events(events) is not False:
+                self.checkpoints.complete(token, len(events))
+                return
+            if attempt < attempts:
+                await asyncio.sleep(self.checkpoints.retry_backoff * attempt)
+        # Retries exhausted: keep the batch for inspection and let the checkpoint move on
+        self.checkpoints.dead_letter(token, events, reason=f'not decoded after {attempts} attempts')
     
     async def decode_events(self, events):
-        """Decode patterns and compute viral scores"""
+        """Decode patterns and hand them to the scoring stage"""
+        batch = None
         try:
+            # Dedupe and tag once; decoders share the normalized batch
+            batch = await self.runtime.run_cpu(self.advanced_orchestrator.normalize_events, events)
+            events = batch.raw_events()
+            if not events:
+                return
+            
             # Analyze patterns with traditional methods
             patterns = await self.pattern_analyzer.analyze(events)
             
+            # Event-driven signal rules over streaming indicator state
+            patterns.extend(self.update_streaming_indicators(batch))
+            
             # Disable AI analysis to remove unnecessary 100% scored patterns
             # ai_insights = await self.ai_analyzer.analyze_events(events)
             
-            # Advanced multi-feature analysis (run periodically)
-            if len(events) > 5:  # Only run advanced analysis when there's sufficient data
-                try:
-                    advanced_results = await self.advanced_orchestrator.run_analysis_cycle()
-                    logger.info(f"Advanced analysis completed with {advanced_results.get('system_status', {}).get('features_operational', 0)}/7 features operational")
-                    
-                    # Process advanced alerts
-                    if 'alert_results' in advanced_results:
-                        processed_alerts = advanced_results['alert_results'].get('processed_alerts', [])
-                        for alert in processed_alerts:
-                            # Convert advanced alerts to pattern format for execution
-                            advanced_pattern = {
-                                'id': f"advanced_{alert['alert_type']}_{alert['symbol']}_{int(alert['timestamp'])}",
-                                'timestamp': datetime.fromtimestamp(alert['timestamp']).isoformat() + 'Z',
-                                'type': alert['alert_type'].lower(),
-                                'asset': alert['symbol'],
-                                'source': 'advanced_analysis',
-                                'signals': {
-                                    'confidence': alert['confidence'],
-                                    'alert_message': alert['message'],
-                                    'alert_type': alert['alert_type']
-                                }
-                            }
-                            patterns.append(advanced_pattern)
-                except Exception as e:
-                    logger.warning(f"Advanced analysis failed: {e}")
+            # The advanced analysis cycle runs on its own task (analysis_loop), never on the decode worker
+            self.events_since_analysis += len(events)
             
             # Use only traditional patterns (no AI insights)
             all_insights = patterns
             
-            # Compute viral scores
-            for pattern in all_insights:
-                viral_score = await self.viral_scorer.compute_score(pattern)
-                
-                if viral_score > Config.VIRAL_THRESHOLD:
-                    # High-scoring pattern - trigger actions
-                    await self.execute_actions(pattern, viral_score)
+            # Viral scores are computed per batch by the score stage workers
+            if all_insights:
+                await self.event_bus.publish('score', all_insights)
                     
         except Exception as e:
             logger.error(f"Error in decode phase: {e}")
+            if batch is not None:
+                self.advanced_orchestrator.event_pipeline.forget(batch.hashes)
+            return False
+    
+    async def analysis_loop(self):
+        """Run the advanced analysis cycle on its own cadence and feed its alerts to the score stage"""
+        while self.running:
+            await asyncio.sleep(self.analysis_interval)
+            # Only run advanced analysis when enough new data has been decoded since the last cycle
+            if self.events_since_analysis < self.analysis_min_events:
+                continue
+            self.events_since_analysis = 0
+            
+            advanced_results = await self.advanced_orchestrator.run_analysis_cycle()
+            if 'error' in advanced_results:
+                logger.warning(f"Advanced analysis failed: {advanced_results['error']}")
+                continue
+            logger.info(f"Advanced analysis completed with {advanced_results.get('system_status', {}).get('features_operational', 0)}/7 features operational")
+            
+            patterns = self.advanced_alert_patterns(advanced_results)
+            if patterns:
+                await self.event_bus.publish('score', patterns)
+    
+    def advanced_alert_patterns(self, advanced_results):
+        """Convert processed advanced alerts to pattern format for scoring and execution"""
+        patterns = []
+        for alert in advanced_results.get('alert_results', {}).get('processed_alerts', []):
+            patterns.append({
+                'id': f"advanced_{alert['alert_type']}_{alert['symbol']}_{int(alert['timestamp'])}",
+                'timestamp': datetime.fromtimestamp(alert['timestamp']).isoformat() + 'Z',
+                'type': alert['alert_type'].lower(),
+                'asset': alert['symbol'],
+                'source': 'advanced_analysis',
+                'signals': {
+                    'confidence': alert['confidence'],
+                    'alert_message': alert['message'],
+                    'alert_type': alert['alert_type']
+                }
+            })
+        return patterns
+    
+    async def score_patterns(self, patterns):
+        """Score a decoded batch at once and dispatch actions for patterns above the threshold"""
+        viral_scores = await self.viral_scorer.score_batch(patterns)
+        
+        # High-scoring patterns - trigger actions concurrently
+        hits = [(pattern, float(score)) for pattern, score in zip(patterns, viral_scores)
+                if score > Config.VIRAL_THRESHOLD]
+        if hits:
+            await asyncio.gather(*(self.execute_actions(pattern, score) for pattern, score in hits))
+    
+    def update_streaming_indicators(self, batch):
+        """Feed market ticks and news/social sentiment into the streaming indicators and convert fired rules to patterns"""
+        touched = set()
+        for asset, event in batch.market_rows():
+            if event.get('source') not in ('binance', 'india_equity'):
+                continue
+            payload = event.get('payload', {})
+            symbol = payload.get('symbol') or payload.get('asset')
+            price = payload.get('price')
+            if not symbol or price is None:
+                continue
+            
+            self.advanced_orchestrator.on_market_tick(
+                symbol,
+                float(price),
+                float(payload.get('volume', 0) or 0),
+                payload.get('high'),
+                payload.get('low'),
+                market=event.get('source'),
+                asset=asset
+            )
+            touched.add(symbol)
+        
+        # Sentiment after ticks so headlines reach the market symbols that quote their assets
+        for asset in self.advanced_orchestrator.on_text_events(batch):
+            touched.update(self.advanced_orchestrator.indicator_engine.asset_symbols.get(asset, ()))
+        
+        if not touched:
+            return []
+        
+        # One vectorized rule pass over every symbol that ticked in this batch
+        patterns = []
+        for signal in self.advanced_orchestrator.evaluate_signal_rules(sorted(touched)):
+            symbol = signal['symbol']
+            patterns.append({
+                'id': f"streaming_{signal['rule']}_{symbol}_{int(signal['timestamp'])}",
+                'timestamp': datetime.fromtimestamp(signal['timestamp']).isoformat() + 'Z',
+                'type': 'trading_signal',
+                'asset': symbol,
+                'source': 'streaming_indicators',
+                'signals': {
+                    'confidence': signal['confidence'],
+                    'action': signal['action'],
+                    'rule': signal['rule'],
+                    'price': signal['entry_price'],
+                    'conditions_met': signal['conditions_met']
+                }
+            })
+        return patterns
     
     async def execute_actions(self, pattern, score):
-        """Execute actions based on high-scoring patterns"""
+        """Dispatch the actions a high-scoring pattern qualifies for; each runs in its own lane"""
         try:
             # Send alerts
-            await self.alert_sender.send_alert(pattern, score)
+            actions = ['alert']
             
             # Post to Reddit if appropriate
             if pattern.get('source') != 'reddit' and score > Config.REDDIT_POST_THRESHOLD:
-                await self.reddit_poster.safe_post(pattern, score)
+                actions.append('post')
             
             # Execute trades if in live mode
             if Config.LIVE_TRADING and score > Config.TRADE_THRESHOLD:
-                await self.trade_executor.execute_trade(pattern, score)
+                actions.append('trade')
+            
+            await self.action_dispatcher.dispatch(pattern, score, actions)
                 
         except Exception as e:
             logger.error(f"Error in execution phase: {e}")
     
+    def request_analysis_refresh(self):
+        """Enqueue an analysis cycle job; concurrent requests share the in-flight job"""
+        async def run_refresh(context):
+            results = await self.advanced_orchestrator.run_analysis_cycle()
+            if 'error' in results:
+                raise RuntimeError(results['error'])
+            return {
+                'cycle_timestamp': results.get('cycle_timestamp'),
+                'system_status': results.get('system_status', {})
+            }
+        
+        return self.jobs.submit('analysis', run_refresh, name='analysis_cycle', dedupe_key='analysis_cycle')
+    
     def should_backup(self):
         """Check if it's time to backup state"""
         if not self.last_backup:
@@ -389,7 +556,9 @@ class TradingPlatform:
     async def backup_state(self):
         """Backup state to GitHub"""
         try:
-            self.save_state()
+            await self.runtime.run_io(self.save_state)
+            # The backup pushes state.json only, so fold pending journal entries into it first
+            await self.runtime.run_io(self.state_journal.compact)
             await self.github_backup.backup_state()
             self.last_backup = datetime.utcnow()
             logger.info("State backed up to GitHub")
@@ -408,19 +577,14 @@ class TradingPlatform:
         # Start paper trading engine
         self.paper_trading_engine.start_consumer()
         
-        # Start the main loop in a separate thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        def run_loop():
-            # Start RSS scheduler within the event loop
-            if hasattr(self, 'rss_scheduler'):
-                loop.create_task(self.rss_scheduler.start())
-                logger.info("RSS Scheduler started")
-            
-            loop.run_until_complete(self.scan_loop())
+        # Run the main loop on the platform runtime
+        if hasattr(self, 'rss_scheduler'):
+            self.runtime.spawn(self.rss_scheduler.start(), 'rss_scheduler.start')
+            logger.info("RSS Scheduler started")
         
-        self.executor.submit(run_loop)
+        # A crash in the scan loop restarts it with backoff instead of silently ending data collection
+        self.scan_future = self.runtime.supervise('scan_loop', self.scan_loop)
+        self.analysis_future = self.runtime.supervise('analysis_loop', self.analysis_loop)
     
     def stop(self):
         """Stop the platform"""
@@ -430,21 +594,34 @@ class TradingPlatform:
         # Stop RSS scheduler
         if hasattr(self, 'rss_scheduler'):
             try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self.rss_scheduler.stop())
-                else:
-                    asyncio.run(self.rss_scheduler.stop())
+                self.runtime.run(self.rss_scheduler.stop(), timeout=10)
                 logger.info("RSS Scheduler stopped")
             except Exception as e:
                 logger.warning(f"Failed to stop RSS scheduler: {e}")
         
+        # An in-progress analysis cycle is abandoned; its next run would start from fresh state anyway
+        if self.analysis_future is not None:
+            self.analysis_future.cancel()
+            self.analysis_future = None
+        
+        # Let the scan loop drain its stages; cancel it if it does not exit in time
+        if self.scan_future is not None:
+            try:
+                self.scan_future.result(timeout=15)
+            except Exception:
+                self.scan_future.cancel()
+            self.scan_future = None
+        
         # Stop paper trading engine
         if hasattr(self, 'paper_trading_engine'):
             self.paper_trading_engine.stop_consumer()
         
+        # Release forecasting worker processes
+        self.advanced_orchestrator.batch_forecaster.shutdown()
+        
+        self.checkpoints.flush()
         self.save_state()
-        self.executor.shutdown(wait=True)
+        self.state_journal.compact()
     
     def get_status(self):
         """Get current platform status"""
@@ -455,6 +632,13 @@ class TradingPlatform:
             "binance_scanner": self.binance_scanner.get_status(),
             "news_scanner": self.news_scanner.get_status(),
             "india_equity_scanner": self.india_equity_scanner.get_status(),
+            "scan_schedules": self.scan_scheduler.get_status(),
+            "event_bus": self.event_bus.get_metrics(),
+            "action_lanes": self.action_dispatcher.get_stats(),
+            "runtime": self.runtime.get_stats(),
+            "state_journal": self.state_journal.get_stats(),
+            "checkpoints": self.checkpoints.get_stats(),
+            "jobs": self.jobs.get_stats(),
             "open_trades": len(self.trade_executor.get_open_trades()),
             "recent_alerts": len(self.viral_scorer.get_recent_alerts())
         }
@@ -562,54 +746,15 @@ def api_alerts():
         asset_filter = request.args.get('asset')
         type_filter = request.args.get('type')
         
-        # Get alerts from advanced orchestrator smart alert manager
-        alerts = platform.advanced_orchestrator.alert_manager.alert_history
-        
-        # Convert to dict format for JSON serialization
-        alert_dicts = []
-        for alert in alerts:
-            alert_dict = {
-                'id': alert.id,
-                'alert_type': alert.alert_type,
-                'symbol': alert.symbol,
-                'confidence': alert.confidence,
-                'message': alert.message,
-                'timestamp': alert.timestamp,
-                'priority': alert.priority,
-                'risk_score': getattr(alert, 'risk_score', 0),
-                'business_impact': getattr(alert, 'business_impact', 0),
-                'threat_intel_score': getattr(alert, 'threat_intel_score', 0),
-                'importance_score': getattr(alert, 'importance_score', 0),
-                'disposition': getattr(alert, 'disposition', 'pending'),
-                'cluster_id': getattr(alert, 'cluster_id', None)
-            }
-            alert_dicts.append(alert_dict)
-        
-        # Apply filters
-        filtered_alerts = alert_dicts
-        if priority_filter:
-            filtered_alerts = [a for a in filtered_alerts if str(a['priority']) == priority_filter]
-        if asset_filter:
-            asset_filter_upper = asset_filter.upper()
-            filtered_alerts = [a for a in filtered_alerts if asset_filter_upper in (a['symbol'] or '').upper()]
-        if type_filter:
-            filtered_alerts = [a for a in filtered_alerts if a['alert_type'] == type_filter]
-        
-        # Sort by timestamp (newest first)
-        filtered_alerts.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Apply pagination
-        total = len(filtered_alerts)
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_alerts = filtered_alerts[start:end]
-        
-        return jsonify({
-            'alerts': paginated_alerts,
-            'total': total,
-            'page': page,
-            'per_page': per_page
-        })
+        # Index lookups over the bounded alert history store
+        history = platform.advanced_orchestrator.get_alert_history()
+        return jsonify(history.query(
+            page=page,
+            per_page=per_page,
+            priority=priority_filter,
+            asset=asset_filter,
+            alert_type=type_filter
+        ))
         
     except Exception as e:
         logger.error(f"Error getting enhanced alerts: {e}")
@@ -1341,21 +1486,13 @@ def handle_disconnect():
 def api_backup():
     """Trigger manual backup"""
     try:
-        # Create backup in a separate thread to avoid event loop issues
-        def run_backup():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(platform.backup_state())
-                logger.info("Manual backup completed successfully")
-            except Exception as e:
-                logger.error(f"Manual backup failed: {e}")
-            finally:
-                loop.close()
+        # Backup runs as a maintenance job; the request returns immediately
+        async def run_backup(context):
+            await platform.backup_state()
+            return {'backed_up_at': datetime.utcnow().isoformat() + 'Z'}
         
-        # Submit backup task to thread pool
-        platform.executor.submit(run_backup)
-        return jsonify({"status": "backup_initiated", "message": "GitHub backup started"})
+        job = platform.jobs.submit('maintenance', run_backup, name='manual_backup', dedupe_key='manual_backup')
+        return jsonify({"status": "backup_initiated", "message": "GitHub backup started", "job": job})
         
     except Exception as e:
         logger.error(f"Failed to initiate backup: {e}")
@@ -1363,25 +1500,65 @@ def api_backup():
 
 @app.route('/api/advanced-analysis')
 def api_advanced_analysis():
-    """Get latest advanced analysis results"""
+    """Latest completed analysis cycle with its age; ?refresh=1 enqueues a new cycle"""
     try:
-        # Run advanced analysis and return results
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        results = loop.run_until_complete(platform.advanced_orchestrator.run_analysis_cycle())
-        return jsonify(results)
+        snapshots = platform.advanced_orchestrator.cycle_snapshots
+        snapshot = snapshots.latest()
+        
+        refresh_job = None
+        if request.args.get('refresh', '').lower() in ('1', 'true') or snapshot is None:
+            refresh_job = platform.request_analysis_refresh()
+        
+        if snapshot is None:
+            return jsonify({
+                "status": "pending",
+                "message": "No analysis cycle has completed yet",
+                "job": refresh_job
+            }), 202
+        
+        # Dashboard polling revalidates against the snapshot's ETag instead of refetching
+        if refresh_job is None and etag_matches(request.headers.get('If-None-Match'), snapshot['etag']):
+            response = app.response_class(status=304)
+        else:
+            response = jsonify({**snapshot['results'], 'snapshot': snapshots.metadata(), 'job': refresh_job})
+        response.headers['ETag'] = snapshot['etag']
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         logger.error(f"Error in advanced analysis API: {e}")
         return jsonify({"error": str(e), "status": "error"}), 500
 
+@app.route('/api/analysis/profile', methods=['GET', 'POST'])
+def api_analysis_profile():
+    """Per-stage latency histograms and slowest-cycle profile for the advanced analysis cycle.
+
+    cProfile captures cover the whole event loop thread, not just the cycle task;
+    the report's profiling.scope says which applies.
+    """
+    try:
+        profiler = platform.advanced_orchestrator.profiler
+        
+        if request.method == 'POST':
+            data = request.get_json() or {}
+            profiler.set_profiling(bool(data.get('enabled', True)), data.get('backend'))
+            logger.info(f"Cycle profiling {'enabled' if profiler.profiling_enabled else 'disabled'} ({profiler.backend})")
+        
+        include_profile = request.args.get('include_profile', 'true').lower() == 'true'
+        return jsonify(profiler.get_report(include_profile=include_profile))
+    except Exception as e:
+        logger.error(f"Error getting analysis profile: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/multi-timeframe/<symbol>')
 def api_multi_timeframe(symbol):
     """Get multi-timeframe analysis for specific symbol"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        results = loop.run_until_complete(platform.advanced_orchestrator.multi_timeframe.analyze_multi_timeframe(symbol))
+        results = platform.runtime.run(platform.advanced_orchestrator.multi_timeframe.analyze_multi_timeframe(symbol),
+                                       timeout=Config.ASYNC_ROUTE_TIMEOUT)
         return jsonify(results)
+    except TimeoutError as e:
+        logger.warning(f"Multi-timeframe API for {symbol} timed out: {e}")
+        return jsonify({"error": str(e), "status": "timeout"}), 504
     except Exception as e:
         logger.error(f"Error in multi-timeframe API for {symbol}: {e}")
         return jsonify({"error": str(e), "status": "error"}), 500
@@ -1785,13 +1962,15 @@ def api_alert_feedback():
             return jsonify({"error": "alert_id and disposition are required"}), 400
         
         # Call the smart alert manager feedback method
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            platform.advanced_orchestrator.alert_manager.provide_analyst_feedback(alert_id, disposition, feedback)
+        result = platform.runtime.run(
+            platform.advanced_orchestrator.alert_manager.provide_analyst_feedback(alert_id, disposition, feedback),
+            timeout=Config.ASYNC_ROUTE_TIMEOUT
         )
         
         return jsonify(result)
+    except TimeoutError as e:
+        logger.warning(f"Alert feedback API timed out: {e}")
+        return jsonify({"error": str(e)}), 504
     except Exception as e:
         logger.error(f"Error in alert feedback API: {e}")
         return jsonify({"error": str(e)}), 500
@@ -1986,14 +2165,19 @@ def api_run_backtesting():
 def api_regime_detection():
     """Get current market regime detection"""
     try:
-        # Get regime from portfolio optimizer
+        # Live snapshot published by the streaming regime tracker
+        snapshot = platform.advanced_orchestrator.regime_tracker.snapshot()
+        primary = snapshot['primary']
         regime_analysis = {
-            'current_regime': 'bull',  # Will be calculated from actual data
-            'confidence': 0.75,
-            'volatility_level': 'medium',
-            'correlation_level': 'low',
-            'regime_duration_days': 15,
-            'timestamp': datetime.now().isoformat()
+            'current_regime': primary.get('risk', 'unknown'),
+            'confidence': primary.get('confidence', 0),
+            'volatility_level': primary.get('volatility', 'unknown'),
+            'trend': primary.get('trend', 'unknown'),
+            'liquidity': primary.get('liquidity', 'unknown'),
+            'stable': primary.get('stable', False),
+            'regime_duration_days': round(primary.get('regime_duration_seconds', 0) / 86400, 2),
+            'markets': snapshot['markets'],
+            'timestamp': snapshot['timestamp']
         }
         
         return jsonify(regime_analysis)
@@ -2136,7 +2320,7 @@ def api_dashboard_overview():
     """Get comprehensive dashboard overview data"""
     try:
         status = platform.get_enhanced_status()
-        state_data = platform.state_manager.load_state()
+        state_data = platform.state_journal.read()
         
         # Enhanced dashboard metrics
         overview = {
@@ -2151,11 +2335,11 @@ def api_dashboard_overview():
                 'total_pnl': sum([t.get('pnl', 0) for t in state_data.get('executor', {}).get('open_trades', [])]),
                 'win_rate': 0  # Calculate from trade history when available
             },
-            'alert_summary': {
-                'total_alerts': len(platform.advanced_orchestrator.alert_manager.alert_history) if hasattr(platform, 'advanced_orchestrator') else 0,
-                'high_priority': len([a for a in platform.advanced_orchestrator.alert_manager.alert_history if a.priority == 'high']) if hasattr(platform, 'advanced_orchestrator') else 0,
-                'medium_priority': len([a for a in platform.advanced_orchestrator.alert_manager.alert_history if a.priority == 'medium']) if hasattr(platform, 'advanced_orchestrator') else 0,
-                'recent_24h': len([a for a in platform.advanced_orchestrator.alert_manager.alert_history if (datetime.now() - datetime.fromtimestamp(a.timestamp)).days < 1]) if hasattr(platform, 'advanced_orchestrator') else 0
+            'alert_summary': platform.advanced_orchestrator.get_alert_history().get_counters() if hasattr(platform, 'advanced_orchestrator') else {
+                'total_alerts': 0,
+                'high_priority': 0,
+                'medium_priority': 0,
+                'recent_24h': 0
             },
             'system_health': {
                 'scanners_active': len(state_data.get('scanner', {}).get('sources', [])),
@@ -2176,7 +2360,7 @@ def api_community_metrics():
     """Get community engagement metrics"""
     try:
         # Get state data from state manager
-        state_data = platform.state_manager.load_state()
+        state_data = platform.state_journal.read()
         
         metrics = {
             'reddit_engagement': {
@@ -2212,30 +2396,25 @@ def api_github_deploy():
         data = request.get_json() if request.is_json else {}
         commit_message = data.get('commit_message')
         
-        # Run GitHub deployment asynchronously
-        async def deploy_to_github():
-            return await platform.github_backup.push_source_code(commit_message)
-        
-        # Execute async function
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        success = loop.run_until_complete(deploy_to_github())
-        loop.close()
-        
-        if success:
-            repo_url = f"https://github.com/{platform.github_backup.repo_owner}/{platform.github_backup.repo_name}"
-            return jsonify({
+        # Run GitHub deployment as a maintenance job
+        async def deploy_to_github(context):
+            success = await platform.github_backup.push_source_code(commit_message)
+            if not success:
+                raise RuntimeError("Failed to deploy code to GitHub")
+            return {
                 "success": True,
                 "message": "Code successfully deployed to GitHub for review",
-                "repository_url": repo_url,
+                "repository_url": f"https://github.com/{platform.github_backup.repo_owner}/{platform.github_backup.repo_name}",
                 "timestamp": datetime.utcnow().isoformat() + "Z"
-            })
-        else:
-            return jsonify({
-                "success": False,
-                "message": "Failed to deploy code to GitHub"
-            }), 500
+            }
+        
+        job = platform.jobs.submit('maintenance', deploy_to_github, params={'commit_message': commit_message},
+                                   name='github_deploy', dedupe_key='github_deploy')
+        return jsonify({
+            "success": True,
+            "message": "GitHub deployment started",
+            "job": job
+        }), 202
         
     except Exception as e:
         logger.error(f"Error deploying to GitHub: {e}")
@@ -2410,25 +2589,31 @@ def api_analysis_portfolio():
         logger.error(f"Error getting portfolio analysis: {e}")
         return jsonify({"allocation": []}), 500
 
+# Dashboard labels for (risk, volatility) regime states
+REGIME_LABELS = {
+    ('risk_on', 'low'): 'Bullish',
+    ('risk_on', 'medium'): 'Bullish',
+    ('risk_off', 'high'): 'High Volatility',
+    ('risk_off', 'medium'): 'Bearish',
+    ('risk_off', 'low'): 'Bearish',
+    ('neutral', 'low'): 'Sideways',
+    ('neutral', 'medium'): 'Sideways',
+    ('neutral', 'high'): 'High Volatility'
+}
+
 @app.route('/api/analysis/regimes', methods=['GET'])
 def api_analysis_regimes():
     """Get regime detection analysis data"""
     try:
         regime_data = {"regime": "Unknown", "confidence": 0}
         
-        if hasattr(platform.advanced_orchestrator, 'regime_detector'):
-            # Get current regime from regime detector
-            current_regime = platform.advanced_orchestrator.regime_detector.get_current_regime()
+        primary = platform.advanced_orchestrator.regime_tracker.current()
+        if primary:
             regime_data = {
-                "regime": getattr(current_regime, 'regime_type', 'Bullish'),
-                "confidence": getattr(current_regime, 'confidence', 0.75) * 100
-            }
-        else:
-            # Fallback to sample data
-            import random
-            regime_data = {
-                "regime": random.choice(['Bullish', 'Bearish', 'Sideways', 'High Volatility']),
-                "confidence": random.randint(60, 90)
+                "regime": REGIME_LABELS.get((primary['risk'], primary['volatility']), primary['risk']),
+                "confidence": primary['confidence'] * 100,
+                "trend": primary['trend'],
+                "stable": primary['stable']
             }
         
         return jsonify(regime_data)
@@ -2584,15 +2769,14 @@ def api_screening_run():
         volume_min = float(filters.get('volume_min', 0))
         
         results = []
+        # Both asset types screen the same in-memory state
+        recent_patterns = platform.state_journal.get('decoder.recent_patterns', [])
         
         if asset_type in ['crypto', 'all']:
             # Get crypto data from Binance scanner
             try:
                 # Get recent crypto events from state
                 crypto_events = []
-                state = platform.state_manager.load_state()
-                recent_patterns = state.get('decoder', {}).get('recent_patterns', [])
-                
                 for pattern in recent_patterns[-20:]:  # Last 20 patterns
                     if pattern.get('source') == 'binance' or 'BTC' in pattern.get('asset', ''):
                         asset = pattern.get('asset', 'UNKNOWN')
@@ -2618,9 +2802,6 @@ def api_screening_run():
             try:
                 # Get recent equity events from state
                 equity_events = []
-                state = platform.state_manager.load_state()
-                recent_patterns = state.get('decoder', {}).get('recent_patterns', [])
-                
                 for pattern in recent_patterns[-20:]:  # Last 20 patterns
                     if pattern.get('source') == 'india_equity' or 'NIFTY' in pattern.get('asset', ''):
                         asset = pattern.get('asset', 'UNKNOWN')
@@ -2749,7 +2930,8 @@ def api_screening_alert():
         }
         
         # Send alert through platform
-        platform.executor.submit(platform.alert_sender.send_alert, alert_pattern, alert_data.get('confidence', 50))
+        platform.runtime.spawn(platform.alert_sender.send_alert(alert_pattern, alert_data.get('confidence', 50)),
+                               'screening_alert')
         
         return jsonify({'message': 'Alert created successfully'})
         
@@ -2762,8 +2944,98 @@ def backtesting():
     """Serve the backtesting page"""
     return render_template('backtesting.html')
 
-# Backtesting API endpoints
-BACKTESTS = {}  # In-memory store for demo - use DB in production
+# Job API endpoints
+@app.route('/api/jobs', methods=['GET'])
+def api_jobs():
+    """List jobs, newest first, with optional class and status filters"""
+    try:
+        jobs = platform.jobs.list(
+            job_class=request.args.get('class'),
+            status=request.args.get('status'),
+            limit=min(int(request.args.get('limit', 50)), 500)
+        )
+        return jsonify({'jobs': jobs, 'stats': platform.jobs.get_stats()})
+    except Exception as e:
+        logger.error(f"Error listing jobs: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+def api_job(job_id):
+    """Job status, progress and result"""
+    try:
+        job = platform.jobs.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job)
+    except Exception as e:
+        logger.error(f"Error getting job {job_id}: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<int:job_id>/cancel', methods=['POST'])
+def api_job_cancel(job_id):
+    """Cancel a queued job or ask a running one to stop"""
+    try:
+        job = platform.jobs.cancel(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job)
+    except Exception as e:
+        logger.error(f"Error cancelling job {job_id}: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Backtesting API endpoints (backtests run as jobs in the 'backtest' class)
+BACKTEST_STATUS = {'queued': 'running', 'completed': 'complete', 'failed': 'error'}
+
+def get_backtest_job(backtest_id):
+    job = platform.jobs.get(backtest_id)
+    if not job or job['job_class'] != 'backtest':
+        return None
+    return job
+
+def run_backtest_simulation(context):
+    """Simulated backtest reporting progress through its job context"""
+    import time
+    import random
+    
+    bt_params = context.params
+    # Simulate backtest processing with progress updates
+    strategy = bt_params.get('strategy', 'moving_average')
+    asset = bt_params.get('asset', 'BTC')
+    
+    # Simulate data processing
+    for i in range(1, 101):
+        time.sleep(0.1)  # Simulate processing time
+        context.report_progress(i)
+    
+    # Generate realistic sample results
+    base_pnl = random.uniform(-2000, 5000)
+    win_rate = random.uniform(45, 85)
+    max_drawdown = random.uniform(5, 25)
+    
+    # Generate time series data
+    labels = []
+    pnl_data = []
+    drawdown_data = []
+    
+    for month in range(1, 13):
+        labels.append(f'2024-{month:02d}')
+        pnl_data.append(base_pnl * (month / 12) + random.uniform(-200, 200))
+        drawdown_data.append(random.uniform(0, max_drawdown))
+    
+    return {
+        'strategy': strategy,
+        'asset': asset,
+        'total_pnl': base_pnl,
+        'win_rate': round(win_rate, 1),
+        'max_drawdown': round(max_drawdown, 1),
+        'total_trades': random.randint(50, 200),
+        'winning_trades': int(random.randint(50, 200) * win_rate / 100),
+        'sharpe_ratio': round(random.uniform(0.5, 2.5), 2),
+        'labels': labels,
+        'pnl_data': pnl_data,
+        'drawdown_data': drawdown_data,
+        'completion_time': datetime.utcnow().isoformat() + 'Z'
+    }
 
 @app.route('/api/backtest/run', methods=['POST'])
 def api_backtest_run():
@@ -2771,75 +3043,11 @@ def api_backtest_run():
     try:
         params = request.json or {}
         
-        # Generate unique backtest ID
-        backtest_id = len(BACKTESTS) + 1
-        
-        # Initialize backtest state
-        BACKTESTS[backtest_id] = {
-            'status': 'running',
-            'progress': 0,
-            'results': None,
-            'params': params,
-            'start_time': datetime.utcnow().isoformat() + 'Z'
-        }
-        
-        # Run backtest in background thread
-        def run_backtest_simulation(bt_id, bt_params):
-            import time
-            import random
-            
-            try:
-                # Simulate backtest processing with progress updates
-                strategy = bt_params.get('strategy', 'moving_average')
-                asset = bt_params.get('asset', 'BTC')
-                
-                # Simulate data processing
-                for i in range(1, 101):
-                    time.sleep(0.1)  # Simulate processing time
-                    BACKTESTS[bt_id]['progress'] = i
-                
-                # Generate realistic sample results
-                base_pnl = random.uniform(-2000, 5000)
-                win_rate = random.uniform(45, 85)
-                max_drawdown = random.uniform(5, 25)
-                
-                # Generate time series data
-                labels = []
-                pnl_data = []
-                drawdown_data = []
-                
-                for month in range(1, 13):
-                    labels.append(f'2024-{month:02d}')
-                    pnl_data.append(base_pnl * (month / 12) + random.uniform(-200, 200))
-                    drawdown_data.append(random.uniform(0, max_drawdown))
-                
-                # Complete the backtest
-                BACKTESTS[bt_id]['status'] = 'complete'
-                BACKTESTS[bt_id]['results'] = {
-                    'strategy': strategy,
-                    'asset': asset,
-                    'total_pnl': base_pnl,
-                    'win_rate': round(win_rate, 1),
-                    'max_drawdown': round(max_drawdown, 1),
-                    'total_trades': random.randint(50, 200),
-                    'winning_trades': int(random.randint(50, 200) * win_rate / 100),
-                    'sharpe_ratio': round(random.uniform(0.5, 2.5), 2),
-                    'labels': labels,
-                    'pnl_data': pnl_data,
-                    'drawdown_data': drawdown_data,
-                    'completion_time': datetime.utcnow().isoformat() + 'Z'
-                }
-                
-            except Exception as e:
-                logger.error(f"Error in backtest simulation: {e}")
-                BACKTESTS[bt_id]['status'] = 'error'
-                BACKTESTS[bt_id]['error'] = str(e)
-        
-        # Start background processing
-        platform.executor.submit(run_backtest_simulation, backtest_id, params)
+        # Start background processing on the backtest pool
+        job = platform.jobs.submit('backtest', run_backtest_simulation, params=params, name='backtest')
         
         return jsonify({
-            'id': backtest_id,
+            'id': job['id'],
             'message': 'Backtest started',
             'status': 'running'
         })
@@ -2852,15 +3060,15 @@ def api_backtest_run():
 def api_backtest_status(backtest_id):
     """Get backtest status and progress"""
     try:
-        backtest = BACKTESTS.get(backtest_id)
+        backtest = get_backtest_job(backtest_id)
         if not backtest:
             return jsonify({'error': 'Backtest not found'}), 404
         
         return jsonify({
             'id': backtest_id,
-            'status': backtest['status'],
+            'status': BACKTEST_STATUS.get(backtest['status'], backtest['status']),
             'progress': backtest['progress'],
-            'start_time': backtest.get('start_time'),
+            'start_time': backtest.get('started_at') or backtest.get('created_at'),
             'error': backtest.get('error')
         })
         
@@ -2872,14 +3080,14 @@ def api_backtest_status(backtest_id):
 def api_backtest_results(backtest_id):
     """Get backtest results"""
     try:
-        backtest = BACKTESTS.get(backtest_id)
+        backtest = get_backtest_job(backtest_id)
         if not backtest:
             return jsonify({'error': 'Backtest not found'}), 404
         
-        if backtest['status'] != 'complete':
+        if backtest['status'] != 'completed':
             return jsonify({'error': 'Backtest not complete yet'}), 400
         
-        return jsonify(backtest['results'])
+        return jsonify(backtest['result'])
         
     except Exception as e:
         logger.error(f"Error getting backtest results: {e}")
@@ -2972,8 +3180,8 @@ def api_backtest_preset(preset_id):
 def api_backtest_export(backtest_id):
     """Export backtest results to Excel"""
     try:
-        backtest = BACKTESTS.get(backtest_id)
-        if not backtest or backtest['status'] != 'complete':
+        backtest = get_backtest_job(backtest_id)
+        if not backtest or backtest['status'] != 'completed':
             return jsonify({'error': 'Backtest results not available'}), 404
         
         # Create Excel file
@@ -2981,7 +3189,7 @@ def api_backtest_export(backtest_id):
         ws = wb.active
         ws.title = "Backtest Results"
         
-        results = backtest['results']
+        results = backtest['result']
         
         # Add summary data
         ws['A1'] = 'Backtest Summary'
@@ -3429,3 +3637,6 @@ if __name__ == '__main__':
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         platform.stop()
+    finally:
+        platform.jobs.shutdown()
+        platform.runtime.stop()
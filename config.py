@@ -83,6 +83,7 @@ class Config:
     GITHUB_REPO_NAME = os.getenv('GITHUB_REPO_NAME', '')
     GITHUB_BRANCH = os.getenv('GITHUB_BRANCH', 'main')
     BACKUP_INTERVAL = int(os.getenv('BACKUP_INTERVAL', '3600'))  # 1 hour
+    ASYNC_ROUTE_TIMEOUT = int(os.getenv('ASYNC_ROUTE_TIMEOUT', '60'))  # seconds an API request waits on the platform loop
     
     # Encryption Configuration
     ENCRYPTION_PASSPHRASE = os.getenv('ENCRYPTION_PASSPHRASE', '')
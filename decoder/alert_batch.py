@@ -0,0 +1,200 @@
+"""
+Alert Batch
+Columnar representation of a cycle's candidate alerts with vectorized scoring
+and time-bucketed clustering ahead of the SmartAlertManager, which applies the
+fatigue, quiet-hours and daily-cap filters and sends
+"""
+
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.feature_scheduler import parse_cadence
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+
+
+def parse_alert_time(value: Any, default: float) -> float:
+    """Epoch seconds for a numeric, datetime or ISO-8601 timestamp; default when unparseable"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+class AlertBatch:
+    """Column lists for candidate alerts; messages are rendered only for survivors"""
+
+    def __init__(self, timestamp: Optional[float] = None):
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.alert_types: List[str] = []
+        self.symbols: List[str] = []
+        self.confidences: List[float] = []
+        self.timestamps: List[float] = []
+        # Caller-supplied timestamps as given (ISO strings stay strings); numeric copies above drive clustering
+        self.raw_timestamps: List[Any] = []
+        self.templates: List[Optional[str]] = []
+        self.payloads: List[Dict] = []
+
+    def __len__(self) -> int:
+        return len(self.alert_types)
+
+    def add(self, alert_type: str, symbol: str, confidence: float, message: Optional[str] = None,
+            timestamp: Optional[float] = None, **payload):
+        """Append one candidate; message is a str.format template over symbol, confidence and payload"""
+        self.alert_types.append(alert_type)
+        self.symbols.append(symbol)
+        self.confidences.append(float(confidence))
+        self.timestamps.append(parse_alert_time(timestamp, self.timestamp))
+        self.raw_timestamps.append(timestamp if timestamp is not None else self.timestamp)
+        self.templates.append(message)
+        self.payloads.append(payload)
+
+    def extend_records(self, records: List[Dict]):
+        """Append alert dicts produced elsewhere (e.g. correlation alerts) as-is"""
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            extra = {k: v for k, v in record.items()
+                     if k not in ('alert_type', 'symbol', 'confidence', 'timestamp', 'message')}
+            # Pre-rendered messages must not be re-formatted
+            message = record.get('message')
+            extra['rendered_message'] = message
+            self.add(record.get('alert_type', 'UNKNOWN'), record.get('symbol', 'UNKNOWN'),
+                     record.get('confidence', 0.0), None, record.get('timestamp'), **extra)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Integer-coded numpy columns for vectorized processing"""
+        symbol_values, symbol_codes = np.unique(np.array(self.symbols, dtype=object).astype(str), return_inverse=True)
+        type_values, type_codes = np.unique(np.array(self.alert_types, dtype=object).astype(str), return_inverse=True)
+        return {
+            'symbol_values': symbol_values,
+            'symbol_codes': symbol_codes.astype(np.int64),
+            'type_values': type_values,
+            'type_codes': type_codes.astype(np.int64),
+            'confidence': np.asarray(self.confidences, dtype=float),
+            'timestamp': np.asarray(self.timestamps, dtype=float)
+        }
+
+    def render(self, index: int, **extra) -> Dict:
+        """Materialize one row as the alert dict SmartAlertManager expects"""
+        payload = dict(self.payloads[index])
+        rendered = payload.pop('rendered_message', None)
+        template = self.templates[index]
+        if rendered is not None:
+            message = rendered
+        elif template is not None:
+            message = template.format(symbol=self.symbols[index], confidence=self.confidences[index], **payload)
+        else:
+            message = f"{self.alert_types[index]} alert for {self.symbols[index]}"
+
+        return {
+            **payload,
+            'alert_type': self.alert_types[index],
+            'symbol': self.symbols[index],
+            'confidence': self.confidences[index],
+            'message': message,
+            'timestamp': self.raw_timestamps[index],
+            **extra
+        }
+
+
+class VectorAlertPipeline:
+    """Scores and clusters an AlertBatch with numpy instead of per-alert Python.
+
+    Fatigue, quiet hours, confidence and the daily cap are SmartAlertManager's
+    filters; this only collapses each cluster to its best row and orders the
+    survivors, and counts what the manager reports as sent.
+    """
+
+    def __init__(self, config: Dict):
+        smart_config = config.get('smart_alerts', {})
+
+        self.window_seconds = parse_cadence(smart_config.get('clustering_window', '1h')) or 3600
+        self.fatigue_threshold = smart_config.get('fatigue_threshold', 5)
+        self.type_weights: Dict[str, float] = smart_config.get('type_weights', {})
+
+        # Alerts actually sent, per symbol over the last day; damps the ordering score
+        self.sent: Dict[str, deque] = {}
+        self.stats = {'cycles': 0, 'candidates': 0, 'forwarded': 0, 'sent': 0}
+
+    def scores(self, cols: Dict[str, np.ndarray], recent: np.ndarray) -> np.ndarray:
+        """Confidence x alert-type weight, damped by the symbol's recently sent alerts"""
+        weights = np.array([self.type_weights.get(t, 1.0) for t in cols['type_values']], dtype=float)
+        fatigue = 1.0 / (1.0 + recent / max(self.fatigue_threshold, 1))
+        return cols['confidence'] * weights[cols['type_codes']] * fatigue
+
+    def cluster(self, cols: Dict[str, np.ndarray], scores: np.ndarray):
+        """Hash (symbol, alert_type, time window) to a cluster id; return ids, best row per cluster and sizes"""
+        buckets = (cols['timestamp'] // self.window_seconds).astype(np.int64)
+        bucket_offset = buckets - buckets.min()
+        n_types = len(cols['type_values'])
+        n_buckets = int(bucket_offset.max()) + 1
+        keys = (cols['symbol_codes'] * n_types + cols['type_codes']) * n_buckets + bucket_offset
+
+        _, cluster_ids = np.unique(keys, return_inverse=True)
+        order = np.lexsort((-scores, cluster_ids))
+        sorted_ids = cluster_ids[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_ids[1:] != sorted_ids[:-1]
+        return cluster_ids, order[first], np.bincount(cluster_ids)
+
+    def prune_sent(self, now: float):
+        cutoff = now - DAY_SECONDS
+        for symbol in list(self.sent):
+            history = self.sent[symbol]
+            while history and history[0] < cutoff:
+                history.popleft()
+            if not history:
+                del self.sent[symbol]
+
+    def recent_counts(self, symbol_values: np.ndarray) -> np.ndarray:
+        """Alerts sent per symbol over the last day, aligned to symbol codes"""
+        return np.array([len(self.sent.get(symbol, ())) for symbol in symbol_values], dtype=float)
+
+    def process(self, batch: AlertBatch, now: Optional[float] = None) -> Dict[str, Any]:
+        """Reduce a batch to one alert per cluster, best score first, for SmartAlertManager to filter and send"""
+        now = now if now is not None else time.time()
+        self.stats['cycles'] += 1
+        self.stats['candidates'] += len(batch)
+        summary = {'candidates': len(batch), 'clusters': 0, 'forwarded': 0}
+        if not len(batch):
+            return {'alerts': [], 'summary': summary}
+
+        self.prune_sent(now)
+        cols = batch.columns()
+        recent = self.recent_counts(cols['symbol_values'])
+        scores = self.scores(cols, recent[cols['symbol_codes']])
+        cluster_ids, best, sizes = self.cluster(cols, scores)
+        summary['clusters'] = len(best)
+
+        best = best[np.argsort(-scores[best], kind='stable')]
+        alerts = [batch.render(int(row), score=float(scores[row]), cluster_size=int(sizes[cluster_ids[row]]))
+                  for row in best]
+
+        summary['forwarded'] = len(alerts)
+        self.stats['forwarded'] += len(alerts)
+        return {'alerts': alerts, 'summary': summary}
+
+    def record_sent(self, alerts: List[Dict], now: Optional[float] = None) -> int:
+        """Count the alerts SmartAlertManager actually sent"""
+        now = now if now is not None else time.time()
+        for alert in alerts:
+            self.sent.setdefault(alert.get('symbol', 'UNKNOWN'), deque()).append(now)
+        self.stats['sent'] += len(alerts)
+        return len(alerts)
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'tracked_symbols': len(self.sent)}
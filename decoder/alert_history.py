@@ -0,0 +1,224 @@
+"""
+Alert History Store
+Fixed-capacity, time-ordered ring of smart alerts with secondary indexes by
+symbol, priority and alert_type plus running counters, so dashboard and
+paginated alert queries are index lookups instead of full-history scans
+"""
+
+import bisect
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEXED_FIELDS = ('symbol', 'priority', 'alert_type')
+
+ALERT_FIELDS = (
+    'id', 'alert_type', 'symbol', 'confidence', 'message', 'timestamp', 'priority'
+)
+# Optional scoring fields and their defaults when an alert does not carry them
+ALERT_DEFAULTS = {
+    'risk_score': 0,
+    'business_impact': 0,
+    'threat_intel_score': 0,
+    'importance_score': 0,
+    'disposition': 'pending',
+    'cluster_id': None
+}
+
+
+def alert_field(alert: Any, name: str, default: Any = None) -> Any:
+    if isinstance(alert, dict):
+        return alert.get(name, default)
+    return getattr(alert, name, default)
+
+
+def alert_to_dict(alert: Any) -> Dict:
+    """JSON-ready view of an alert object or dict"""
+    data = {name: alert_field(alert, name) for name in ALERT_FIELDS}
+    data.update({name: alert_field(alert, name, default) for name, default in ALERT_DEFAULTS.items()})
+    return data
+
+
+class AlertHistoryStore:
+    """Bounded alert history that still behaves like the list SmartAlertManager appends to"""
+
+    def __init__(self, capacity: int = 10000, alerts: Optional[Iterable] = None):
+        self.capacity = max(1, int(capacity))
+        self.slots: List[Any] = [None] * self.capacity
+        self.timestamps: List[float] = [0.0] * self.capacity
+        # Sequence numbers of live entries are first_seq .. next_seq - 1
+        self.first_seq = 0
+        self.next_seq = 0
+        self.indexes: Dict[str, Dict[Any, deque]] = {field: {} for field in INDEXED_FIELDS}
+        self.total_added = 0
+        self.evicted = 0
+
+        for alert in alerts or []:
+            self.append(alert)
+
+    # List protocol used by SmartAlertManager ----------------------------------
+
+    def __len__(self) -> int:
+        return self.next_seq - self.first_seq
+
+    def __iter__(self) -> Iterator:
+        """Oldest to newest"""
+        for seq in range(self.first_seq, self.next_seq):
+            yield self.slots[seq % self.capacity]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return list(self)[item]
+        size = len(self)
+        if item < 0:
+            item += size
+        if not 0 <= item < size:
+            raise IndexError('alert history index out of range')
+        return self.slots[(self.first_seq + item) % self.capacity]
+
+    def append(self, alert: Any):
+        if len(self) == self.capacity:
+            self._evict_oldest()
+
+        seq = self.next_seq
+        slot = seq % self.capacity
+        timestamp = float(alert_field(alert, 'timestamp', 0) or 0)
+        # Keep the ring time-ordered even if an alert arrives with an older timestamp
+        if len(self) and timestamp < self.timestamps[(seq - 1) % self.capacity]:
+            timestamp = self.timestamps[(seq - 1) % self.capacity]
+
+        self.slots[slot] = alert
+        self.timestamps[slot] = timestamp
+        for field in INDEXED_FIELDS:
+            key = self._index_key(field, alert)
+            self.indexes[field].setdefault(key, deque()).append(seq)
+
+        self.next_seq += 1
+        self.total_added += 1
+
+    def extend(self, alerts: Iterable):
+        for alert in alerts:
+            self.append(alert)
+
+    def clear(self):
+        self.__init__(self.capacity)
+
+    def _index_key(self, field: str, alert: Any) -> Any:
+        value = alert_field(alert, field)
+        return str(value) if value is not None else None
+
+    def _evict_oldest(self):
+        seq = self.first_seq
+        slot = seq % self.capacity
+        alert = self.slots[slot]
+        for field in INDEXED_FIELDS:
+            key = self._index_key(field, alert)
+            index = self.indexes[field].get(key)
+            # FIFO eviction: the oldest live entry is always at the left of its index deques
+            if index and index[0] == seq:
+                index.popleft()
+                if not index:
+                    del self.indexes[field][key]
+        self.slots[slot] = None
+        self.first_seq += 1
+        self.evicted += 1
+
+    # Queries -------------------------------------------------------------------
+
+    def _candidate_seqs(self, priority: Optional[str], asset: Optional[str],
+                        alert_type: Optional[str]) -> Optional[List[int]]:
+        """Smallest index posting list among the filters, oldest first; None means no filter"""
+        candidates = []
+        if priority:
+            candidates.append(list(self.indexes['priority'].get(priority, ())))
+        if alert_type:
+            candidates.append(list(self.indexes['alert_type'].get(alert_type, ())))
+        if asset:
+            asset_upper = asset.upper()
+            matching = [seqs for symbol, seqs in self.indexes['symbol'].items()
+                        if symbol and asset_upper in symbol.upper()]
+            merged = list(matching[0]) if len(matching) == 1 else sorted(s for seqs in matching for s in seqs)
+            candidates.append(merged)
+        if not candidates:
+            return None
+        return min(candidates, key=len)
+
+    def _matches(self, alert: Any, priority: Optional[str], asset: Optional[str],
+                 alert_type: Optional[str]) -> bool:
+        if priority and str(alert_field(alert, 'priority')) != priority:
+            return False
+        if alert_type and alert_field(alert, 'alert_type') != alert_type:
+            return False
+        if asset and asset.upper() not in (alert_field(alert, 'symbol') or '').upper():
+            return False
+        return True
+
+    def query(self, page: int = 1, per_page: int = 20, priority: Optional[str] = None,
+              asset: Optional[str] = None, alert_type: Optional[str] = None) -> Dict:
+        """Newest-first page of alerts matching the filters"""
+        page = max(1, page)
+        per_page = max(1, per_page)
+        start = (page - 1) * per_page
+
+        seqs = self._candidate_seqs(priority, asset, alert_type)
+        if seqs is None:
+            total = len(self)
+            newest = self.next_seq - 1 - start
+            page_seqs = range(newest, max(self.first_seq - 1, newest - per_page), -1)
+        else:
+            matched = [seq for seq in reversed(seqs)
+                       if self._matches(self.slots[seq % self.capacity], priority, asset, alert_type)]
+            total = len(matched)
+            page_seqs = matched[start:start + per_page]
+
+        return {
+            'alerts': [alert_to_dict(self.slots[seq % self.capacity]) for seq in page_seqs],
+            'total': total,
+            'page': page,
+            'per_page': per_page
+        }
+
+    def count_since(self, since: float) -> int:
+        """Number of stored alerts with timestamp >= since (binary search over the ring)"""
+        size = len(self)
+        ordered = _RingView(self.timestamps, self.first_seq, self.capacity, size)
+        return size - bisect.bisect_left(ordered, since)
+
+    def get_counters(self, now: Optional[float] = None) -> Dict:
+        now = now if now is not None else time.time()
+        priorities = self.indexes['priority']
+        return {
+            'total_alerts': len(self),
+            'high_priority': len(priorities.get('high', ())),
+            'medium_priority': len(priorities.get('medium', ())),
+            'recent_24h': self.count_since(now - 86400)
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            'stored': len(self),
+            'capacity': self.capacity,
+            'total_added': self.total_added,
+            'evicted': self.evicted,
+            'symbols': len(self.indexes['symbol']),
+            'alert_types': len(self.indexes['alert_type'])
+        }
+
+
+class _RingView:
+    """Read-only sequence over ring timestamps in time order, for bisect"""
+
+    def __init__(self, values: List[float], first_seq: int, capacity: int, size: int):
+        self.values = values
+        self.first_seq = first_seq
+        self.capacity = capacity
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> float:
+        return self.values[(self.first_seq + i) % self.capacity]
@@ -0,0 +1,250 @@
+"""
+Batch Causal Screener
+Screens every ordered asset pair for lead/lag relationships in one vectorized
+pass. Lagged cross-products of the shared return matrix are accumulated
+incrementally per bar; lagged cross-correlations and Granger F-tests for any
+pair are then read off those sufficient statistics without revisiting history.
+Observation counts are kept per symbol and per pair, so symbols that joined
+late or skip bars are normalised by their own history, and pairs with too few
+joint observations are left out of the screen.
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import stats
+
+logger = logging.getLogger(__name__)
+
+
+def benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """False-discovery-rate adjusted p-values (q-values) for a family of tests"""
+    count = len(p_values)
+    if not count:
+        return p_values
+    order = np.argsort(p_values)
+    ranked = p_values[order] * count / np.arange(1, count + 1)
+    adjusted = np.minimum.accumulate(ranked[::-1])[::-1]
+    q_values = np.empty(count)
+    q_values[order] = np.clip(adjusted, 0.0, 1.0)
+    return q_values
+
+
+class BatchCausalScreener:
+    """Incremental lagged-moment accumulator with batched correlation and Granger screens"""
+
+    def __init__(self, config: Dict):
+        causal_config = config.get('ai_strategist_features', {}).get('causal_analysis', {})
+        params = causal_config.get('parameters', {})
+
+        self.max_lag = params.get('max_lag', 5)
+        self.granger_lag = min(params.get('granger_lag', 2), self.max_lag)
+        self.min_observations = params.get('min_observations', 50)
+        self.significance = params.get('significance_threshold', 0.05)
+        self.effect_size = params.get('effect_size_threshold', 0.1)
+        self.confidence_threshold = params.get('confidence_threshold', 0.6)
+        # Exponential forgetting keeps the statistics tracking the current regime
+        self.forgetting = params.get('forgetting_factor', 0.995)
+
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.recent: deque = deque(maxlen=self.max_lag + 1)
+        self.recent_valid: deque = deque(maxlen=self.max_lag + 1)
+
+        depth = self.max_lag + 1
+        self.n = 0.0
+        self.observations = 0
+        # Forgetting-weighted bars with a full lag window per symbol, and jointly per (cause, effect) pair
+        self.symbol_n = np.zeros(0)
+        self.pair_n = np.zeros((0, 0))
+        # sums[k] = sum r_{t-k};  cross[k, l] = sum r_{t-k} r_{t-l}^T
+        self.sums = np.zeros((depth, 0))
+        self.cross = np.zeros((depth, depth, 0, 0))
+        self.last_screen: List[Dict] = []
+        self.last_screen_time: Optional[float] = None
+
+    # Accumulation ------------------------------------------------------------------
+
+    def ensure_symbols(self, symbols: Sequence[str]):
+        """Grow the universe; new symbols start with zero history"""
+        new = [s for s in symbols if s not in self.index]
+        if not new:
+            return
+        for symbol in new:
+            self.index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+        grow = len(new)
+        self.sums = np.pad(self.sums, ((0, 0), (0, grow)))
+        self.cross = np.pad(self.cross, ((0, 0), (0, 0), (0, grow), (0, grow)))
+        self.recent = deque((np.pad(row, (0, grow)) for row in self.recent), maxlen=self.recent.maxlen)
+        self.recent_valid = deque((np.pad(row, (0, grow)) for row in self.recent_valid),
+                                  maxlen=self.recent_valid.maxlen)
+        self.symbol_n = np.pad(self.symbol_n, (0, grow))
+        self.pair_n = np.pad(self.pair_n, ((0, grow), (0, grow)))
+
+    def update_prices(self, prices: Dict[str, float]):
+        """Append one bar from latest prices; symbols without a return this bar are marked missing"""
+        self.ensure_symbols(list(prices))
+        returns = np.zeros(len(self.symbols))
+        valid = np.zeros(len(self.symbols), dtype=bool)
+        for symbol, price in prices.items():
+            previous = self.last_prices.get(symbol)
+            if previous and price and previous > 0 and price > 0:
+                returns[self.index[symbol]] = math.log(price / previous)
+                valid[self.index[symbol]] = True
+            if price:
+                self.last_prices[symbol] = price
+        self.update(returns, valid)
+
+    def update(self, returns: np.ndarray, valid: Optional[np.ndarray] = None):
+        """Fold one cross-sectional return row into the lagged moment sums; missing returns must be zero"""
+        returns = np.asarray(returns, dtype=float)
+        valid = np.ones(len(returns), dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+        self.recent.appendleft(np.where(valid, returns, 0.0))
+        self.recent_valid.appendleft(valid)
+        if len(self.recent) < self.recent.maxlen:
+            return
+
+        lagged = np.stack(self.recent)  # row k is r_{t-k}
+        # A symbol counts for this bar only when its whole lag window was observed
+        window = np.stack(self.recent_valid).all(axis=0).astype(float)
+        self.n = self.forgetting * self.n + 1.0
+        self.symbol_n = self.forgetting * self.symbol_n + window
+        self.pair_n = self.forgetting * self.pair_n + np.outer(window, window)
+        self.sums = self.forgetting * self.sums + lagged
+        self.cross = self.forgetting * self.cross + np.einsum('kn,lm->klnm', lagged, lagged)
+        self.observations += 1
+
+    # Screening -------------------------------------------------------------------------
+
+    def pair_indices(self, pairs: Optional[Sequence[Tuple[str, str]]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(cause, effect) index arrays; all ordered pairs when pairs is None"""
+        if pairs is None:
+            size = len(self.symbols)
+            causes, effects = np.meshgrid(np.arange(size), np.arange(size), indexing='ij')
+            mask = causes != effects
+            return causes[mask], effects[mask]
+
+        known = [(self.index[a], self.index[b]) for a, b in pairs if a in self.index and b in self.index and a != b]
+        if not known:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+        causes, effects = zip(*known)
+        return np.array(causes), np.array(effects)
+
+    def lagged_correlations(self, causes: np.ndarray, effects: np.ndarray) -> np.ndarray:
+        """corr(cause_{t-k}, effect_t) for k = 1..max_lag, shape (pairs, max_lag)"""
+        symbol_n = np.clip(self.symbol_n, 1e-12, None)
+        pair_n = np.clip(self.pair_n[causes, effects], 1e-12, None)
+        means = self.sums / symbol_n
+        effect_mean = means[0][effects]
+        effect_var = self.cross[0, 0][effects, effects] / symbol_n[effects] - effect_mean ** 2
+
+        correlations = np.zeros((len(causes), self.max_lag))
+        for k in range(1, self.max_lag + 1):
+            cause_mean = means[k][causes]
+            cov = self.cross[k, 0][causes, effects] / pair_n - cause_mean * effect_mean
+            cause_var = self.cross[k, k][causes, causes] / symbol_n[causes] - cause_mean ** 2
+            denom = np.sqrt(np.clip(cause_var * effect_var, 1e-24, None))
+            correlations[:, k - 1] = cov / denom
+        return np.clip(np.nan_to_num(correlations), -1.0, 1.0)
+
+    def granger(self, causes: np.ndarray, effects: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Granger F statistic and p-value for cause -> effect using granger_lag lags"""
+        g = self.granger_lag
+        pairs = len(causes)
+        dim = 2 * g + 1
+
+        # Regressors: [1, effect_{t-1..t-g}, cause_{t-1..t-g}] assembled from the shared sums
+        series = [(a, effects) for a in range(1, g + 1)] + [(a, causes) for a in range(1, g + 1)]
+        gram = np.empty((pairs, dim, dim))
+        target = np.empty((pairs, dim))
+        pair_n = self.pair_n[causes, effects]
+        gram[:, 0, 0] = pair_n
+        target[:, 0] = self.sums[0][effects]
+        for row, (lag_a, idx_a) in enumerate(series, start=1):
+            gram[:, 0, row] = gram[:, row, 0] = self.sums[lag_a][idx_a]
+            target[:, row] = self.cross[lag_a, 0][idx_a, effects]
+            for col, (lag_b, idx_b) in enumerate(series, start=1):
+                gram[:, row, col] = self.cross[lag_a, lag_b][idx_a, idx_b]
+
+        yy = self.cross[0, 0][effects, effects]
+        ridge = 1e-10 * np.eye(dim)
+        restricted = slice(0, g + 1)
+
+        def rss(matrix, vector):
+            coef = np.linalg.solve(matrix + ridge[:matrix.shape[1], :matrix.shape[1]], vector[..., None])[..., 0]
+            return np.clip(yy - np.einsum('pi,pi->p', coef, vector), 1e-18, None)
+
+        rss_unrestricted = rss(gram, target)
+        rss_restricted = rss(gram[:, restricted, restricted], target[:, restricted])
+
+        dof = np.clip(pair_n - dim, 1.0, None)
+        f_stat = np.clip((rss_restricted - rss_unrestricted) / g / (rss_unrestricted / dof), 0.0, None)
+        p_values = stats.f.sf(f_stat, g, dof)
+        return f_stat, p_values
+
+    def screen(self, pairs: Optional[Sequence[Tuple[str, str]]] = None, top_k: Optional[int] = None) -> List[Dict]:
+        """Test all (or the given) pairs; returns hypotheses sorted by confidence"""
+        if self.observations < self.min_observations or len(self.symbols) < 2:
+            return []
+
+        causes, effects = self.pair_indices(pairs)
+        # Pairs need enough joint history of their own, not just enough bars overall
+        enough = self.pair_n[causes, effects] >= self.min_observations
+        causes, effects = causes[enough], effects[enough]
+        if not len(causes):
+            return []
+
+        correlations = self.lagged_correlations(causes, effects)
+        best = np.abs(correlations).argmax(axis=1)
+        best_corr = correlations[np.arange(len(causes)), best]
+        f_stat, p_values = self.granger(causes, effects)
+
+        # Screening many pairs at once: control the false discovery rate, not per-test error
+        q_values = benjamini_hochberg(p_values)
+        strength = np.clip(np.abs(best_corr) / self.effect_size, 0.0, 1.0)
+        confidence = (1.0 - q_values) * strength
+        significant = (q_values < self.significance) & (np.abs(best_corr) >= self.effect_size)
+
+        order = np.argsort(-confidence, kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
+
+        hypotheses = [{
+            'cause': self.symbols[causes[i]],
+            'effect': self.symbols[effects[i]],
+            'best_lag': int(best[i]) + 1,
+            'lag_correlation': float(best_corr[i]),
+            'granger_f': float(f_stat[i]),
+            'p_value': float(p_values[i]),
+            'q_value': float(q_values[i]),
+            'observations': round(float(self.pair_n[causes[i], effects[i]]), 1),
+            'significant': bool(significant[i]),
+            'confidence': float(confidence[i])
+        } for i in order]
+
+        if pairs is None:
+            self.last_screen = hypotheses
+            self.last_screen_time = time.time()
+        return hypotheses
+
+    def get_active_hypotheses(self, min_confidence: Optional[float] = None) -> List[Dict]:
+        threshold = self.confidence_threshold if min_confidence is None else min_confidence
+        return [h for h in self.last_screen if h['significant'] and h['confidence'] >= threshold]
+
+    def get_stats(self) -> Dict:
+        size = len(self.symbols)
+        return {
+            'symbols': size,
+            'pairs': size * (size - 1),
+            'observations': self.observations,
+            'effective_observations': round(self.n, 1),
+            'screenable_pairs': int((self.pair_n >= self.min_observations).sum() - (self.symbol_n >= self.min_observations).sum()),
+            'last_screen_time': self.last_screen_time
+        }
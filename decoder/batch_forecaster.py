@@ -0,0 +1,268 @@
+"""
+Batch Forecaster
+Fits Prophet models for many series in parallel worker processes. Series are
+resampled into completed bars on the forecast horizon's timescale (daily bars
+for day horizons), fitted parameters are cached per bar window, and refits
+warm-start from the previous fit once a new bar completes
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Series = List[Tuple[float, float]]
+
+DAY_SECONDS = 86400
+
+
+def resample_bars(series: Series, bar_seconds: float, now: Optional[float] = None) -> Series:
+    """Last value per bar as (bar_start, close), dropping the bar still forming at now"""
+    now = now if now is not None else time.time()
+    current = now - now % bar_seconds
+    bars: Dict[float, float] = {}
+    for ts, value in series:
+        start = ts - ts % bar_seconds
+        if start < current:
+            bars[start] = value
+    return sorted(bars.items())
+
+
+def seasonality_for(bar_seconds: float, span_seconds: float, prophet_settings: Dict) -> Dict:
+    """Only enable seasonalities the bar size can resolve and the history can cover"""
+    return {
+        'daily_seasonality': prophet_settings.get('daily_seasonality', True) and bar_seconds < DAY_SECONDS,
+        'weekly_seasonality': prophet_settings.get('weekly_seasonality', True) and span_seconds >= 14 * DAY_SECONDS,
+        'yearly_seasonality': prophet_settings.get('yearly_seasonality', False) and span_seconds >= 730 * DAY_SECONDS
+    }
+
+
+def warm_start_params(params: Dict) -> Dict:
+    """Reduce fitted Prophet params to the init dict accepted by Prophet.fit"""
+    init = {}
+    for name in ('k', 'm', 'sigma_obs'):
+        init[name] = float(params[name][0][0])
+    for name in ('delta', 'beta'):
+        init[name] = [float(v) for v in params[name][0]]
+    return init
+
+
+def build_model(prophet_settings: Dict, seasonality: Dict):
+    from prophet import Prophet
+
+    return Prophet(
+        **seasonality,
+        uncertainty_samples=prophet_settings.get('uncertainty_samples', 100),
+        changepoint_prior_scale=prophet_settings.get('changepoint_prior_scale', 0.05)
+    )
+
+
+def fit_series(series_key: str, bars: Series, horizon_days: int, prophet_settings: Dict,
+               init: Optional[Dict] = None, bar_seconds: float = DAY_SECONDS) -> Dict:
+    """Fit one bar series and summarize its forecast at the horizon; runs inside a worker process"""
+    import pandas as pd
+
+    df = pd.DataFrame({
+        'ds': pd.to_datetime([ts for ts, _ in bars], unit='s'),
+        'y': [value for _, value in bars]
+    })
+    seasonality = seasonality_for(bar_seconds, bars[-1][0] - bars[0][0], prophet_settings)
+
+    model = build_model(prophet_settings, seasonality)
+
+    warm_started = False
+    if init is not None:
+        try:
+            model.fit(df, init=init)
+            warm_started = True
+        except Exception:
+            # Parameter shapes change when changepoints move; fall back to a cold fit
+            model = build_model(prophet_settings, seasonality)
+            model.fit(df)
+    else:
+        model.fit(df)
+
+    periods = max(1, int(round(horizon_days * DAY_SECONDS / bar_seconds)))
+    future = model.make_future_dataframe(periods=periods, freq=f'{int(bar_seconds)}s', include_history=False)
+    forecast = model.predict(future)
+    final = forecast.iloc[-1]
+    last_value = float(df['y'].iloc[-1])
+    predicted = float(final['yhat'])
+
+    return {
+        'series': series_key,
+        'horizon_days': horizon_days,
+        'bar_seconds': bar_seconds,
+        'last_value': last_value,
+        'predicted': predicted,
+        'lower': float(final['yhat_lower']),
+        'upper': float(final['yhat_upper']),
+        'expected_change_pct': (predicted - last_value) / last_value * 100 if last_value else 0.0,
+        'trend': 'up' if predicted >= last_value else 'down',
+        'points': len(df),
+        'warm_started': warm_started,
+        'params': warm_start_params(model.params),
+        'fitted_at': datetime.now().isoformat()
+    }
+
+
+class BatchForecaster:
+    """Forecasts a whole universe of series per call with process-level parallelism"""
+
+    def __init__(self, config: Dict, fallback: Optional[Callable[[str, int], Dict]] = None,
+                 fit_fn: Callable[..., Dict] = fit_series):
+        forecast_config = config.get('phase5_features', {}).get('ai_forecasting', {})
+        batch_config = forecast_config.get('batch', {})
+
+        self.prophet_settings = forecast_config.get('prophet_settings', {})
+        self.max_workers = batch_config.get('max_workers', 4)
+        self.min_points = batch_config.get('min_points', 30)
+        self.bar_seconds = batch_config.get('bar_seconds', DAY_SECONDS)
+        # Wait for fits only within the phase5_advanced stage budget; slower fits finish in the background
+        stage_budget = config.get('orchestrator', {}).get('cycle_budget', {}).get(
+            'stage_seconds', {}).get('phase5_advanced')
+        self.timeout_seconds = batch_config.get('timeout_seconds', 6)
+        if stage_budget:
+            self.timeout_seconds = min(self.timeout_seconds, stage_budget * 0.75)
+        self.fallback = fallback
+        self.fit_fn = fit_fn
+
+        self.executor = None
+        self.fitted: Dict[str, Dict] = {}
+        self.inflight: Dict[str, Dict] = {}
+        self.fallback_cache: Dict[tuple, Dict] = {}
+        self.stats = {'cache_hits': 0, 'warm_fits': 0, 'cold_fits': 0, 'fallbacks': 0, 'failures': 0,
+                      'background_fits': 0}
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def store_fit(self, cache_key: str, window: tuple, outcome: Dict) -> Dict:
+        self.stats['warm_fits' if outcome.get('warm_started') else 'cold_fits'] += 1
+        params = outcome.pop('params', None)
+        self.fitted[cache_key] = {'window': window, 'params': params, 'forecast': outcome}
+        return outcome
+
+    def start_fit(self, key: str, cache_key: str, bars: Series, horizon_days: int, window: tuple):
+        """Submit a fit whose result is cached when it completes, even if no caller is still waiting"""
+        loop = asyncio.get_running_loop()
+        cached = self.fitted.get(cache_key)
+        init = cached['params'] if cached else None
+        future = loop.run_in_executor(
+            self.get_executor(), self.fit_fn, key, bars, horizon_days, self.prophet_settings, init, self.bar_seconds
+        )
+        entry = {'window': window, 'future': future}
+        self.inflight[cache_key] = entry
+
+        def completed(done: asyncio.Future):
+            if self.inflight.get(cache_key) is entry:
+                del self.inflight[cache_key]
+            if done.cancelled():
+                return
+            if done.exception() is not None:
+                self.stats['failures'] += 1
+                logger.error(f"Forecast failed for {key}: {done.exception()}")
+                return
+            self.store_fit(cache_key, window, done.result())
+
+        future.add_done_callback(completed)
+        return future
+
+    async def forecast_universe(self, series_by_key: Dict[str, Series], horizon_days: int,
+                                now: Optional[float] = None) -> Dict[str, Dict]:
+        """Forecast every series from its completed bars, reusing fits whose bar window has not moved"""
+        results: Dict[str, Dict] = {}
+        pending = {}
+        singles = {}
+
+        for key, series in series_by_key.items():
+            bars = resample_bars(series, self.bar_seconds, now)
+            if len(bars) < self.min_points:
+                # Too little history at this timescale: the single-series model forecasts instead
+                marker = bars[-1][0] if bars else int((now or time.time()) // self.bar_seconds)
+                singles[key] = asyncio.ensure_future(self.cached_single(key, horizon_days, marker, self.fallback))
+                continue
+
+            cache_key = f'{key}:{horizon_days}'
+            window = (bars[0][0], bars[-1][0], len(bars))
+            cached = self.fitted.get(cache_key)
+            if cached and cached['window'] == window:
+                self.stats['cache_hits'] += 1
+                results[key] = cached['forecast']
+                continue
+
+            inflight = self.inflight.get(cache_key)
+            if inflight and inflight['window'] == window:
+                pending[key] = (inflight['future'], window)
+            else:
+                pending[key] = (self.start_fit(key, cache_key, bars, horizon_days, window), window)
+
+        if pending:
+            # asyncio.wait never cancels the fits; stragglers land in the cache for the next cycle
+            done, not_done = await asyncio.wait([future for future, _ in pending.values()],
+                                                timeout=self.timeout_seconds)
+            if not_done:
+                self.stats['background_fits'] += len(not_done)
+                logger.warning(f"{len(not_done)} forecasts still fitting after {self.timeout_seconds:.1f}s; "
+                               f"serving previous fits for them")
+            for key, (future, window) in pending.items():
+                fitted = self.fitted.get(f'{key}:{horizon_days}')
+                if fitted is None:
+                    continue
+                fresh = fitted['window'] == window
+                results[key] = fitted['forecast'] if fresh else {**fitted['forecast'], 'stale': True}
+
+        if singles:
+            outcomes = await asyncio.gather(*singles.values(), return_exceptions=True)
+            for key, outcome in zip(singles, outcomes):
+                if isinstance(outcome, Exception):
+                    self.stats['failures'] += 1
+                    logger.error(f"Forecast failed for {key}: {outcome}")
+                elif outcome is not None:
+                    results[key] = outcome
+
+        return results
+
+    async def cached_single(self, key: str, horizon_days: int, marker,
+                            fn: Optional[Callable[[str, int], Dict]]) -> Optional[Dict]:
+        """Run a single-series forecast fn(key, horizon) in a thread, cached until marker changes"""
+        if fn is None:
+            return None
+
+        cache_key = (key, horizon_days, marker)
+        if cache_key in self.fallback_cache:
+            self.stats['cache_hits'] += 1
+            return self.fallback_cache[cache_key]
+
+        self.stats['fallbacks'] += 1
+        result = await asyncio.to_thread(fn, key, horizon_days)
+        if isinstance(result, dict) and 'error' not in result:
+            result = {**result, 'source': 'single'}
+            # Keep only the latest marker per series
+            for stale in [k for k in self.fallback_cache if k[:2] == (key, horizon_days)]:
+                del self.fallback_cache[stale]
+            self.fallback_cache[cache_key] = result
+            return result
+        return None
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'fitted_series': len(self.fitted),
+            'inflight': len(self.inflight),
+            'max_workers': self.max_workers,
+            'bar_seconds': self.bar_seconds,
+            'timeout_seconds': self.timeout_seconds,
+            'timestamp': time.time()
+        }
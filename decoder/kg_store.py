@@ -0,0 +1,383 @@
+"""
+Knowledge Graph Store
+SQLite-backed knowledge graph with integer-keyed, clustered adjacency tables,
+lazy timestamp-based edge decay, incremental pruning by precomputed expiry
+and running counters for stats. Tables left by the previous KG are renamed to
+*_legacy and imported on first open. Writes are group-committed: a linking pass
+inside batch() commits once, and loose writes commit every commit_every writes
+or commit_interval_seconds, whichever comes first
+"""
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS kg_nodes (
+        id INTEGER PRIMARY KEY,
+        key TEXT NOT NULL UNIQUE,
+        node_type TEXT,
+        attrs TEXT,
+        updated_at REAL
+    )''',
+    # WITHOUT ROWID clusters edges by source node: a CSR-like adjacency layout on disk
+    '''CREATE TABLE IF NOT EXISTS kg_edges (
+        src INTEGER NOT NULL,
+        dst INTEGER NOT NULL,
+        relation TEXT NOT NULL,
+        weight REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        prune_at REAL NOT NULL,
+        PRIMARY KEY (src, relation, dst)
+    ) WITHOUT ROWID''',
+    'CREATE INDEX IF NOT EXISTS idx_kg_edges_dst ON kg_edges (dst, relation)',
+    'CREATE INDEX IF NOT EXISTS idx_kg_edges_prune_at ON kg_edges (prune_at)'
+]
+
+# Column names the previous KG tables may use, in order of preference
+LEGACY_NODE_COLUMNS = {
+    'key': ('key', 'node_key', 'name', 'label', 'node_id', 'id'),
+    'node_type': ('node_type', 'type', 'kind'),
+    'attrs': ('attrs', 'attributes', 'properties', 'data', 'metadata')
+}
+LEGACY_EDGE_COLUMNS = {
+    'src': ('src', 'source', 'src_id', 'from_node', 'source_id'),
+    'dst': ('dst', 'target', 'dst_id', 'to_node', 'target_id'),
+    'relation': ('relation', 'rel', 'relation_type', 'edge_type', 'type'),
+    'weight': ('weight', 'strength', 'w', 'score'),
+    'updated_at': ('updated_at', 'last_updated', 'ts', 'timestamp', 'created_at')
+}
+
+
+def parse_time(value: Any, default: float) -> float:
+    """Epoch seconds from a numeric or ISO-8601 timestamp"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+def pick_column(columns: List[str], candidates: Tuple[str, ...]) -> Optional[str]:
+    return next((name for name in candidates if name in columns), None)
+
+
+class KnowledgeGraphStore:
+    """Knowledge graph whose maintenance cost is proportional to expired edges, not graph size"""
+
+    def __init__(self, db_path: str = "patterns.db", config: Optional[Dict] = None):
+        config = config or {}
+        decay = config.get('decay_settings', {})
+
+        self.db_path = db_path
+        self.half_life_seconds = decay.get('half_life_hours', 48) * 3600
+        self.prune_threshold = decay.get('prune_threshold', 0.1)
+        self.max_edges = config.get('max_graph_size', 10000)
+        self.prune_batch_size = config.get('prune_batch_size', 5000)
+        self.commit_every = config.get('commit_every', 200)
+        self.commit_interval = config.get('commit_interval_seconds', 1.0)
+
+        self.lock = threading.RLock()
+        self.batch_depth = 0
+        self.pending_writes = 0
+        self.last_commit = time.monotonic()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        legacy = self.rename_legacy_tables()
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+        self.counters = {'edges_reinforced': 0, 'edges_pruned': 0, 'edges_evicted': 0, 'commits': 0}
+        self.load_counters()
+        if legacy:
+            self.import_legacy(legacy)
+
+    def load_counters(self):
+        """Counters are loaded once and maintained on every write"""
+        self.node_ids: Dict[str, int] = dict(self.conn.execute('SELECT key, id FROM kg_nodes'))
+        self.counters['nodes'] = len(self.node_ids)
+        self.counters['edges'] = self.conn.execute('SELECT COUNT(*) FROM kg_edges').fetchone()[0]
+
+    def commit(self):
+        """Count a write; commit when the group is full or old enough, never inside batch()"""
+        self.pending_writes += 1
+        if self.batch_depth == 0 and (self.pending_writes >= self.commit_every
+                                      or time.monotonic() - self.last_commit >= self.commit_interval):
+            self.flush()
+
+    def flush(self):
+        """Commit pending writes now"""
+        with self.lock:
+            if self.pending_writes:
+                self.conn.commit()
+                self.counters['commits'] += 1
+            self.pending_writes = 0
+            self.last_commit = time.monotonic()
+
+    @contextmanager
+    def batch(self):
+        """Group the writes of one linking pass into a single transaction"""
+        with self.lock:
+            self.batch_depth += 1
+            try:
+                yield self
+            except Exception:
+                if self.batch_depth == 1:
+                    # Loose writes still pending from before the pass are rolled back with it
+                    self.conn.rollback()
+                    self.pending_writes = 0
+                    self.load_counters()
+                raise
+            finally:
+                self.batch_depth -= 1
+            if self.batch_depth == 0:
+                self.flush()
+
+    # Migration -------------------------------------------------------------------
+
+    def table_columns(self, table: str) -> List[str]:
+        return [row[1] for row in self.conn.execute(f'PRAGMA table_info({table})')]
+
+    def rename_legacy_tables(self) -> Dict[str, str]:
+        """Move kg_nodes/kg_edges written by the previous KG out of the way of the new schema"""
+        renamed = {}
+        edge_columns = self.table_columns('kg_edges')
+        node_columns = self.table_columns('kg_nodes')
+        if (edge_columns and 'prune_at' not in edge_columns) or (node_columns and 'updated_at' not in node_columns):
+            for table in ('kg_nodes', 'kg_edges'):
+                if self.table_columns(table) and not self.table_columns(f'{table}_legacy'):
+                    self.conn.execute(f'ALTER TABLE {table} RENAME TO {table}_legacy')
+                    renamed[table] = f'{table}_legacy'
+            # Indexes of the renamed tables keep their names; drop any that collide with the new schema
+            for name in ('idx_kg_edges_dst', 'idx_kg_edges_prune_at'):
+                self.conn.execute(f'DROP INDEX IF EXISTS {name}')
+            self.conn.commit()
+        return renamed
+
+    def import_legacy(self, legacy: Dict[str, str]) -> Dict[str, int]:
+        """Import nodes and edges from renamed legacy tables; the legacy tables are kept"""
+        nodes, edges, id_keys = [], [], {}
+        now = time.time()
+
+        node_table = legacy.get('kg_nodes')
+        if node_table:
+            columns = self.table_columns(node_table)
+            picked = {field: pick_column(columns, names) for field, names in LEGACY_NODE_COLUMNS.items()}
+            if picked['key']:
+                has_id = 'id' in columns and picked['key'] != 'id'
+                selected = [picked[f] or 'NULL' for f in ('key', 'node_type', 'attrs')] + (['id'] if has_id else [])
+                for row in self.conn.execute(f"SELECT {', '.join(selected)} FROM {node_table}"):
+                    key, node_type, attrs = str(row[0]), row[1], row[2]
+                    if has_id:
+                        id_keys[row[3]] = key
+                    try:
+                        attrs = json.loads(attrs) if isinstance(attrs, str) else attrs
+                    except ValueError:
+                        attrs = {'value': attrs}
+                    nodes.append((key, node_type, attrs if isinstance(attrs, dict) else None))
+
+        edge_table = legacy.get('kg_edges')
+        if edge_table:
+            columns = self.table_columns(edge_table)
+            picked = {field: pick_column(columns, names) for field, names in LEGACY_EDGE_COLUMNS.items()}
+            if picked['src'] and picked['dst']:
+                selected = [picked[f] or 'NULL' for f in ('src', 'dst', 'relation', 'weight', 'updated_at')]
+                for src, dst, relation, weight, updated_at in self.conn.execute(
+                        f"SELECT {', '.join(selected)} FROM {edge_table}"):
+                    # Edges that referenced integer node ids are mapped back to node keys
+                    edges.append((str(id_keys.get(src, src)), str(id_keys.get(dst, dst)), relation or 'related',
+                                  float(weight) if weight is not None else 1.0, parse_time(updated_at, now)))
+
+        imported = self.import_graph(nodes, edges)
+        logger.info(f"📥 Imported legacy knowledge graph: {imported['nodes']} nodes, {imported['edges']} edges "
+                    f"(originals kept in {', '.join(legacy.values())})")
+        return imported
+
+    def import_graph(self, nodes: Iterable[Tuple[str, Optional[str], Optional[Dict]]],
+                     edges: Iterable[Tuple[str, str, str, float, float]]) -> Dict[str, int]:
+        """Bulk-load (key, node_type, attrs) nodes and (src, dst, relation, weight, updated_at) edges in one commit"""
+        counts = {'nodes': 0, 'edges': 0}
+        with self.batch():
+            for key, node_type, attrs in nodes:
+                self.node_id(key, node_type, attrs)
+                counts['nodes'] += 1
+            for src, dst, relation, weight, updated_at in edges:
+                self.add_edge(src, dst, relation, weight, now=updated_at)
+                counts['edges'] += 1
+        return counts
+
+    # Decay -----------------------------------------------------------------------
+
+    def decayed(self, weight: float, updated_at: float, now: Optional[float] = None) -> float:
+        """Weight after exponential decay since updated_at (computed at read time)"""
+        now = now if now is not None else time.time()
+        return weight * 0.5 ** (max(0.0, now - updated_at) / self.half_life_seconds)
+
+    def prune_time(self, weight: float, updated_at: float) -> float:
+        """When a weight decays below prune_threshold; stored so pruning is an index range scan"""
+        if weight <= self.prune_threshold:
+            return updated_at
+        return updated_at + self.half_life_seconds * math.log2(weight / self.prune_threshold)
+
+    # Writes ------------------------------------------------------------------------
+
+    def node_id(self, key: str, node_type: Optional[str] = None, attrs: Optional[Dict] = None) -> int:
+        """Integer id for a node key, creating the node on first use"""
+        node_id = self.node_ids.get(key)
+        if node_id is not None and attrs is None and node_type is None:
+            return node_id
+
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                '''INSERT INTO kg_nodes (key, node_type, attrs, updated_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET
+                       node_type = COALESCE(excluded.node_type, node_type),
+                       attrs = COALESCE(excluded.attrs, attrs),
+                       updated_at = excluded.updated_at''',
+                (key, node_type, json.dumps(attrs) if attrs is not None else None, now)
+            )
+            self.commit()
+            if node_id is None:
+                node_id = self.conn.execute('SELECT id FROM kg_nodes WHERE key = ?', (key,)).fetchone()[0]
+                self.node_ids[key] = node_id
+                self.counters['nodes'] += 1
+        return node_id
+
+    def add_node(self, key: str, node_type: Optional[str] = None, attrs: Optional[Dict] = None) -> int:
+        return self.node_id(key, node_type, attrs or {})
+
+    def add_edge(self, src: str, dst: str, relation: str = 'related', weight: float = 1.0,
+                 now: Optional[float] = None) -> float:
+        """Add or reinforce an edge; returns its new weight"""
+        now = now if now is not None else time.time()
+        src_id, dst_id = self.node_id(src), self.node_id(dst)
+
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT weight, updated_at FROM kg_edges WHERE src = ? AND relation = ? AND dst = ?',
+                (src_id, relation, dst_id)
+            ).fetchone()
+            if row:
+                # Fold the decay accrued so far into the stored base weight
+                weight += self.decayed(row[0], row[1], now)
+                self.counters['edges_reinforced'] += 1
+            else:
+                self.counters['edges'] += 1
+
+            self.conn.execute(
+                'INSERT OR REPLACE INTO kg_edges (src, dst, relation, weight, updated_at, prune_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (src_id, dst_id, relation, weight, now, self.prune_time(weight, now))
+            )
+            self.commit()
+
+        if self.counters['edges'] > self.max_edges:
+            self.evict_weakest(self.counters['edges'] - self.max_edges)
+        return weight
+
+    def evict_weakest(self, count: int):
+        """Drop the edges that would expire soonest once the graph exceeds max_graph_size"""
+        with self.lock:
+            cursor = self.conn.execute(
+                '''DELETE FROM kg_edges WHERE (src, relation, dst) IN (
+                       SELECT src, relation, dst FROM kg_edges ORDER BY prune_at LIMIT ?)''',
+                (count,)
+            )
+            self.commit()
+            self.counters['edges'] -= cursor.rowcount
+            self.counters['edges_evicted'] += cursor.rowcount
+
+    # Reads --------------------------------------------------------------------------
+
+    def neighbors(self, key: str, relation: Optional[str] = None, min_weight: Optional[float] = None,
+                  limit: int = 50) -> List[Dict]:
+        """Outgoing edges of a node with decayed weights, strongest first"""
+        node_id = self.node_ids.get(key)
+        if node_id is None:
+            return []
+
+        now = time.time()
+        min_weight = self.prune_threshold if min_weight is None else min_weight
+        query = '''SELECT n.key, e.relation, e.weight, e.updated_at FROM kg_edges e
+                   JOIN kg_nodes n ON n.id = e.dst
+                   WHERE e.src = ? AND e.prune_at > ?'''
+        params: List[Any] = [node_id, now]
+        if relation:
+            query += ' AND e.relation = ?'
+            params.append(relation)
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        edges = [
+            {'node': dst, 'relation': rel, 'weight': self.decayed(weight, updated_at, now)}
+            for dst, rel, weight, updated_at in rows
+        ]
+        edges = [e for e in edges if e['weight'] >= min_weight]
+        edges.sort(key=lambda e: e['weight'], reverse=True)
+        return edges[:limit]
+
+    def edge_weight(self, src: str, dst: str, relation: str = 'related') -> float:
+        src_id, dst_id = self.node_ids.get(src), self.node_ids.get(dst)
+        if src_id is None or dst_id is None:
+            return 0.0
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT weight, updated_at FROM kg_edges WHERE src = ? AND relation = ? AND dst = ?',
+                (src_id, relation, dst_id)
+            ).fetchone()
+        return self.decayed(row[0], row[1]) if row else 0.0
+
+    # Maintenance ----------------------------------------------------------------------
+
+    def decay_and_prune(self, now: Optional[float] = None, batch_size: Optional[int] = None) -> Dict:
+        """Delete edges whose decayed weight has fallen below the threshold.
+
+        Decay itself is never written back; this only touches already-expired
+        edges through the prune_at index, at most batch_size per call."""
+        now = now if now is not None else time.time()
+        batch_size = batch_size or self.prune_batch_size
+
+        with self.lock:
+            cursor = self.conn.execute(
+                '''DELETE FROM kg_edges WHERE (src, relation, dst) IN (
+                       SELECT src, relation, dst FROM kg_edges WHERE prune_at <= ? ORDER BY prune_at LIMIT ?)''',
+                (now, batch_size)
+            )
+            self.commit()
+            pruned = cursor.rowcount
+            self.counters['edges'] -= pruned
+            self.counters['edges_pruned'] += pruned
+
+        return {'pruned': pruned, 'more_pending': pruned == batch_size}
+
+    def get_stats(self) -> Dict:
+        return {
+            'total_nodes': self.counters['nodes'],
+            'total_edges': self.counters['edges'],
+            'edges_reinforced': self.counters['edges_reinforced'],
+            'edges_pruned': self.counters['edges_pruned'],
+            'edges_evicted': self.counters['edges_evicted'],
+            'commits': self.counters['commits'],
+            'pending_writes': self.pending_writes,
+            'half_life_hours': self.half_life_seconds / 3600,
+            'prune_threshold': self.prune_threshold,
+            'max_graph_size': self.max_edges
+        }
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.conn.close()
@@ -0,0 +1,335 @@
+"""
+LLM Gateway
+Async front for GPTIntegrator: coalesces event-typing requests into batched
+prompts, caches responses by normalized-content hash, bounds concurrency and
+enforces the daily token/cost budget from config.json ai.cost_limit_daily_usd
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a headline"""
+    text = re.sub(r'[^\w\s%$.]', ' ', (text or '').lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def content_key(*parts: Any) -> str:
+    normalized = '\x1f'.join(
+        normalize_text(p) if isinstance(p, str) else json.dumps(p, sort_keys=True, default=str)
+        for p in parts
+    )
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, maxsize: int = 5000, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if time.monotonic() > expires:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        self.entries[key] = (value, time.monotonic() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class TokenBudget:
+    """Daily token spend governor derived from a USD cost limit"""
+
+    def __init__(self, daily_limit_usd: float, usd_per_1k_tokens: float):
+        self.daily_limit_usd = daily_limit_usd
+        self.usd_per_1k_tokens = usd_per_1k_tokens
+        self.day = date.today()
+        self.tokens_used = 0
+
+    def _roll(self):
+        today = date.today()
+        if today != self.day:
+            self.day = today
+            self.tokens_used = 0
+
+    @property
+    def spent_usd(self) -> float:
+        return self.tokens_used / 1000.0 * self.usd_per_1k_tokens
+
+    def allows(self, estimated_tokens: int) -> bool:
+        self._roll()
+        projected = (self.tokens_used + estimated_tokens) / 1000.0 * self.usd_per_1k_tokens
+        return projected <= self.daily_limit_usd
+
+    def record(self, tokens: int):
+        self._roll()
+        self.tokens_used += tokens
+
+    def get_status(self) -> Dict:
+        self._roll()
+        return {
+            'day': self.day.isoformat(),
+            'tokens_used': self.tokens_used,
+            'spent_usd': round(self.spent_usd, 4),
+            'daily_limit_usd': self.daily_limit_usd
+        }
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class LLMGateway:
+    """Batched, cached and budgeted access to the GPT integrator"""
+
+    def __init__(self, integrator, config: Dict):
+        ai_config = config.get('ai', {})
+        gateway_config = ai_config.get('gateway', {})
+
+        self.integrator = integrator
+        self.model = ai_config.get('openai_model', 'gpt-5')
+        self.max_tokens = ai_config.get('max_tokens', 500)
+        self.max_batch_size = gateway_config.get('max_batch_size', 20)
+        self.batch_window = gateway_config.get('batch_window_ms', 50) / 1000.0
+        self.request_timeout = gateway_config.get('request_timeout_seconds', 30)
+
+        self.cache = TTLCache(gateway_config.get('cache_size', 5000), gateway_config.get('cache_ttl_seconds', 3600))
+        self.budget = TokenBudget(ai_config.get('cost_limit_daily_usd', 10.0),
+                                  gateway_config.get('usd_per_1k_tokens', 0.01))
+        self.semaphore = asyncio.Semaphore(gateway_config.get('max_concurrency', 4))
+
+        # Local keyword classifier used when the budget is exhausted or the LLM fails
+        self.event_types = config.get('ai_strategist_features', {}).get('event_normalization', {}).get('event_types', {})
+
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.pending: List[tuple] = []
+        self.flush_handle = None
+        # Strong references keep scheduled batches from being garbage collected mid-flight
+        self.batch_tasks: Set[asyncio.Task] = set()
+        self.stats = {
+            'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'upstream_calls': 0,
+            'batched_items': 0, 'budget_denials': 0, 'fallbacks': 0, 'timeouts': 0
+        }
+
+    # Event typing -----------------------------------------------------------
+
+    async def type_event(self, title: str, summary: str = '') -> Dict:
+        """Classify an event; identical headlines share one cached result"""
+        self.stats['requests'] += 1
+        key = content_key('type_event', title, summary)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+
+        if key in self.inflight:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(self.inflight[key])
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.inflight[key] = future
+        self.pending.append((key, title, summary, future))
+
+        if len(self.pending) >= self.max_batch_size:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        items, self.pending = self.pending, []
+        if items:
+            task = asyncio.get_running_loop().create_task(self._run_batch(items))
+            self.batch_tasks.add(task)
+            task.add_done_callback(self.batch_tasks.discard)
+
+    async def drain(self):
+        """Flush queued requests and wait for every in-flight batch"""
+        self._flush()
+        if self.batch_tasks:
+            await asyncio.gather(*self.batch_tasks, return_exceptions=True)
+
+    async def _run_batch(self, items: List[tuple]):
+        try:
+            results = await self._type_batch([(title, summary) for _, title, summary, _ in items])
+        except Exception as e:
+            logger.error(f"Batched event typing failed: {e}")
+            results = [self._keyword_type(title, summary) for _, title, summary, _ in items]
+
+        for (key, _, _, future), result in zip(items, results):
+            if result.get('source') != 'keyword_fallback':
+                self.cache.set(key, result)
+            self.inflight.pop(key, None)
+            if not future.done():
+                future.set_result(result)
+
+    async def _type_batch(self, events: List[tuple]) -> List[Dict]:
+        client = getattr(self.integrator, 'client', None)
+        if client is None:
+            # Simulation mode: the integrator answers locally without a round trip
+            return [await asyncio.to_thread(self._integrator_type, title, summary) for title, summary in events]
+
+        labels = sorted(self.event_types) or ['other']
+        listing = '\n'.join(f"{i + 1}. {title} — {summary}" for i, (title, summary) in enumerate(events))
+        messages = [
+            {'role': 'system', 'content': (
+                "Classify each numbered market event into one of: " + ', '.join(labels) +
+                '. Reply with JSON {"results": [{"index": n, "event_type": str, "confidence": 0-1}]}.'
+            )},
+            {'role': 'user', 'content': listing}
+        ]
+
+        prompt_tokens = estimate_tokens(messages[0]['content'] + listing)
+        estimated = prompt_tokens + 30 * len(events)
+        if not self.budget.allows(estimated):
+            self.stats['budget_denials'] += 1
+            logger.warning("LLM daily budget exhausted; typing events with keyword fallback")
+            return [self._keyword_type(title, summary) for title, summary in events]
+
+        response = await self._chat(messages, estimated, prompt_tokens)
+        parsed = json.loads(response.choices[0].message.content or '{}').get('results', [])
+        by_index = {int(item.get('index', 0)): item for item in parsed if isinstance(item, dict)}
+
+        self.stats['batched_items'] += len(events)
+        results = []
+        for i, (title, summary) in enumerate(events):
+            item = by_index.get(i + 1)
+            if item is None or not item.get('event_type'):
+                results.append(self._keyword_type(title, summary))
+            else:
+                results.append({
+                    'event_type': item['event_type'],
+                    'confidence': float(item.get('confidence', 0.5)),
+                    'source': 'llm_batch'
+                })
+        return results
+
+    def _integrator_type(self, title: str, summary: str) -> Dict:
+        result = self.integrator.type_event(title, summary)
+        if isinstance(result, dict):
+            return {**result, 'source': result.get('source', 'integrator')}
+        return {'event_type': result, 'source': 'integrator'}
+
+    def _keyword_type(self, title: str, summary: str) -> Dict:
+        self.stats['fallbacks'] += 1
+        text = normalize_text(f"{title} {summary}")
+        best, hits = 'other', 0
+        for event_type, keywords in self.event_types.items():
+            count = sum(1 for keyword in keywords if keyword in text)
+            if count > hits:
+                best, hits = event_type, count
+        return {'event_type': best, 'confidence': min(0.9, 0.4 + 0.1 * hits), 'source': 'keyword_fallback'}
+
+    # Narratives --------------------------------------------------------------
+
+    async def build_narrative(self, decision: Dict) -> Any:
+        """Narrative for a decision, cached by the decision's content"""
+        self.stats['requests'] += 1
+        key = content_key('build_narrative', decision)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+
+        if key in self.inflight:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(self.inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            billed = getattr(self.integrator, 'client', None) is not None
+            prompt_tokens = estimate_tokens(json.dumps(decision, default=str))
+            estimated = prompt_tokens + self.max_tokens
+            if billed and not self.budget.allows(estimated):
+                self.stats['budget_denials'] += 1
+                narrative = None
+            else:
+                async with self.semaphore:
+                    self.stats['upstream_calls'] += 1
+                    try:
+                        narrative = await asyncio.wait_for(
+                            asyncio.to_thread(self.integrator.build_narrative, decision), self.request_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        self.charge_timeout(prompt_tokens if billed else 0)
+                        raise
+                if billed:
+                    self.budget.record(estimated)
+                self.cache.set(key, narrative)
+            future.set_result(narrative)
+            return narrative
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self.inflight.pop(key, None)
+
+    # Upstream ----------------------------------------------------------------
+
+    def charge_timeout(self, prompt_tokens: int):
+        """A timed-out request was still sent and its thread keeps running; bill the prompt at least"""
+        self.stats['timeouts'] += 1
+        self.budget.record(prompt_tokens)
+        logger.warning(f"LLM request timed out after {self.request_timeout}s; charged {prompt_tokens} prompt tokens")
+
+    async def _chat(self, messages: List[Dict], estimated_tokens: int, prompt_tokens: Optional[int] = None):
+        client = self.integrator.client
+        async with self.semaphore:
+            self.stats['upstream_calls'] += 1
+            try:
+                response = await asyncio.wait_for(
+                    asyncio.to_thread(
+                        client.chat.completions.create,
+                        model=self.model,
+                        messages=messages,
+                        response_format={'type': 'json_object'}
+                    ),
+                    self.request_timeout
+                )
+            except asyncio.TimeoutError:
+                self.charge_timeout(prompt_tokens if prompt_tokens is not None else estimated_tokens)
+                raise
+
+        usage = getattr(response, 'usage', None)
+        self.budget.record(getattr(usage, 'total_tokens', None) or estimated_tokens)
+        return response
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'cache_entries': len(self.cache),
+            'batches_inflight': len(self.batch_tasks),
+            'budget': self.budget.get_status()
+        }
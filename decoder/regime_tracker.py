@@ -0,0 +1,261 @@
+"""
+Regime Tracker
+Streaming market regime state machine. Each tick updates per-symbol EWMA
+volatility, liquidity and trend estimates in O(1), market aggregates are kept
+as running sums, and regime switches pass through hysteresis counters before
+the published snapshot changes
+"""
+
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+def ewma_alpha(span: float) -> float:
+    return 2.0 / (span + 1.0)
+
+
+class SymbolRegimeState:
+    """O(1) per-tick volatility, liquidity and trend estimates for one symbol"""
+
+    def __init__(self, settings: Dict):
+        self.vol_alpha = ewma_alpha(settings['volatility_span'])
+        self.fast_alpha = ewma_alpha(settings['trend_fast_span'])
+        self.slow_alpha = ewma_alpha(settings['trend_slow_span'])
+        self.liq_fast_alpha = ewma_alpha(settings['liquidity_fast_span'])
+        self.liq_slow_alpha = ewma_alpha(settings['liquidity_slow_span'])
+
+        self.last_price: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.variance_rate = 0.0
+        self.fast_ema: Optional[float] = None
+        self.slow_ema: Optional[float] = None
+        self.volume_fast: Optional[float] = None
+        self.volume_slow: Optional[float] = None
+        self.ticks = 0
+
+    def update(self, price: float, volume: float, timestamp: float):
+        if self.last_price and price > 0 and self.last_ts is not None:
+            dt = max(timestamp - self.last_ts, 1.0)
+            log_return = math.log(price / self.last_price)
+            # Variance per second, so irregular tick spacing annualizes correctly
+            self.variance_rate += self.vol_alpha * (log_return * log_return / dt - self.variance_rate)
+
+        self.fast_ema = price if self.fast_ema is None else self.fast_ema + self.fast_alpha * (price - self.fast_ema)
+        self.slow_ema = price if self.slow_ema is None else self.slow_ema + self.slow_alpha * (price - self.slow_ema)
+
+        dollar_volume = volume * price
+        if dollar_volume > 0:
+            self.volume_fast = dollar_volume if self.volume_fast is None else \
+                self.volume_fast + self.liq_fast_alpha * (dollar_volume - self.volume_fast)
+            self.volume_slow = dollar_volume if self.volume_slow is None else \
+                self.volume_slow + self.liq_slow_alpha * (dollar_volume - self.volume_slow)
+
+        self.last_price = price
+        self.last_ts = timestamp
+        self.ticks += 1
+
+    def metrics(self) -> Dict[str, float]:
+        trend = (self.fast_ema - self.slow_ema) / self.slow_ema if self.slow_ema else 0.0
+        liquidity = self.volume_fast / self.volume_slow if self.volume_slow else 1.0
+        return {
+            'volatility': math.sqrt(self.variance_rate * SECONDS_PER_YEAR),
+            'trend': trend,
+            'liquidity': liquidity
+        }
+
+
+class MarketRegimeState:
+    """Running sums of member-symbol metrics plus the hysteresis state machine"""
+
+    METRICS = ('volatility', 'trend', 'liquidity')
+
+    def __init__(self, name: str, thresholds: Dict, settings: Dict):
+        self.name = name
+        self.thresholds = thresholds
+        self.settings = settings
+        self.hysteresis_periods = settings['hysteresis_periods']
+        self.period_seconds = settings['period_seconds']
+
+        self.symbols: Dict[str, SymbolRegimeState] = {}
+        self.contributions: Dict[str, Dict[str, float]] = {}
+        self.sums = {metric: 0.0 for metric in self.METRICS}
+        self.ticks = 0
+
+        self.regime: Optional[Dict[str, str]] = None
+        self.regime_since: Optional[float] = None
+        self.pending: Optional[Dict[str, str]] = None
+        self.pending_count = 0
+        self.last_period: Optional[int] = None
+        self.transitions = 0
+        # Every change of the current regime, warmup included; feeds RegimeTracker.version
+        self.changes = 0
+        self.published: Dict = {}
+
+    def update(self, symbol: str, price: float, volume: float, timestamp: float):
+        state = self.symbols.get(symbol)
+        if state is None:
+            state = self.symbols[symbol] = SymbolRegimeState(self.settings)
+        state.update(price, volume, timestamp)
+        self.ticks += 1
+
+        # Swap this symbol's contribution in the running sums: O(1) regardless of market size
+        previous = self.contributions.get(symbol)
+        current = state.metrics()
+        for metric in self.METRICS:
+            self.sums[metric] += current[metric] - (previous[metric] if previous else 0.0)
+        self.contributions[symbol] = current
+
+        self.step(timestamp)
+
+    def aggregates(self) -> Dict[str, float]:
+        count = max(len(self.contributions), 1)
+        return {metric: self.sums[metric] / count for metric in self.METRICS}
+
+    def classify(self, metrics: Dict[str, float]) -> Dict[str, str]:
+        thresholds = self.thresholds
+        volatility = metrics['volatility']
+        if volatility >= thresholds.get('vol_high', 0.25):
+            vol_label = 'high'
+        elif volatility <= thresholds.get('vol_low', 0.15):
+            vol_label = 'low'
+        else:
+            vol_label = 'medium'
+
+        trend_threshold = self.settings['trend_threshold']
+        if metrics['trend'] >= trend_threshold:
+            trend_label = 'up'
+        elif metrics['trend'] <= -trend_threshold:
+            trend_label = 'down'
+        else:
+            trend_label = 'sideways'
+
+        liquidity_band = self.settings['liquidity_band']
+        if metrics['liquidity'] >= 1 + liquidity_band:
+            liquidity_label = 'ample'
+        elif metrics['liquidity'] <= 1 - liquidity_band:
+            liquidity_label = 'tight'
+        else:
+            liquidity_label = 'normal'
+
+        if (vol_label == 'high' and trend_label != 'up') or (liquidity_label == 'tight' and trend_label == 'down'):
+            risk = 'risk_off'
+        elif trend_label == 'up' and vol_label != 'high':
+            risk = 'risk_on'
+        else:
+            risk = 'neutral'
+
+        return {'risk': risk, 'liquidity': liquidity_label, 'volatility': vol_label, 'trend': trend_label}
+
+    def step(self, timestamp: float):
+        """Advance the state machine; a new regime must persist hysteresis_periods periods"""
+        metrics = self.aggregates()
+        candidate = self.classify(metrics)
+        period = int(timestamp // self.period_seconds)
+
+        if self.regime is None or self.ticks < self.settings['warmup_ticks']:
+            # Estimates are still settling: follow them without hysteresis or counting transitions
+            if candidate != self.regime:
+                self.regime, self.regime_since = candidate, timestamp
+                self.changes += 1
+        elif candidate == self.regime:
+            self.pending, self.pending_count = None, 0
+        elif candidate != self.pending:
+            self.pending, self.pending_count, self.last_period = candidate, 1, period
+        elif period != self.last_period:
+            self.pending_count += 1
+            self.last_period = period
+
+        if self.pending is not None and self.pending_count >= self.hysteresis_periods:
+            self.regime, self.regime_since = self.pending, timestamp
+            self.pending, self.pending_count = None, 0
+            self.transitions += 1
+            self.changes += 1
+            logger.info(f"📈 Regime change in {self.name}: {self.regime}")
+
+        self.publish(metrics, timestamp)
+
+    def publish(self, metrics: Dict[str, float], timestamp: float):
+        warmup = min(1.0, self.ticks / self.settings['warmup_ticks'])
+        confidence = warmup * (1.0 - 0.5 * self.pending_count / max(self.hysteresis_periods, 1))
+        # Replace the dict wholesale so readers never see a half-updated snapshot
+        self.published = {
+            'market': self.name,
+            **self.regime,
+            'confidence': round(confidence, 3),
+            'stable': self.pending is None and warmup >= 1.0,
+            'pending_regime': self.pending,
+            'pending_periods': self.pending_count,
+            'regime_since': datetime.fromtimestamp(self.regime_since).isoformat(),
+            'regime_duration_seconds': round(timestamp - self.regime_since, 1),
+            'transitions': self.transitions,
+            'metrics': {k: round(v, 6) for k, v in metrics.items()},
+            'symbols': len(self.symbols),
+            'updated_at': datetime.fromtimestamp(timestamp).isoformat()
+        }
+
+
+class RegimeTracker:
+    """Per-market streaming regimes with a published snapshot readable at memory speed"""
+
+    DEFAULT_SETTINGS = {
+        'volatility_span': 100,
+        'trend_fast_span': 20,
+        'trend_slow_span': 100,
+        'liquidity_fast_span': 20,
+        'liquidity_slow_span': 200,
+        'trend_threshold': 0.005,
+        'liquidity_band': 0.3,
+        'period_seconds': 60,
+        'warmup_ticks': 50
+    }
+
+    def __init__(self, config: Dict):
+        regime_config = config.get('ai_strategist_features', {}).get('regime_detection', {})
+        self.thresholds = regime_config.get('thresholds', {})
+        self.settings = {
+            **self.DEFAULT_SETTINGS,
+            **regime_config.get('streaming', {}),
+            'hysteresis_periods': regime_config.get('hysteresis_periods', 2)
+        }
+        self.markets: Dict[str, MarketRegimeState] = {}
+
+    def update(self, market: str, symbol: str, price: float, volume: float = 0.0,
+               timestamp: Optional[float] = None):
+        if not price or price <= 0:
+            return
+        state = self.markets.get(market)
+        if state is None:
+            state = self.markets[market] = MarketRegimeState(market, self.thresholds, self.settings)
+        state.update(symbol, price, volume, timestamp if timestamp is not None else time.time())
+
+    def current(self, market: Optional[str] = None) -> Dict:
+        """Published regime for a market, or for the most active market when none is given"""
+        if market is not None:
+            state = self.markets.get(market)
+        else:
+            state = max(self.markets.values(), key=lambda m: m.ticks, default=None)
+        if state is None or not state.published:
+            return {}
+        return state.published
+
+    @property
+    def version(self) -> int:
+        """Increases whenever any market's regime changes; cheap enough to read per stage"""
+        return sum(state.changes for state in self.markets.values())
+
+    def is_stable(self, market: Optional[str] = None) -> bool:
+        return bool(self.current(market).get('stable'))
+
+    def snapshot(self) -> Dict:
+        return {
+            'markets': {name: state.published for name, state in self.markets.items() if state.published},
+            'primary': self.current(),
+            'timestamp': datetime.now().isoformat()
+        }
@@ -0,0 +1,164 @@
+"""
+Signal Rule Compiler
+Compiles config.json signal_engine rules into a vectorized predicate plan
+evaluated once per tick over the whole symbol universe
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from decoder.streaming_indicators import DEFAULT_SETTINGS, FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def _strength(values: np.ndarray, threshold: float) -> np.ndarray:
+    """Map values past their threshold onto [0.6, 1.0]; 0 when not met (NaN -> not met)"""
+    scale = abs(threshold) or 1.0
+    excess = np.clip((values - threshold) / scale, 0.0, 1.0)
+    met = np.nan_to_num(values, nan=-np.inf) >= threshold
+    return np.where(met, 0.6 + 0.4 * excess, 0.0)
+
+
+def _binary(mask: np.ndarray) -> np.ndarray:
+    return np.where(mask, 1.0, 0.0)
+
+
+# Condition name -> strength column over (feature columns, thresholds)
+VECTOR_CONDITIONS: Dict[str, Callable[[Dict[str, np.ndarray], Dict], np.ndarray]] = {
+    'price_spike': lambda c, t: _strength(c['price_zscore'], t['price_spike_zscore']),
+    'price_drop': lambda c, t: _strength(-c['price_zscore'], t['price_spike_zscore']),
+    'volume_confirmation': lambda c, t: _strength(c['volume_zscore'], t['volume_zscore']),
+    'sentiment_positive': lambda c, t: _strength(c['sentiment'], t['sentiment_positive']),
+    'sentiment_negative': lambda c, t: _strength(-c['sentiment'], t['sentiment_positive']),
+    'rsi_oversold': lambda c, t: _strength(100 - c['rsi'], 100 - t['rsi_oversold']),
+    'rsi_overbought': lambda c, t: _strength(c['rsi'], t['rsi_overbought']),
+    'bollinger_breakout': lambda c, t: _strength(c['percent_b'], 1.0),
+    'above_vwap': lambda c, t: _binary(np.nan_to_num(c['price'] - c['vwap'], nan=0.0) > 0),
+    'trend_up': lambda c, t: _binary(np.nan_to_num(c['ema_fast'] - c['ema_slow'], nan=0.0) > 0)
+}
+
+
+class CompiledRulePlan:
+    """Boolean-mask plan: each distinct condition is evaluated once per tick and
+    rules are combined through a rule x condition incidence matrix"""
+
+    def __init__(self, rules: Dict, thresholds: Dict, min_confidence: float = 0.6):
+        self.thresholds = thresholds
+        self.min_confidence = min_confidence
+        self.fingerprint = rule_fingerprint(rules)
+
+        self.rule_names: List[str] = []
+        self.rule_meta: List[Dict] = []
+        self.conditions: List[str] = []
+        condition_index: Dict[str, int] = {}
+        rule_conditions: List[List[int]] = []
+
+        for rule_name, rule in rules.items():
+            conditions = rule.get('conditions', [])
+            unknown = [c for c in conditions if c not in VECTOR_CONDITIONS]
+            if not conditions or unknown:
+                logger.warning(f"Skipping rule {rule_name}: unknown or empty conditions {unknown}")
+                continue
+
+            indices = []
+            for condition in conditions:
+                if condition not in condition_index:
+                    condition_index[condition] = len(self.conditions)
+                    self.conditions.append(condition)
+                indices.append(condition_index[condition])
+
+            self.rule_names.append(rule_name)
+            self.rule_meta.append({
+                'action': rule.get('action', 'HOLD'),
+                'risk_level': rule.get('risk_level', 'medium')
+            })
+            rule_conditions.append(indices)
+
+        self.incidence = np.zeros((len(self.rule_names), len(self.conditions)))
+        for row, indices in enumerate(rule_conditions):
+            self.incidence[row, indices] = 1.0
+        self.conditions_per_rule = self.incidence.sum(axis=1)
+
+        logger.info(f"Compiled {len(self.rule_names)} signal rules over {len(self.conditions)} distinct conditions")
+
+    def evaluate(self, symbols: List[str], columns: Dict[str, np.ndarray]):
+        """Evaluate every rule for every symbol.
+
+        Returns (fires, confidence, strengths): rule x symbol boolean mask,
+        rule x symbol confidence and condition x symbol strength matrices.
+        """
+        n_symbols = len(symbols)
+        if not self.rule_names or n_symbols == 0:
+            empty = np.zeros((len(self.rule_names), n_symbols))
+            return empty.astype(bool), empty, np.zeros((len(self.conditions), n_symbols))
+
+        strengths = np.vstack([
+            VECTOR_CONDITIONS[condition](columns, self.thresholds) for condition in self.conditions
+        ])
+        met = (strengths > 0).astype(float)
+
+        met_count = self.incidence @ met
+        confidence = (self.incidence @ strengths) / self.conditions_per_rule[:, None]
+        fires = (met_count == self.conditions_per_rule[:, None]) & (confidence >= self.min_confidence)
+        return fires, confidence, strengths
+
+    def to_signals(self, symbols: List[str], columns: Dict[str, np.ndarray],
+                   now: Optional[float] = None) -> List[Dict]:
+        """Evaluate the plan and materialize fired (rule, symbol) pairs as signal dicts"""
+        now = now or time.time()
+        fires, confidence, strengths = self.evaluate(symbols, columns)
+
+        signals = []
+        for rule_row, symbol_col in zip(*np.nonzero(fires)):
+            condition_rows = np.nonzero(self.incidence[rule_row])[0]
+            price = columns['price'][symbol_col]
+            signals.append({
+                'symbol': symbols[symbol_col],
+                'rule': self.rule_names[rule_row],
+                'action': self.rule_meta[rule_row]['action'],
+                'risk_level': self.rule_meta[rule_row]['risk_level'],
+                'confidence': round(float(confidence[rule_row, symbol_col]), 4),
+                'entry_price': None if np.isnan(price) else float(price),
+                'conditions_met': {
+                    self.conditions[c]: float(strengths[c, symbol_col]) for c in condition_rows
+                },
+                'timestamp': now,
+                'source': 'compiled_rules'
+            })
+        return signals
+
+
+def rule_fingerprint(rules: Dict) -> str:
+    """Stable hash of a rules block, used to detect when recompilation is needed"""
+    return hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()
+
+
+def feature_columns(snapshot: Dict[str, Dict], symbols: Optional[List[str]] = None):
+    """Pivot a per-symbol feature snapshot into (symbols, column arrays) with NaN for missing.
+
+    The live path reads StreamingIndicatorEngine.feature_columns instead; this is for snapshots.
+    """
+    symbols = list(symbols) if symbols is not None else list(snapshot.keys())
+    columns = {}
+    for name in FEATURE_COLUMNS:
+        values = [snapshot.get(symbol, {}).get(name) for symbol in symbols]
+        columns[name] = np.array([np.nan if v is None else v for v in values], dtype=float)
+    return symbols, columns
+
+
+def compile_rules(config: Dict) -> CompiledRulePlan:
+    """Build a plan from the config's signal_engine block"""
+    signal_config = config.get('signal_engine', {})
+    settings = signal_config.get('streaming_indicators', {})
+    thresholds = {**DEFAULT_SETTINGS['thresholds'], **settings.get('thresholds', {})}
+    return CompiledRulePlan(
+        signal_config.get('rules', {}),
+        thresholds,
+        signal_config.get('min_confidence', 0.6)
+    )
@@ -0,0 +1,503 @@
+"""
+Streaming Technical Indicators
+O(1)-per-update indicators with per-symbol state for event-driven signal generation
+"""
+
+import logging
+import math
+import re
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class RollingWindow:
+    """Fixed-size window keeping running sum and sum of squares"""
+
+    def __init__(self, size: int):
+        self.size = max(2, int(size))
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value: float):
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.values:
+            return None
+        return self.total / len(self.values)
+
+    @property
+    def std(self) -> Optional[float]:
+        n = len(self.values)
+        if n < 2:
+            return None
+        variance = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class EMA:
+    """Exponential moving average"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class RSI:
+    """Relative Strength Index with Wilder smoothing"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None
+        self.avg_gain = None
+        self.avg_loss = None
+        self.count = 0
+        self.value = None
+
+    def update(self, price: float) -> Optional[float]:
+        if self.prev is None:
+            self.prev = price
+            return None
+
+        change = price - self.prev
+        self.prev = price
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        self.count += 1
+
+        if self.avg_gain is None:
+            self.avg_gain, self.avg_loss = gain, loss
+        elif self.count <= self.period:
+            # Simple average during warm-up, Wilder smoothing afterwards
+            self.avg_gain += (gain - self.avg_gain) / self.count
+            self.avg_loss += (loss - self.avg_loss) / self.count
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        if self.count < self.period:
+            return None
+
+        if self.avg_loss == 0:
+            self.value = 100.0 if self.avg_gain > 0 else 50.0
+        else:
+            rs = self.avg_gain / self.avg_loss
+            self.value = 100.0 - 100.0 / (1.0 + rs)
+        return self.value
+
+
+class ATR:
+    """Average True Range with Wilder smoothing"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.count = 0
+        self.value = None
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        if self.prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.count += 1
+
+        if self.value is None:
+            self.value = true_range
+        elif self.count <= self.period:
+            self.value += (true_range - self.value) / self.count
+        else:
+            self.value = (self.value * (self.period - 1) + true_range) / self.period
+        return self.value
+
+
+class RollingZScore:
+    """Z-score of the latest value against a rolling window"""
+
+    def __init__(self, window: int = 50):
+        self.window = RollingWindow(window)
+        self.value = None
+
+    def update(self, x: float) -> Optional[float]:
+        # Score against the history before adding the new point
+        mean, std = self.window.mean, self.window.std
+        self.window.push(x)
+        if mean is None or not std:
+            self.value = None
+        else:
+            self.value = (x - mean) / std
+        return self.value
+
+
+class VWAP:
+    """Rolling volume-weighted average price"""
+
+    def __init__(self, window: int = 100):
+        self.size = window
+        self.entries = deque()
+        self.pv_total = 0.0
+        self.volume_total = 0.0
+        self.value = None
+
+    def update(self, price: float, volume: float) -> Optional[float]:
+        self.entries.append((price * volume, volume))
+        self.pv_total += price * volume
+        self.volume_total += volume
+        if len(self.entries) > self.size:
+            pv, vol = self.entries.popleft()
+            self.pv_total -= pv
+            self.volume_total -= vol
+        self.value = self.pv_total / self.volume_total if self.volume_total > 0 else price
+        return self.value
+
+
+class BollingerBands:
+    """Rolling Bollinger bands"""
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        self.window = RollingWindow(window)
+        self.num_std = num_std
+        self.middle = None
+        self.upper = None
+        self.lower = None
+
+    def update(self, price: float):
+        self.window.push(price)
+        self.middle = self.window.mean
+        std = self.window.std
+        if std is None:
+            self.upper = self.lower = None
+        else:
+            self.upper = self.middle + self.num_std * std
+            self.lower = self.middle - self.num_std * std
+        return self.middle, self.upper, self.lower
+
+    def percent_b(self, price: float) -> Optional[float]:
+        if self.upper is None or self.upper == self.lower:
+            return None
+        return (price - self.lower) / (self.upper - self.lower)
+
+
+class SymbolIndicatorState:
+    """All streaming indicators for a single symbol"""
+
+    def __init__(self, symbol: str, settings: Dict):
+        self.symbol = symbol
+        self.ema_fast = EMA(settings.get('ema_fast', 12))
+        self.ema_slow = EMA(settings.get('ema_slow', 26))
+        self.rsi = RSI(settings.get('rsi_period', 14))
+        self.atr = ATR(settings.get('atr_period', 14))
+        self.price_zscore = RollingZScore(settings.get('zscore_window', 50))
+        self.volume_zscore = RollingZScore(settings.get('zscore_window', 50))
+        self.vwap = VWAP(settings.get('vwap_window', 100))
+        self.bollinger = BollingerBands(settings.get('bollinger_window', 20),
+                                        settings.get('bollinger_std', 2.0))
+        self.sentiment = EMA(settings.get('sentiment_period', 10))
+        self.sentiment_updates = 0
+        # Bounded (timestamp, price) tick history; appends are O(1)
+        self.history = deque(maxlen=settings.get('history_size', 500))
+        # Hourly (bar_start, close) bars spanning weeks, for forecasting on the horizon's timescale
+        self.bar_seconds = settings.get('bar_seconds', 3600)
+        self.bars = deque(maxlen=settings.get('bar_history', 2160))
+        self.last_price = None
+        self.last_return = None
+        self.ticks = 0
+        self.last_update = None
+
+    def update(self, price: float, volume: float = 0.0, high: Optional[float] = None,
+               low: Optional[float] = None, timestamp: Optional[float] = None):
+        """Fold one tick into every indicator"""
+        high = price if high is None else high
+        low = price if low is None else low
+
+        if self.last_price:
+            self.last_return = (price - self.last_price) / self.last_price
+            self.price_zscore.update(self.last_return)
+
+        self.ema_fast.update(price)
+        self.ema_slow.update(price)
+        self.rsi.update(price)
+        self.atr.update(high, low, price)
+        self.volume_zscore.update(volume)
+        self.vwap.update(price, volume)
+        self.bollinger.update(price)
+
+        self.last_price = price
+        self.ticks += 1
+        self.last_update = timestamp or time.time()
+        self.history.append((self.last_update, price))
+
+        bar_start = self.last_update - self.last_update % self.bar_seconds
+        if self.bars and self.bars[-1][0] == bar_start:
+            self.bars[-1] = (bar_start, price)
+        elif not self.bars or bar_start > self.bars[-1][0]:
+            self.bars.append((bar_start, price))
+
+    def update_sentiment(self, score: float):
+        self.sentiment.update(score)
+        self.sentiment_updates += 1
+
+    def feature_row(self) -> List[Optional[float]]:
+        """Current values of the rule features, in FEATURE_COLUMNS order"""
+        price = self.last_price
+        return [
+            price, self.vwap.value, self.ema_fast.value, self.ema_slow.value, self.rsi.value, self.atr.value,
+            self.price_zscore.value, self.volume_zscore.value,
+            self.bollinger.percent_b(price) if price is not None else None, self.sentiment.value
+        ]
+
+    def features(self) -> Dict:
+        """Current indicator values as a flat feature dict"""
+        return {
+            'symbol': self.symbol,
+            'price': self.last_price,
+            'return': self.last_return,
+            'ema_fast': self.ema_fast.value,
+            'ema_slow': self.ema_slow.value,
+            'rsi': self.rsi.value,
+            'atr': self.atr.value,
+            'price_zscore': self.price_zscore.value,
+            'volume_zscore': self.volume_zscore.value,
+            'vwap': self.vwap.value,
+            'bollinger_upper': self.bollinger.upper,
+            'bollinger_middle': self.bollinger.middle,
+            'bollinger_lower': self.bollinger.lower,
+            'percent_b': self.bollinger.percent_b(self.last_price) if self.last_price is not None else None,
+            'sentiment': self.sentiment.value,
+            'sentiment_updates': self.sentiment_updates,
+            'ticks': self.ticks,
+            'last_update': self.last_update
+        }
+
+
+# Features the compiled rule plan reads, in FeatureMatrix column order
+FEATURE_COLUMNS = [
+    'price', 'vwap', 'ema_fast', 'ema_slow', 'rsi', 'atr',
+    'price_zscore', 'volume_zscore', 'percent_b', 'sentiment'
+]
+
+
+class FeatureMatrix:
+    """Symbol x feature array of rule inputs, rewritten in place for a symbol on each of its updates"""
+
+    def __init__(self, columns: List[str] = FEATURE_COLUMNS, capacity: int = 64):
+        self.columns = list(columns)
+        self.rows: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.values = np.full((capacity, len(self.columns)), np.nan)
+        self.ticks = np.zeros(capacity, dtype=np.int64)
+
+    def row(self, symbol: str) -> int:
+        index = self.rows.get(symbol)
+        if index is None:
+            index = len(self.symbols)
+            if index == len(self.values):
+                # Amortized O(1) growth
+                self.values = np.vstack([self.values, np.full_like(self.values, np.nan)])
+                self.ticks = np.concatenate([self.ticks, np.zeros_like(self.ticks)])
+            self.rows[symbol] = index
+            self.symbols.append(symbol)
+        return index
+
+    def write(self, symbol: str, state: 'SymbolIndicatorState'):
+        index = self.row(symbol)
+        self.values[index] = state.feature_row()
+        self.ticks[index] = state.ticks
+
+    def select(self, symbols: Optional[Iterable[str]] = None, min_ticks: int = 0):
+        """(symbols, column arrays) for the requested symbols that have at least min_ticks ticks"""
+        if symbols is None:
+            indices = np.arange(len(self.symbols))
+        else:
+            indices = np.array([self.rows[s] for s in symbols if s in self.rows], dtype=np.int64)
+        indices = indices[self.ticks[indices] >= min_ticks]
+        block = self.values[indices]
+        return [self.symbols[i] for i in indices], {name: block[:, j] for j, name in enumerate(self.columns)}
+
+
+DEFAULT_SETTINGS = {
+    'ema_fast': 12,
+    'ema_slow': 26,
+    'rsi_period': 14,
+    'atr_period': 14,
+    'zscore_window': 50,
+    'vwap_window': 100,
+    'bollinger_window': 20,
+    'bollinger_std': 2.0,
+    'sentiment_period': 10,
+    'history_size': 500,
+    'bar_seconds': 3600,
+    'bar_history': 2160,
+    'min_ticks': 20,
+    'cooldown_seconds': 300,
+    'thresholds': {
+        'price_spike_zscore': 2.0,
+        'volume_zscore': 1.5,
+        'sentiment_positive': 0.2,
+        'rsi_oversold': 30,
+        'rsi_overbought': 70
+    }
+}
+
+
+# Numeric sentiment some scanners attach to payloads, checked before the keyword lexicon
+SENTIMENT_FIELDS = ('sentiment', 'sentiment_score', 'compound')
+
+DEFAULT_SENTIMENT_LEXICON = {
+    'positive': ['rally', 'rallies', 'surge', 'surges', 'soar', 'soars', 'bullish', 'breakout', 'gains',
+                 'record high', 'beat', 'beats', 'upgrade', 'upgraded', 'adoption', 'approval', 'approved'],
+    'negative': ['crash', 'crashes', 'plunge', 'plunges', 'bearish', 'selloff', 'sell-off', 'slump', 'hack',
+                 'hacked', 'ban', 'banned', 'downgrade', 'downgraded', 'lawsuit', 'fraud', 'liquidation', 'miss']
+}
+
+
+class StreamingIndicatorEngine:
+    """Per-symbol streaming indicator state; rules are evaluated over its feature matrix by rule_compiler"""
+
+    def __init__(self, config: Dict):
+        signal_config = config.get('signal_engine', {})
+
+        self.settings = {**DEFAULT_SETTINGS, **signal_config.get('streaming_indicators', {})}
+
+        self.states: Dict[str, SymbolIndicatorState] = {}
+        self.last_fired: Dict[tuple, float] = {}
+        # Canonical asset (BTC) -> market symbols quoting it (BTCUSDT), so text sentiment reaches tick state
+        self.asset_symbols: Dict[str, set] = {}
+        # Column arrays the compiled rule plan evaluates directly
+        self.matrix = FeatureMatrix()
+
+        lexicon = signal_config.get('sentiment_lexicon', DEFAULT_SENTIMENT_LEXICON)
+        self.sentiment_words = {
+            polarity: re.compile(r'\b(?:' + '|'.join(re.escape(w.lower()) for w in words) + r')\b')
+            for polarity, words in lexicon.items() if words
+        }
+
+    def get_state(self, symbol: str) -> SymbolIndicatorState:
+        state = self.states.get(symbol)
+        if state is None:
+            state = SymbolIndicatorState(symbol, self.settings)
+            self.states[symbol] = state
+        return state
+
+    def update(self, symbol: str, price: float, volume: float = 0.0, high: Optional[float] = None,
+               low: Optional[float] = None, timestamp: Optional[float] = None) -> Dict:
+        """Update indicators for a symbol and return its features"""
+        state = self.get_state(symbol)
+        state.update(price, volume, high, low, timestamp)
+        self.matrix.write(symbol, state)
+        return state.features()
+
+    def link_symbol(self, symbol: str, asset: str):
+        """Route sentiment for a canonical asset to a market symbol, seeded with what the asset already has"""
+        if symbol == asset or symbol in self.asset_symbols.get(asset, ()):
+            return
+        self.asset_symbols.setdefault(asset, set()).add(symbol)
+        earlier = self.states.get(asset)
+        state = self.get_state(symbol)
+        if earlier is not None and earlier.sentiment.value is not None and state.sentiment.value is None:
+            state.sentiment.value = earlier.sentiment.value
+            state.sentiment_updates = earlier.sentiment_updates
+            self.matrix.write(symbol, state)
+
+    def update_sentiment(self, symbol: str, score: float):
+        """Fold a sentiment reading (-1..1) into the sentiment EMA of the symbol, or of every symbol linked to it"""
+        for target in (symbol, *self.asset_symbols.get(symbol, ())):
+            state = self.get_state(target)
+            state.update_sentiment(score)
+            self.matrix.write(target, state)
+
+    def score_sentiment(self, text: str, payload: Dict) -> Optional[float]:
+        """Sentiment in -1..1 from a payload score, else from lexicon hits; None when there is no signal"""
+        for field in SENTIMENT_FIELDS:
+            value = payload.get(field)
+            if isinstance(value, (int, float)):
+                # 0..100 scores are centred on 50
+                return max(-1.0, min(1.0, (value - 50) / 50 if value > 1 else float(value)))
+        if not text:
+            return None
+        lowered = text.lower()
+        positive = len(self.sentiment_words['positive'].findall(lowered)) if 'positive' in self.sentiment_words else 0
+        negative = len(self.sentiment_words['negative'].findall(lowered)) if 'negative' in self.sentiment_words else 0
+        if positive + negative == 0:
+            return None
+        return (positive - negative) / (positive + negative)
+
+    def ingest_sentiment(self, rows: Iterable[Tuple[Tuple[str, ...], str, Dict]]) -> List[str]:
+        """Fold (assets, text, payload) text events into each mentioned asset's sentiment; returns updated assets"""
+        updated = []
+        for assets, text, payload in rows:
+            score = self.score_sentiment(text, payload)
+            if score is None:
+                continue
+            for asset in assets:
+                self.update_sentiment(asset, score)
+                updated.append(asset)
+        return updated
+
+    def check_cooldown(self, symbol: str, rule_name: str, now: float) -> bool:
+        """Record a firing unless the rule already fired for the symbol within the cooldown"""
+        key = (symbol, rule_name)
+        if now - self.last_fired.get(key, 0) < self.settings['cooldown_seconds']:
+            return False
+        self.last_fired[key] = now
+        return True
+
+    def get_history(self, symbol: str) -> List[tuple]:
+        """Recent (timestamp, price) points for a symbol, oldest first"""
+        state = self.states.get(symbol)
+        return list(state.history) if state else []
+
+    def get_bars(self, symbol: str) -> List[tuple]:
+        """(bar_start, close) bars for a symbol, oldest first; the last bar may still be forming"""
+        state = self.states.get(symbol)
+        return list(state.bars) if state else []
+
+    def linked_states(self, symbol: str) -> List[SymbolIndicatorState]:
+        """States for a symbol and every market symbol linked to it"""
+        return [self.states[s] for s in (symbol, *sorted(self.asset_symbols.get(symbol, ()))) if s in self.states]
+
+    def last_bar_times(self, symbols: Iterable[str]) -> Dict[str, Optional[float]]:
+        """Start of the latest bar per symbol (over its linked market symbols), None before the first tick"""
+        times = {}
+        for symbol in symbols:
+            starts = [state.bars[-1][0] for state in self.linked_states(symbol) if state.bars]
+            times[symbol] = max(starts) if starts else None
+        return times
+
+    def sentiment_counts(self, symbols: Iterable[str]) -> Dict[str, int]:
+        """Sentiment readings folded in per symbol so far"""
+        return {symbol: max((state.sentiment_updates for state in self.linked_states(symbol)), default=0)
+                for symbol in symbols}
+
+    def feature_columns(self, symbols: Optional[Iterable[str]] = None):
+        """(symbols, column arrays) of warmed-up symbols, read straight from the feature matrix"""
+        return self.matrix.select(symbols, self.settings['min_ticks'])
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Feature snapshot for every tracked symbol"""
+        return {symbol: state.features() for symbol, state in self.states.items()}
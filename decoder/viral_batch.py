@@ -0,0 +1,93 @@
+"""
+Viral Batch Scorer
+Scores whole decode batches at once by running ViralScorer.compute_score
+for every pattern concurrently, so the action thresholds keep their meaning
+and a burst costs one round of awaits instead of a serial loop
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class BatchViralScorer:
+    """score_batch(patterns) over the wrapped per-pattern ViralScorer"""
+
+    DEFAULT_SETTINGS = {
+        'max_concurrency': 64,
+        'recent_alerts': 200
+    }
+
+    def __init__(self, scorer: Any, config: Optional[Dict] = None, alert_threshold: float = 70.0):
+        self.scorer = scorer
+        settings = (config or {}).get('viral_scoring', {})
+        self.settings = {**self.DEFAULT_SETTINGS, **settings}
+        self.alert_threshold = alert_threshold
+        self.semaphore = asyncio.Semaphore(max(1, int(self.settings['max_concurrency'])))
+        # Only used when the wrapped scorer keeps no alert list of its own
+        self.recent_alerts: deque = deque(maxlen=self.settings['recent_alerts'])
+        self.stats = {'batches': 0, 'patterns': 0, 'above_threshold': 0, 'failures': 0, 'last_batch_ms': 0.0}
+
+    def __getattr__(self, name):
+        # Everything besides batch scoring stays with the wrapped per-pattern scorer
+        scorer = self.__dict__.get('scorer')
+        if scorer is None:
+            raise AttributeError(name)
+        return getattr(scorer, name)
+
+    async def _score_one(self, pattern: Dict) -> float:
+        async with self.semaphore:
+            return float(await self.scorer.compute_score(pattern))
+
+    async def score_batch(self, patterns: List[Dict]) -> np.ndarray:
+        """Viral scores (0-100) for a batch, one concurrent ViralScorer.compute_score per pattern"""
+        if not patterns:
+            return np.zeros(0)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._score_one(p) for p in patterns), return_exceptions=True)
+
+        failures = [r for r in results if isinstance(r, Exception)]
+        for error in failures:
+            logger.warning(f"Viral scoring failed for a pattern: {error}")
+        self.stats['failures'] += len(failures)
+
+        scores = np.array([0.0 if isinstance(r, Exception) else r for r in results])
+        self.record(patterns, scores, started)
+        return scores
+
+    def record(self, patterns: List[Dict], scores: np.ndarray, started: float):
+        hits = np.flatnonzero(scores > self.alert_threshold)
+        if not hasattr(self.scorer, 'get_recent_alerts'):
+            for row in hits:
+                pattern = patterns[row]
+                self.recent_alerts.append({
+                    'id': pattern.get('id'),
+                    'asset': pattern.get('asset'),
+                    'type': pattern.get('type'),
+                    'source': pattern.get('source'),
+                    'score': round(float(scores[row]), 2),
+                    'timestamp': pattern.get('timestamp')
+                })
+
+        self.stats['batches'] += 1
+        self.stats['patterns'] += len(patterns)
+        self.stats['above_threshold'] += len(hits)
+        self.stats['last_batch_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+    async def compute_score(self, pattern: Dict) -> float:
+        return float((await self.score_batch([pattern]))[0])
+
+    def get_recent_alerts(self) -> List[Dict]:
+        """The wrapped scorer's alerts when it records them, otherwise the batch scorer's own"""
+        if hasattr(self.scorer, 'get_recent_alerts'):
+            return list(self.scorer.get_recent_alerts() or [])
+        return list(self.recent_alerts)
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test concurrent, isolated action lanes
+"""
+
+import asyncio
+
+from utils.action_dispatcher import ActionDispatcher
+from utils.event_bus import EventBus
+
+
+def pattern(i, asset='BTC', kind='breakout'):
+    return {'id': f'p{i}', 'asset': asset, 'type': kind}
+
+
+def test_trade_lane_is_not_delayed_by_social_apis():
+    async def scenario():
+        bus = EventBus()
+        dispatcher = ActionDispatcher(bus, {'event_bus': {'actions': {'alert': {'coalesce_seconds': 0}}}})
+        loop = asyncio.get_running_loop()
+        order_times, posted = [], []
+
+        async def trade(p, score):
+            order_times.append(loop.time())
+
+        async def alert(p, score):
+            await asyncio.sleep(0.3)  # stuck Telegram call
+
+        async def post(p, score):
+            await asyncio.sleep(1.0)  # Reddit hangs past its timeout
+            posted.append(p['id'])
+
+        dispatcher.add_action('post', post, priority=2, timeout=0.05)
+        dispatcher.add_action('alert', alert, priority=1, coalesce_seconds=5)
+        dispatcher.add_action('trade', trade, priority=0, overflow='block')
+        bus.start()
+        dispatcher.start()
+
+        started = loop.time()
+        await dispatcher.dispatch(pattern(1), 95.0, ['alert', 'post', 'trade'])
+        dispatch_time = loop.time() - started
+        await asyncio.sleep(0.1)
+        stats = dispatcher.get_stats()
+        await dispatcher.stop()
+        await bus.stop()
+        return dispatch_time, [t - started for t in order_times], posted, stats
+
+    dispatch_time, order_latency, posted, stats = asyncio.run(scenario())
+    assert dispatch_time < 0.01
+    assert len(order_latency) == 1 and order_latency[0] < 0.02
+    assert posted == []
+    assert stats['post']['timeouts'] == 1
+    assert stats['trade']['processed'] == 1
+    assert stats['alert']['priority'] == 1
+
+
+def test_alert_lane_coalesces_repeats_per_asset_and_type():
+    async def scenario():
+        bus = EventBus()
+        dispatcher = ActionDispatcher(bus)
+        sent = []
+
+        async def alert(p, score):
+            sent.append((p['id'], score, p.get('coalesced_count', 1)))
+
+        dispatcher.add_action('alert', alert, coalesce_seconds=0.05)
+        bus.start()
+        dispatcher.start()
+
+        for i, score in enumerate([72.0, 91.0, 80.0]):
+            await dispatcher.dispatch(pattern(i), score, ['alert'])
+        await dispatcher.dispatch(pattern(9, asset='ETH'), 75.0, ['alert'])
+        assert sent == []
+
+        await asyncio.sleep(0.15)
+        await bus.join()
+        stats = dispatcher.get_stats()['alert']
+        await dispatcher.stop()
+        await bus.stop()
+        return sent, stats
+
+    sent, stats = asyncio.run(scenario())
+    assert sorted(sent) == [('p1', 91.0, 3), ('p9', 75.0, 1)]
+    assert stats['coalesced'] == 2 and stats['dispatched'] == 2 and stats['pending'] == 0
+
+
+def test_timed_out_trade_is_not_cancelled_and_is_tracked_until_it_resolves():
+    async def scenario():
+        bus = EventBus()
+        dispatcher = ActionDispatcher(bus)
+        open_trades = []
+
+        async def trade(p, score):
+            await asyncio.sleep(0.15)  # exchange acknowledges slowly
+            open_trades.append(p['id'])
+
+        dispatcher.add_action('trade', trade, priority=0, timeout=0.05, overflow='block', cancel_on_timeout=False)
+        bus.start()
+        await dispatcher.dispatch(pattern(1), 90.0, ['trade'])
+
+        await asyncio.sleep(0.1)
+        in_flight = dispatcher.get_unknown_outcomes()
+        await bus.join()
+        stats = dispatcher.get_stats()['trade']
+        await bus.stop()
+        return open_trades, in_flight, stats, dispatcher
+
+    open_trades, in_flight, stats, dispatcher = asyncio.run(scenario())
+    assert [entry['pattern_id'] for entry in in_flight] == ['p1']
+    assert open_trades == ['p1']
+    assert stats['timeouts'] == 1 and stats['processed'] == 1 and stats['unknown_outcomes'] == 0
+    assert dispatcher.resolved_late == 1 and dispatcher.get_unknown_outcomes() == []
+
+
+def test_stop_delivers_coalesced_alerts_and_reports_dropped_per_lane():
+    async def scenario():
+        bus = EventBus()
+        dispatcher = ActionDispatcher(bus)
+        sent, traded = [], []
+
+        async def alert(p, score):
+            sent.append(p['id'])
+
+        async def trade(p, score):
+            await asyncio.sleep(0.5 if p['id'] == 'p1' else 0)  # slow venue at shutdown
+            traded.append(p['id'])
+
+        dispatcher.add_action('alert', alert, coalesce_seconds=60)
+        dispatcher.add_action('trade', trade, priority=0, overflow='block')
+        bus.start()
+        dispatcher.start()
+
+        await dispatcher.dispatch(pattern(0, asset='ETH'), 80.0, ['alert'])
+        for i in (1, 2, 3):
+            await dispatcher.dispatch(pattern(i), 90.0, ['trade'])
+        # The coalescing window is still open: the alert only goes out because stop() flushes it
+        dropped = await dispatcher.stop(drain_timeout=0.1)
+        await bus.stop()
+        return sent, traded, dropped
+
+    sent, traded, dropped = asyncio.run(scenario())
+    assert sent == ['p0']
+    assert traded == []
+    assert dropped == {'trade': 3}
+
+
+if __name__ == "__main__":
+    test_trade_lane_is_not_delayed_by_social_apis()
+    test_alert_lane_coalesces_repeats_per_asset_and_type()
+    test_timed_out_trade_is_not_cancelled_and_is_tracked_until_it_resolves()
+    test_stop_delivers_coalesced_alerts_and_reports_dropped_per_lane()
+    print("All action dispatcher tests passed")
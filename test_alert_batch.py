@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test columnar alert batches and the vectorized clustering pipeline
+"""
+
+import time
+
+from decoder.alert_batch import AlertBatch, VectorAlertPipeline
+
+NOON = time.mktime((2025, 1, 15, 12, 0, 0, 0, 0, -1))
+
+CONFIG = {
+    'smart_alerts': {
+        'user_preferences': {'max_daily_alerts': 10, 'quiet_hours': ['22:00', '06:00']},
+        'clustering_window': '1h',
+        'fatigue_threshold': 2
+    }
+}
+
+
+def test_clusters_by_symbol_type_and_window_keeping_best():
+    batch = AlertBatch(timestamp=NOON)
+    for confidence in (0.65, 0.9, 0.7):
+        batch.add('TRADING_SIGNAL', 'BTC', confidence, "⚡ {symbol}: {action} {confidence:.0%}", action='BUY')
+    batch.add('TRADING_SIGNAL', 'BTC', 0.8, "⚡ {symbol}: {action}", timestamp=NOON + 7200, action='SELL')
+    batch.add('ML_ANOMALY', 'BTC', 0.75)
+    batch.add('TRADING_SIGNAL', 'ETH', 0.5)
+
+    result = VectorAlertPipeline(CONFIG).process(batch, now=NOON)
+    summary = result['summary']
+    assert summary['candidates'] == 6
+    assert summary['clusters'] == 4
+    # Confidence, fatigue and quiet hours are SmartAlertManager's filters, not applied twice
+    assert summary['forwarded'] == 4
+    assert [a['confidence'] for a in result['alerts']] == [0.9, 0.8, 0.75, 0.5]
+
+    best = result['alerts'][0]
+    assert best['cluster_size'] == 3
+    assert best['message'] == '⚡ BTC: BUY 90%'
+
+
+def test_counts_only_alerts_the_manager_sent():
+    pipeline = VectorAlertPipeline(CONFIG)
+    batch = AlertBatch(timestamp=NOON)
+    batch.add('ML_ANOMALY', 'SOL', 0.8)
+    batch.add('ML_ANOMALY', 'ADA', 0.8)
+    forwarded = pipeline.process(batch, now=NOON)['alerts']
+
+    # The manager suppressed ADA; only SOL counts as sent and damps SOL's next score
+    assert pipeline.record_sent([a for a in forwarded if a['symbol'] == 'SOL'], now=NOON) == 1
+    stats = pipeline.get_stats()
+    assert stats['forwarded'] == 2 and stats['sent'] == 1
+
+    batch = AlertBatch(timestamp=NOON + 60)
+    batch.add('ML_ANOMALY', 'SOL', 0.8)
+    batch.add('ML_ANOMALY', 'ADA', 0.8)
+    scores = {a['symbol']: a['score'] for a in pipeline.process(batch, now=NOON + 60)['alerts']}
+    assert scores['ADA'] == 0.8 and scores['SOL'] < 0.8
+
+
+def test_keeps_caller_timestamp_types():
+    batch = AlertBatch(timestamp=NOON)
+    batch.extend_records([
+        {'alert_type': 'CORRELATION_BREAK', 'symbol': 'BTC-ETH', 'confidence': 0.8,
+         'message': 'Correlation broke', 'timestamp': '2025-01-15T12:00:00Z'},
+        {'alert_type': 'PORTFOLIO_REBALANCING', 'symbol': 'PORTFOLIO', 'confidence': 0.8, 'message': 'Rebalance'}
+    ])
+    batch.add('ML_ANOMALY', 'SOL', 0.75, timestamp=NOON + 5)
+
+    alerts = {a['alert_type']: a for a in VectorAlertPipeline(CONFIG).process(batch, now=NOON)['alerts']}
+    assert alerts['CORRELATION_BREAK']['timestamp'] == '2025-01-15T12:00:00Z'
+    assert alerts['CORRELATION_BREAK']['message'] == 'Correlation broke'
+    assert alerts['PORTFOLIO_REBALANCING']['timestamp'] == NOON
+    assert alerts['ML_ANOMALY']['timestamp'] == NOON + 5
+
+
+def test_large_batches_reduce_to_one_alert_per_cluster():
+    batch = AlertBatch(timestamp=NOON)
+    for i in range(5000):
+        batch.add('TRADING_SIGNAL', f'SYM{i % 500}', 0.6 + (i % 40) / 100)
+    result = VectorAlertPipeline(CONFIG).process(batch, now=NOON)
+    assert result['summary']['clusters'] == 500
+    assert len(result['alerts']) == 500
+    assert all(a['cluster_size'] == 10 for a in result['alerts'])
+    confidences = [a['confidence'] for a in result['alerts']]
+    assert confidences == sorted(confidences, reverse=True)
+    expected = {f'SYM{k}': 0.6 + max(k % 40, (k + 20) % 40) / 100 for k in range(500)}
+    assert all(abs(a['confidence'] - expected[a['symbol']]) < 1e-9 for a in result['alerts'])
+
+
+if __name__ == "__main__":
+    test_clusters_by_symbol_type_and_window_keeping_best()
+    test_counts_only_alerts_the_manager_sent()
+    test_keeps_caller_timestamp_types()
+    test_large_batches_reduce_to_one_alert_per_cluster()
+    print("All alert batch tests passed")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test the bounded, indexed alert history store
+"""
+
+from types import SimpleNamespace
+
+from decoder.alert_history import AlertHistoryStore
+
+NOW = 1_700_000_000.0
+
+
+def make_alert(i, symbol='BTC', priority='high', alert_type='TRADING_SIGNAL', timestamp=None):
+    return SimpleNamespace(id=f'a{i}', alert_type=alert_type, symbol=symbol, confidence=0.8,
+                           message=f'alert {i}', timestamp=timestamp if timestamp is not None else NOW + i,
+                           priority=priority)
+
+
+def test_capacity_evicts_oldest_and_keeps_indexes_consistent():
+    store = AlertHistoryStore(capacity=5)
+    for i in range(8):
+        store.append(make_alert(i, symbol='BTC' if i % 2 else 'ETH', priority='high' if i < 4 else 'medium'))
+
+    assert len(store) == 5
+    assert [a.id for a in store] == ['a3', 'a4', 'a5', 'a6', 'a7']
+    assert store[-1].id == 'a7'
+    assert store.get_counters(now=NOW + 10) == {
+        'total_alerts': 5, 'high_priority': 1, 'medium_priority': 4, 'recent_24h': 5
+    }
+    assert store.get_stats()['evicted'] == 3
+
+
+def test_query_filters_and_paginates_newest_first():
+    store = AlertHistoryStore(capacity=100)
+    for i in range(30):
+        store.append(make_alert(i, symbol=['BTCUSDT', 'ETHUSDT', 'RELIANCE'][i % 3],
+                                priority='high' if i % 2 else 'medium',
+                                alert_type='ML_ANOMALY' if i % 5 == 0 else 'TRADING_SIGNAL'))
+
+    everything = store.query(page=2, per_page=7)
+    assert everything['total'] == 30
+    assert [a['id'] for a in everything['alerts']] == [f'a{i}' for i in range(22, 15, -1)]
+
+    filtered = store.query(page=1, per_page=3, priority='high', asset='usdt')
+    expected = [i for i in range(29, -1, -1) if i % 2 and i % 3 != 2]
+    assert filtered['total'] == len(expected)
+    assert [a['id'] for a in filtered['alerts']] == [f'a{i}' for i in expected[:3]]
+    assert filtered['alerts'][0]['disposition'] == 'pending'
+
+    anomalies = store.query(alert_type='ML_ANOMALY', asset='RELIANCE')
+    assert [a['id'] for a in anomalies['alerts']] == ['a20', 'a5']
+
+
+def test_recent_24h_counts_by_timestamp():
+    store = AlertHistoryStore(capacity=10)
+    for i, age in enumerate([100000, 90000, 3600, 60]):
+        store.append(make_alert(i, timestamp=NOW - age))
+    assert store.get_counters(now=NOW)['recent_24h'] == 2
+
+
+if __name__ == "__main__":
+    test_capacity_evicts_oldest_and_keeps_indexes_consistent()
+    test_query_filters_and_paginates_newest_first()
+    test_recent_24h_counts_by_timestamp()
+    print("All alert history tests passed")
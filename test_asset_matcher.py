@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test the compiled multi-pattern asset matcher
+"""
+
+import json
+import os
+import random
+
+from utils.asset_matcher import AssetMatcher, benchmark
+
+with open('assets-config.json') as f:
+    ASSETS = json.load(f)
+
+HEADLINES = [
+    'Bitcoin whale moves coins as Ethereum funding flips',
+    'RBI policy: HDFC Bank and ICICI lead Nifty higher',
+    'TCS quarterly results beat earnings guidance',
+    'Reliance Industries jumps; Solana and BTC rally',
+    'Nothing to see here',
+    ''
+]
+
+
+def test_batch_scan_matches_per_pattern_reference():
+    matcher = AssetMatcher(ASSETS)
+    words = ' '.join(HEADLINES).split() + ['link', 'dot', 'the', 'market']
+    rng = random.Random(7)
+    texts = HEADLINES + [' '.join(rng.choice(words) for _ in range(25)) for _ in range(200)]
+
+    batch = matcher.tag_batch(texts)
+    assert batch == matcher.tag_batch_per_pattern(texts)
+    assert batch == [matcher.tag(text) for text in texts]
+    assert batch[0] == ('BTC', 'ETH')
+    assert batch[4] == () and batch[5] == ()
+    assert matcher.resolve_symbol('BTCUSDT') == 'BTC'
+    assert matcher.resolve_symbol('RELIANCE.NS') == 'RELIANCE'
+
+    report = benchmark(matcher, texts, repeat=1)
+    assert report['texts'] == len(texts) and report['compiled_texts_per_minute'] > 0
+
+
+def test_rebuilds_when_config_file_changes(tmp_path):
+    path = tmp_path / 'assets-config.json'
+    path.write_text(json.dumps({'crypto': {'BTC': {'symbol': 'BTCUSDT', 'patterns': [r'\bBTC\b']}}}))
+    matcher = AssetMatcher(config_path=str(path))
+    assert matcher.tag('DOGE and BTC') == ('BTC',)
+    assert matcher.refresh() is False
+
+    config = json.loads(path.read_text())
+    config['crypto']['DOGE'] = {'symbol': 'DOGEUSDT', 'patterns': [r'\bDOGE\b']}
+    path.write_text(json.dumps(config))
+    os.utime(path, (matcher.config_mtime + 5, matcher.config_mtime + 5))
+
+    assert matcher.refresh() is True
+    assert matcher.builds == 2
+    assert matcher.tag('DOGE and BTC') == ('DOGE', 'BTC')
+
+
+if __name__ == "__main__":
+    test_batch_scan_matches_per_pattern_reference()
+    print("Asset matcher tests passed")
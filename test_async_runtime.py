@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test the long-lived async runtime bridge
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.async_runtime import AsyncRuntime, ExecutorSaturated
+
+
+class LoopOwned:
+    """Stands in for platform objects that bind to the loop they first run on"""
+
+    def __init__(self):
+        self.lock = None
+        self.loops = set()
+
+    async def work(self, value):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            self.loops.add(id(asyncio.get_running_loop()))
+            await asyncio.sleep(0)
+            return value * 2
+
+
+def test_requests_from_many_threads_share_one_loop():
+    runtime = AsyncRuntime('test-loop')
+    owned = LoopOwned()
+    results = []
+
+    def handler(i):
+        results.append(runtime.run(owned.work(i), timeout=5))
+
+    threads = [threading.Thread(target=handler, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [i * 2 for i in range(20)]
+    assert len(owned.loops) == 1
+    # Done-callbacks may trail the waiting threads by a moment
+    deadline = time.monotonic() + 1
+    while runtime.get_stats()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = runtime.get_stats()
+    assert stats['running'] and stats['completed'] == 20 and stats['pending'] == 0
+    runtime.stop()
+    assert not runtime.running
+
+
+def test_timeout_cancels_the_coroutine_and_errors_propagate():
+    runtime = AsyncRuntime('test-loop')
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def broken():
+        raise ValueError('bad input')
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        runtime.run(slow(), timeout=0.05)
+    assert time.monotonic() - started < 1
+    assert cancelled.wait(1)
+
+    with pytest.raises(ValueError):
+        runtime.run(broken(), timeout=1)
+
+    async def nested():
+        with pytest.raises(RuntimeError):
+            runtime.run(asyncio.sleep(0))
+        return True
+
+    assert runtime.run(nested(), timeout=1) is True
+    assert runtime.get_stats()['timeouts'] == 1
+    runtime.stop()
+
+
+def test_supervised_task_restarts_and_executors_are_bounded():
+    config = {'runtime': {'io_workers': 1, 'io_queue': 1, 'cpu_workers': 1, 'lag_check_seconds': 0.05}}
+    runtime = AsyncRuntime('test-loop', config)
+    attempts = []
+    stopped = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError('feed dropped')
+        return 'done'
+
+    async def on_stop():
+        stopped.append(True)
+
+    runtime.on_stop(on_stop)
+    assert runtime.supervise('flaky', flaky, min_backoff=0.01).result(timeout=2) == 'done'
+    assert runtime.supervised['flaky']['restarts'] == 2
+
+    gate = threading.Event()
+
+    async def saturate():
+        first = asyncio.ensure_future(runtime.run_io(gate.wait, 2))
+        second = asyncio.ensure_future(runtime.run_io(time.sleep, 0))
+        await asyncio.sleep(0.05)
+        # One worker busy and one caller waiting: the queue is full
+        with pytest.raises(ExecutorSaturated):
+            await runtime.run_io(time.sleep, 0)
+        gate.set()
+        await asyncio.gather(first, second)
+        return await runtime.run_cpu(sum, range(10))
+
+    assert runtime.run(saturate(), timeout=3) == 45
+    stats = runtime.get_stats()
+    io = stats['executors']['io']
+    assert io['rejected'] == 1 and io['completed'] == 2 and io['max_queue_depth'] == 1
+    assert stats['executors']['cpu']['completed'] == 1
+    assert stats['supervised']['flaky'] == {'restarts': 2, 'last_error': 'feed dropped', 'running': False}
+
+    runtime.stop()
+    assert stopped == [True]
+
+
+if __name__ == "__main__":
+    test_requests_from_many_threads_share_one_loop()
+    test_timeout_cancels_the_coroutine_and_errors_propagate()
+    test_supervised_task_restarts_and_executors_are_bounded()
+    print("All async runtime tests passed")
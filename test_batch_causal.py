@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the batched causal screener against direct lagged regressions
+"""
+
+import numpy as np
+
+from decoder.batch_causal import BatchCausalScreener
+
+CONFIG = {'ai_strategist_features': {'causal_analysis': {'parameters': {
+    'max_lag': 3, 'granger_lag': 2, 'min_observations': 50, 'forgetting_factor': 1.0
+}}}}
+
+
+def lead_lag_returns(bars=400, symbols=6, seed=7):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.01, size=(bars, symbols))
+    # Symbol 0 leads symbol 1 by two bars
+    returns[2:, 1] += 0.8 * returns[:-2, 0]
+    return returns
+
+
+def direct_granger_f(returns, cause, effect, lags):
+    y = returns[lags:, effect]
+    own = np.column_stack([returns[lags - k:-k, effect] for k in range(1, lags + 1)])
+    other = np.column_stack([returns[lags - k:-k, cause] for k in range(1, lags + 1)])
+    ones = np.ones((len(y), 1))
+
+    def rss(x):
+        coef, *_ = np.linalg.lstsq(x, y, rcond=None)
+        return float(((y - x @ coef) ** 2).sum())
+
+    restricted, unrestricted = rss(np.hstack([ones, own])), rss(np.hstack([ones, own, other]))
+    return (restricted - unrestricted) / lags / (unrestricted / (len(y) - 2 * lags - 1))
+
+
+def test_screen_finds_lead_lag_pair_among_all_pairs():
+    returns = lead_lag_returns()
+    screener = BatchCausalScreener(CONFIG)
+    screener.ensure_symbols([f'S{i}' for i in range(returns.shape[1])])
+    for row in returns:
+        screener.update(row)
+
+    hypotheses = screener.screen()
+    assert len(hypotheses) == 30
+    top = hypotheses[0]
+    assert (top['cause'], top['effect'], top['best_lag']) == ('S0', 'S1', 2)
+    assert top['significant'] and top['p_value'] < 1e-6
+    assert [h['cause'] + h['effect'] for h in screener.get_active_hypotheses()] == ['S0S1']
+
+
+def test_incremental_statistics_match_direct_regression():
+    returns = lead_lag_returns(bars=200, symbols=3)
+    screener = BatchCausalScreener(CONFIG)
+    screener.ensure_symbols(['S0', 'S1', 'S2'])
+    for row in returns:
+        screener.update(row)
+
+    # Accumulation starts once max_lag bars of history exist, so align the direct fit to the same rows
+    window = returns[CONFIG['ai_strategist_features']['causal_analysis']['parameters']['max_lag'] - 2:]
+    f_stat, _ = screener.granger(np.array([0, 2]), np.array([1, 1]))
+    assert np.allclose(f_stat, [direct_granger_f(window, 0, 1, 2), direct_granger_f(window, 2, 1, 2)], rtol=1e-6)
+
+    lag2 = screener.lagged_correlations(np.array([0]), np.array([1]))[0, 1]
+    expected = np.corrcoef(returns[1:-2, 0], returns[3:, 1])[0, 1]
+    assert abs(lag2 - expected) < 1e-3
+
+
+def test_late_symbols_are_screened_only_after_enough_joint_history():
+    screener = BatchCausalScreener(CONFIG)
+    pairs = [('BTC', 'SOL'), ('SOL', 'ETH'), ('NIFTY', 'BTC')]
+    for step in range(120):
+        prices = {'BTC': 100 + step, 'ETH': 50 + (step % 7)}
+        if step >= 30:
+            prices['SOL'] = 20 + step % 3
+        screener.update_prices(prices)
+        if step == 59:
+            assert screener.cross.shape[-1] == 3
+            assert screener.screen(pairs=pairs) == []
+            assert {(h['cause'], h['effect']) for h in screener.screen()} == {('BTC', 'ETH'), ('ETH', 'BTC')}
+
+    assert screener.get_stats()['symbols'] == 3
+    hypotheses = screener.screen(pairs=pairs)
+    assert len(hypotheses) == 2
+    assert all(50 <= h['observations'] < 90 for h in hypotheses)
+
+
+def test_pair_statistics_use_their_own_observation_counts():
+    returns = lead_lag_returns(bars=400, symbols=3)
+    screener = BatchCausalScreener(CONFIG)
+    screener.ensure_symbols(['S0', 'S1', 'S2'])
+    for t, row in enumerate(returns):
+        # S0 and S1 only start reporting halfway through
+        screener.update(row, valid=np.array([t >= 200, t >= 200, True]))
+
+    lag2 = screener.lagged_correlations(np.array([0]), np.array([1]))[0, 1]
+    late = returns[200:]
+    expected = np.corrcoef(late[:-2, 0], late[2:, 1])[0, 1]
+    assert abs(lag2 - expected) < 0.02
+    # Full lag windows only: 200 - max_lag joint bars for the late pair, 400 - max_lag for S2
+    assert screener.pair_n[0, 1] == 197 and screener.symbol_n[2] == 397
+
+
+if __name__ == "__main__":
+    test_screen_finds_lead_lag_pair_among_all_pairs()
+    test_incremental_statistics_match_direct_regression()
+    test_late_symbols_are_screened_only_after_enough_joint_history()
+    test_pair_statistics_use_their_own_observation_counts()
+    print("All batch causal tests passed")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test batched forecasting over resampled bars
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from decoder.batch_forecaster import BatchForecaster, resample_bars, seasonality_for
+from decoder.streaming_indicators import StreamingIndicatorEngine
+
+DAY = 86400
+NOW = 1_736_942_400.0 + 3 * 3600  # 15:00 UTC, partway through a daily bar
+
+
+def hourly_series(days, start_price=100.0):
+    start = NOW - NOW % DAY - days * DAY
+    return [(start + h * 3600, start_price + h * 0.01) for h in range(days * 24 + 3)]
+
+
+class FakeFits:
+    """Stands in for the Prophet worker: records calls, optionally blocks until released"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, key, bars, horizon_days, settings, init=None, bar_seconds=DAY):
+        self.calls.append({'key': key, 'points': len(bars), 'init': init, 'bar_seconds': bar_seconds})
+        self.release.wait(5)
+        return {'series': key, 'predicted': bars[-1][1] + 1, 'points': len(bars),
+                'warm_started': init is not None, 'params': {'k': len(self.calls)}}
+
+
+def make_forecaster(fits, fallback=None, **batch):
+    config = {'phase5_features': {'ai_forecasting': {'batch': {'min_points': 30, **batch}}},
+              'orchestrator': {'cycle_budget': {'stage_seconds': {'phase5_advanced': 8}}}}
+    forecaster = BatchForecaster(config, fallback=fallback, fit_fn=fits)
+    forecaster.executor = ThreadPoolExecutor(max_workers=2)
+    return forecaster
+
+
+def test_resampling_drops_forming_bar_and_limits_seasonality():
+    bars = resample_bars(hourly_series(40), DAY, now=NOW)
+    assert len(bars) == 40
+    assert all(ts % DAY == 0 for ts, _ in bars) and bars[-1][0] < NOW - NOW % DAY
+    assert seasonality_for(DAY, 40 * DAY, {'daily_seasonality': True, 'yearly_seasonality': True}) == {
+        'daily_seasonality': False, 'weekly_seasonality': True, 'yearly_seasonality': False}
+
+    # The streaming engine keeps hourly bars that span far beyond its tick history
+    engine = StreamingIndicatorEngine({'signal_engine': {'streaming_indicators': {'history_size': 10}}})
+    for ts, price in hourly_series(40):
+        engine.update('BTC', price, timestamp=ts)
+    assert len(engine.get_history('BTC')) == 10
+    assert len(resample_bars(engine.get_bars('BTC'), DAY, now=NOW)) == 40
+
+
+def test_fits_are_cached_per_bar_window_and_warm_start():
+    fits = FakeFits()
+    forecaster = make_forecaster(fits)
+
+    async def run(series, now):
+        return await forecaster.forecast_universe(series, 7, now=now)
+
+    series = {'BTC': hourly_series(40)}
+    first = asyncio.run(run(series, NOW))
+    assert first['BTC']['points'] == 40 and fits.calls[0]['bar_seconds'] == DAY
+
+    # New ticks inside the forming bar do not move the window
+    series['BTC'] = series['BTC'] + [(NOW + 60, 250.0)]
+    assert asyncio.run(run(series, NOW + 120))['BTC'] == first['BTC']
+    assert len(fits.calls) == 1 and forecaster.stats['cache_hits'] == 1
+
+    # Once that bar completes the series refits, warm-started from the previous params
+    second = asyncio.run(run(series, NOW + DAY))
+    assert len(fits.calls) == 2 and fits.calls[1]['init'] == {'k': 1}
+    assert second['BTC']['points'] == 41 and forecaster.stats['warm_fits'] == 1
+    forecaster.shutdown()
+
+
+def test_slow_fits_finish_in_the_background_and_short_series_fall_back():
+    fits = FakeFits()
+    fits.release.clear()
+    fallback_calls = []
+
+    def fallback(symbol, horizon):
+        fallback_calls.append(symbol)
+        return {'symbol': symbol, 'horizon': horizon}
+
+    forecaster = make_forecaster(fits, fallback=fallback, timeout_seconds=0.05)
+    assert make_forecaster(fits, timeout_seconds=60).timeout_seconds == 6.0
+
+    async def scenario():
+        series = {'BTC': hourly_series(40), 'NEWCOIN': hourly_series(3)}
+        first = await forecaster.forecast_universe(series, 7, now=NOW)
+        fits.release.set()
+        while forecaster.inflight:
+            await asyncio.sleep(0.01)
+        second = await forecaster.forecast_universe(series, 7, now=NOW)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    # The cold fit outlived the wait but was not cancelled; the next cycle serves it from cache
+    assert 'BTC' not in first and second['BTC']['points'] == 40
+    assert len(fits.calls) == 1 and forecaster.stats['background_fits'] == 1
+    assert first['NEWCOIN'] == {'symbol': 'NEWCOIN', 'horizon': 7, 'source': 'single'}
+    assert fallback_calls == ['NEWCOIN']
+    forecaster.shutdown()
+
+
+if __name__ == "__main__":
+    test_resampling_drops_forming_bar_and_limits_seasonality()
+    test_fits_are_cached_per_bar_window_and_warm_start()
+    test_slow_fits_finish_in_the_background_and_short_series_fall_back()
+    print("All batch forecaster tests passed")
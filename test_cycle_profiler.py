@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test cycle profiler spans, rolling latency histograms and slowest-cycle capture
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils.cycle_profiler import CycleProfiler, LatencyHistogram
+
+
+def test_histogram_percentiles_over_rolling_window():
+    histogram = LatencyHistogram(window=100)
+    assert histogram.percentile(50) is None
+    assert histogram.summary() == {'count': 0, 'window': 0}
+
+    for ms in range(1, 151):
+        histogram.record(ms / 1000.0)
+
+    summary = histogram.summary()
+    # Only the last 100 samples (51..150 ms) are kept, but every record is counted
+    assert summary['count'] == 150 and summary['window'] == 100
+    assert summary['last'] == summary['max'] == 0.15
+    # Nearest-rank over the window: index round(q * 99)
+    assert (summary['p50'], summary['p95'], summary['p99']) == (0.101, 0.145, 0.149)
+    assert summary['mean'] == pytest.approx(0.1005)
+
+
+def test_spans_feed_stage_symbol_and_cycle_histograms():
+    profiler = CycleProfiler()
+    profiler.start_cycle()
+    with profiler.span('causal_analysis'):
+        time.sleep(0.01)
+    for symbol in ('BTC', 'ETH'):
+        with profiler.span('symbol_analysis', symbol):
+            pass
+    with pytest.raises(ValueError):
+        with profiler.span('alert_processing'):
+            raise ValueError('stage failed')
+    duration = profiler.end_cycle()
+
+    spans = profiler.last_cycle['spans']
+    assert [s['stage'] for s in spans] == ['causal_analysis', 'symbol_analysis', 'symbol_analysis', 'alert_processing']
+    offsets = [s['offset'] for s in spans]
+    assert offsets == sorted(offsets) and offsets[1] >= 0.01
+    assert spans[0]['duration'] >= 0.01 and duration >= spans[0]['duration']
+
+    report = profiler.get_report()
+    assert set(report['stages']) == {'causal_analysis', 'symbol_analysis', 'alert_processing'}
+    # A failing stage is still timed
+    assert report['stages']['alert_processing']['count'] == 1
+    assert set(report['symbols']['symbol_analysis']) == {'BTC', 'ETH'}
+    assert report['cycle']['count'] == 1
+    assert profiler.last_cycle_totals()['causal_analysis'] >= 0.01
+
+
+def test_slowest_cycle_keeps_profile_and_reports_scope():
+    profiler = CycleProfiler(profiling_enabled=True, backend='cprofile', top_functions=5)
+    for pause in (0.02, 0.0):
+        profiler.start_cycle()
+        with profiler.span('stage'):
+            time.sleep(pause)
+        profiler.end_cycle()
+
+    slowest = profiler.slowest_cycle
+    assert slowest['duration'] >= 0.02
+    assert slowest['profile']['backend'] == 'cprofile'
+    assert slowest['profile']['scope'] == 'event_loop_thread'
+    assert 'sleep' in slowest['profile']['report']
+
+    report = profiler.get_report(include_profile=False)
+    assert 'profile' not in report['slowest_cycle']
+    assert report['profiling']['scope'] == 'event_loop_thread'
+
+    profiler.set_profiling(False)
+    assert profiler.slowest_cycle is None
+    profiler.start_cycle()
+    profiler.end_cycle()
+    assert 'profile' not in profiler.slowest_cycle
+
+
+def test_profile_route_toggles_capture_and_strips_report():
+    app_module = pytest.importorskip('app')
+    profiler = CycleProfiler()
+    profiler.start_cycle()
+    with profiler.span('stage'):
+        pass
+    profiler.end_cycle()
+
+    original = getattr(app_module.platform, 'advanced_orchestrator', None)
+    app_module.platform.advanced_orchestrator = SimpleNamespace(profiler=profiler)
+    try:
+        client = app_module.app.test_client()
+        response = client.post('/api/analysis/profile', json={'enabled': True, 'backend': 'cprofile'})
+        assert response.status_code == 200
+        assert profiler.profiling_enabled and response.get_json()['profiling']['enabled']
+
+        report = client.get('/api/analysis/profile?include_profile=false').get_json()
+        assert report['stages']['stage']['count'] == 1
+    finally:
+        app_module.platform.advanced_orchestrator = original
+
+
+if __name__ == "__main__":
+    test_histogram_percentiles_over_rolling_window()
+    test_spans_feed_stage_symbol_and_cycle_histograms()
+    test_slowest_cycle_keeps_profile_and_reports_scope()
+    test_profile_route_toggles_capture_and_strips_report()
+    print("All cycle profiler tests passed")
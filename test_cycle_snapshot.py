@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test the analysis cycle snapshot store
+"""
+
+from utils.cycle_snapshot import CycleSnapshotStore, etag_matches
+
+
+def test_publish_tracks_age_and_content_etag():
+    store = CycleSnapshotStore()
+    assert store.latest() is None and store.metadata()['etag'] is None
+
+    first = store.publish({'analysis_results': {'BTC': 1}, 'cycle_timestamp': 't1'}, completed_at=1000.0)
+    assert first['cycle_number'] == 1
+    assert store.age_seconds(now=1030.0) == 30.0
+
+    same = store.publish({'cycle_timestamp': 't1', 'analysis_results': {'BTC': 1}}, completed_at=1060.0)
+    assert same['etag'] == first['etag']
+
+    changed = store.publish({'analysis_results': {'BTC': 2}, 'cycle_timestamp': 't2'}, completed_at=1090.0)
+    assert changed['etag'] != first['etag'] and changed['cycle_number'] == 3
+
+
+def test_failed_cycle_keeps_previous_snapshot():
+    store = CycleSnapshotStore()
+    good = store.publish({'analysis_results': {}}, completed_at=1000.0)
+    store.publish({'error': 'feed down', 'system_status': {'operational': False}})
+
+    assert store.latest() is good
+    meta = store.metadata()
+    assert meta['failed_cycles'] == 1 and meta['last_error'] == 'feed down'
+    assert meta['cycle_number'] == 1
+
+
+def test_if_none_match_compares_whole_tags():
+    etag = '"3f2a9c"'
+    assert etag_matches('"3f2a9c"', etag)
+    assert etag_matches('W/"3f2a9c"', etag)
+    assert etag_matches('"aaaa", W/"3f2a9c" ,"bbbb"', etag)
+    assert etag_matches('*', etag)
+    # A tag that merely contains or is contained in ours is a different version
+    assert not etag_matches('"3f2a9c00"', etag)
+    assert not etag_matches('"3f2a"', etag)
+    assert not etag_matches('"a3f2a9c", "b"', etag)
+    assert not etag_matches('', etag) and not etag_matches(None, etag)
+
+
+if __name__ == "__main__":
+    test_publish_tracks_age_and_content_etag()
+    test_failed_cycle_keeps_previous_snapshot()
+    test_if_none_match_compares_whole_tags()
+    print("All cycle snapshot tests passed")
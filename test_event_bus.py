@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test the bounded async event bus
+"""
+
+import asyncio
+
+from utils.event_bus import EventBus
+
+
+def test_slow_action_stage_does_not_delay_upstream():
+    async def scenario():
+        bus = EventBus()
+        scored, alerted = [], []
+
+        async def score(item):
+            scored.append(item)
+            await bus.publish('alert', item)
+
+        async def alert(item):
+            await asyncio.sleep(0.05)  # a slow Telegram call
+            alerted.append(item)
+
+        bus.add_stage('score', score, workers=1, maxsize=10)
+        bus.add_stage('alert', alert, workers=2, maxsize=4, overflow='drop_oldest')
+        bus.start()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for i in range(20):
+            await bus.publish('score', i)
+        while len(scored) < 20:
+            await asyncio.sleep(0)
+        scoring_time = loop.time() - started
+
+        await bus.join()
+        metrics = bus.get_metrics()['stages']
+        await bus.stop()
+        return scoring_time, scored, alerted, metrics
+
+    scoring_time, scored, alerted, metrics = asyncio.run(scenario())
+
+    # Scoring finished long before the alerts could have been sent serially (20 x 50ms)
+    assert scored == list(range(20))
+    assert scoring_time < 0.05
+    assert metrics['alert']['dropped'] > 0
+    assert metrics['alert']['processed'] == len(alerted) == 20 - metrics['alert']['dropped']
+    assert 19 in alerted
+    assert metrics['alert']['max_depth'] <= 4
+    assert metrics['score']['processed'] == 20 and metrics['score']['errors'] == 0
+
+
+def test_blocking_stage_applies_backpressure_and_survives_errors():
+    async def scenario():
+        bus = EventBus({'event_bus': {'stages': {'decode': {'maxsize': 2}}}})
+        release = asyncio.Event()
+        handled = []
+
+        async def decode(item):
+            await release.wait()
+            if item == 'bad':
+                raise ValueError('malformed batch')
+            handled.append(item)
+
+        bus.add_stage('decode', decode, workers=1, maxsize=50)
+        bus.start()
+        for item in ('a', 'bad', 'b'):
+            await bus.publish('decode', item)
+
+        # One item in the worker and two queued: the next producer has to wait
+        blocked = asyncio.ensure_future(bus.publish('decode', 'c'))
+        await asyncio.sleep(0.01)
+        was_blocked = not blocked.done()
+        assert bus.publish_nowait('decode', 'd') is False
+
+        release.set()
+        await blocked
+        await bus.join()
+        metrics = bus.get_metrics()['stages']['decode']
+        await bus.stop()
+        return was_blocked, handled, metrics
+
+    was_blocked, handled, metrics = asyncio.run(scenario())
+    assert was_blocked
+    assert handled == ['a', 'b', 'c']
+    assert metrics['maxsize'] == 2
+    assert metrics['errors'] == 1 and metrics['processed'] == 3 and metrics['dropped'] == 1
+
+
+def test_stop_drains_queued_items_and_reports_what_it_drops():
+    async def scenario():
+        bus = EventBus()
+        decoded, scored = [], []
+
+        async def decode(item):
+            await asyncio.sleep(0.01)
+            decoded.append(item)
+            await bus.publish('score', item)
+
+        async def score(item):
+            if item == 'stuck':
+                await asyncio.sleep(10)
+            scored.append(item)
+
+        bus.add_stage('decode', decode, workers=1, maxsize=10)
+        bus.add_stage('score', score, workers=1, maxsize=10)
+        bus.start()
+        for i in range(5):
+            await bus.publish('decode', i)
+
+        # Everything queued upstream still reaches the downstream stage before the workers stop
+        assert await bus.drain(1.0) == {}
+        assert decoded == scored == list(range(5))
+
+        await bus.publish('score', 'stuck')
+        await bus.publish('score', 'late')
+        remaining = await bus.drain(0.05)
+        await bus.stop(drain_timeout=0.05)
+        return remaining, bus.get_metrics()
+
+    remaining, metrics = asyncio.run(scenario())
+    assert remaining == {'score': 2}
+    assert metrics['running'] is False
+
+
+if __name__ == "__main__":
+    test_slow_action_stage_does_not_delay_upstream()
+    test_blocking_stage_applies_backpressure_and_survives_errors()
+    test_stop_drains_queued_items_and_reports_what_it_drops()
+    print("All event bus tests passed")
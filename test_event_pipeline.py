@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the batch event normalization stage
+"""
+
+import json
+
+from utils.event_pipeline import EventBatchNormalizer
+
+with open('config.json') as f:
+    CONFIG = json.load(f)
+with open('assets-config.json') as f:
+    ASSETS = json.load(f)
+
+
+def news(event_id, title, source='news', summary=''):
+    return {'id': event_id, 'timestamp': '2025-01-15T12:00:00Z', 'source': source,
+            'payload': {'title': title, 'summary': summary}}
+
+
+def test_dedupes_repeated_headlines_across_scanners_and_batches():
+    pipeline = EventBatchNormalizer(CONFIG, ASSETS)
+    first = pipeline.normalize([
+        news('n1', 'RBI holds rate steady; Reliance rallies'),
+        news('r1', 'rbi holds rate steady: RELIANCE rallies!', source='reddit'),
+        {'id': 't1', 'timestamp': 1736942400, 'source': 'binance',
+         'payload': {'symbol': 'BTCUSDT', 'price': 97000.0, 'volume': 12.5}}
+    ])
+    assert first.received == 3
+    assert first.duplicates == 1
+    assert first.ids == ['n1', 't1']
+
+    second = pipeline.normalize([news('n2', 'RBI holds rate steady, Reliance rallies')])
+    assert len(second) == 0 and second.duplicates == 1
+    assert pipeline.get_stats()['duplicates'] == 2
+
+    # A batch that failed downstream is forgotten so its retry decodes again
+    pipeline.forget(first.hashes)
+    retry = pipeline.normalize([news('n1', 'RBI holds rate steady; Reliance rallies')])
+    assert retry.ids == ['n1']
+
+
+def test_tags_assets_and_event_types():
+    pipeline = EventBatchNormalizer(CONFIG, ASSETS)
+    batch = pipeline.normalize([
+        news('n1', 'Bitcoin whale moves coins as Ethereum funding flips', summary='Institutional block trade seen'),
+        news('n2', 'TCS quarterly results beat earnings guidance'),
+        {'id': 't1', 'timestamp': 1736942400, 'source': 'india_equity',
+         'payload': {'symbol': 'RELIANCE.NS', 'price': 1290.5}}
+    ])
+
+    assert batch.assets[0] == ('BTC', 'ETH')
+    assert batch.event_types[0] == 'flow_spike'
+    assert batch.assets[1] == ('TCS',)
+    assert batch.event_types[1] == 'earnings_surprise'
+    assert batch.kinds[2] == 'market' and batch.assets[2] == ('RELIANCE',)
+    assert [e['id'] for e in batch.for_asset('BTC')] == ['n1']
+    assert batch.market_events() == [batch.raw[2]]
+    assert batch.summary()['event_types'] == {'flow_spike': 1, 'earnings_surprise': 1, 'market_tick': 1}
+
+
+def test_repeated_price_ticks_are_kept_and_redelivered_ticks_dropped():
+    pipeline = EventBatchNormalizer(CONFIG, ASSETS)
+
+    def tick(event_id, ts):
+        return {'id': event_id, 'timestamp': ts, 'source': 'binance',
+                'payload': {'symbol': 'BTCUSDT', 'price': 97000.0, 'volume': 12.5}}
+
+    first = pipeline.normalize([tick('t1', 1736942400), tick('t2', 1736942401), tick('t3', 1736942402)])
+    assert first.ids == ['t1', 't2', 't3'] and first.duplicates == 0
+
+    second = pipeline.normalize([tick('t3', 1736942402), tick('t4', 1736942403)])
+    assert second.ids == ['t4'] and second.duplicates == 1
+
+
+if __name__ == "__main__":
+    test_dedupes_repeated_headlines_across_scanners_and_batches()
+    test_tags_assets_and_event_types()
+    test_repeated_price_ticks_are_kept_and_redelivered_ticks_dropped()
+    print("All event pipeline tests passed")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test the job subsystem
+"""
+
+import asyncio
+import threading
+import time
+
+from utils.async_runtime import AsyncRuntime
+from utils.job_manager import JobManager
+
+CONFIG = {'jobs': {'max_finished_per_class': 3, 'classes': {'backtest': {'workers': 1}, 'analysis': {'timeout': 0.2}}}}
+
+
+def test_progress_results_and_persistence(tmp_path):
+    db = str(tmp_path / 'jobs.db')
+    jobs = JobManager(db, CONFIG)
+
+    def backtest(context):
+        for i in range(1, 5):
+            context.report_progress(i * 25, f"step {i}")
+        return {'asset': context.params['asset'], 'total_pnl': 12.5}
+
+    job = jobs.submit('backtest', backtest, params={'asset': 'BTC'})
+    assert job['status'] in ('queued', 'running') and job['params'] == {'asset': 'BTC'}
+
+    done = jobs.wait(job['id'], timeout=5)
+    assert done['status'] == 'completed' and done['progress'] == 100
+    assert done['result'] == {'asset': 'BTC', 'total_pnl': 12.5}
+    assert done['message'] == 'step 4'
+
+    # A job left running by a crashed process is reported as interrupted after restart
+    blocker, running = threading.Event(), threading.Event()
+    stuck = jobs.submit('backtest', lambda context: running.set() or blocker.wait(5))
+    assert running.wait(2)
+    reopened = JobManager(db, CONFIG)
+    assert reopened.get(job['id'])['result']['total_pnl'] == 12.5
+    assert reopened.get(stuck['id'])['status'] == 'interrupted'
+    blocker.set()
+    jobs.shutdown(wait=True)
+
+
+def test_cancellation_dedupe_and_retention(tmp_path):
+    jobs = JobManager(str(tmp_path / 'jobs.db'), CONFIG)
+    started = threading.Event()
+
+    def long_backtest(context):
+        started.set()
+        while True:
+            context.report_progress(1)
+            time.sleep(0.01)
+
+    running = jobs.submit('backtest', long_backtest)
+    queued = jobs.submit('backtest', long_backtest)
+    assert started.wait(2)
+
+    # The single backtest worker is busy, so the second job is still queued and cancels at once
+    assert jobs.cancel(queued['id'])['status'] == 'cancelled'
+    jobs.cancel(running['id'])
+    assert jobs.wait(running['id'], timeout=2)['status'] == 'cancelled'
+
+    gate = threading.Event()
+    first = jobs.submit('maintenance', lambda context: gate.wait(2), dedupe_key='backup')
+    again = jobs.submit('maintenance', lambda context: None, dedupe_key='backup')
+    assert again['id'] == first['id']
+    gate.set()
+    jobs.wait(first['id'], timeout=2)
+
+    for i in range(5):
+        jobs.wait(jobs.submit('backtest', lambda context, i=i: i)['id'], timeout=2)
+    finished = jobs.list(job_class='backtest')
+    assert len(finished) == 3 and [j['status'] for j in finished] == ['completed'] * 3
+    stats = jobs.get_stats()
+    assert stats['cancelled'] == 2 and stats['deduplicated'] == 1
+    assert stats['classes']['backtest']['workers'] == 1
+    jobs.shutdown()
+
+
+def test_coroutine_jobs_run_on_the_runtime_with_timeout(tmp_path):
+    runtime = AsyncRuntime('jobs-test')
+    jobs = JobManager(str(tmp_path / 'jobs.db'), CONFIG, runtime=runtime)
+
+    async def cycle(context):
+        await asyncio.sleep(0)
+        return {'loop_thread': runtime.in_loop_thread()}
+
+    async def hung(context):
+        await asyncio.sleep(10)
+
+    ok = jobs.wait(jobs.submit('analysis', cycle)['id'], timeout=2)
+    assert ok['status'] == 'completed' and ok['result'] == {'loop_thread': True}
+
+    slow = jobs.wait(jobs.submit('analysis', hung)['id'], timeout=2)
+    assert slow['status'] == 'failed'
+    jobs.shutdown()
+    runtime.stop()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_progress_results_and_persistence, test_cancellation_dedupe_and_retention,
+                 test_coroutine_jobs_run_on_the_runtime_with_timeout):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("All job manager tests passed")
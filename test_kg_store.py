@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test the knowledge graph store: lazy decay, incremental pruning, counters,
+legacy import and group commits
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+
+import pytest
+
+from decoder.kg_store import KnowledgeGraphStore
+
+HOUR = 3600
+CONFIG = {'decay_settings': {'half_life_hours': 1, 'prune_threshold': 0.1}, 'max_graph_size': 100}
+
+
+def make_store(directory, config=CONFIG):
+    return KnowledgeGraphStore(os.path.join(directory, 'kg.db'), config)
+
+
+def test_decay_is_computed_at_read_time_and_reinforcement_folds_it_in():
+    with tempfile.TemporaryDirectory() as directory:
+        kg = make_store(directory)
+        now = 1_700_000_000.0
+        kg.add_edge('fed', 'BTC', 'impacts', 1.0, now=now)
+
+        assert kg.decayed(1.0, now, now + HOUR) == 0.5
+        weight = kg.add_edge('fed', 'BTC', 'impacts', 1.0, now=now + HOUR)
+        assert weight == 1.5
+        assert kg.get_stats()['total_edges'] == 1
+        assert kg.get_stats()['edges_reinforced'] == 1
+        kg.close()
+
+
+def test_prune_only_touches_expired_edges_in_batches():
+    with tempfile.TemporaryDirectory() as directory:
+        kg = make_store(directory)
+        now = time.time()
+        for i in range(10):
+            kg.add_edge('news', f'weak{i}', 'mentions', 0.2, now=now)
+        kg.add_edge('news', 'strong', 'mentions', 10.0, now=now)
+
+        # 0.2 -> 0.1 after one half-life; 10.0 survives ~6.6 half-lives
+        first = kg.decay_and_prune(now=now + 2 * HOUR, batch_size=4)
+        assert first == {'pruned': 4, 'more_pending': True}
+        kg.decay_and_prune(now=now + 2 * HOUR)
+        assert kg.get_stats()['total_edges'] == 1
+        assert kg.get_stats()['edges_pruned'] == 10
+        assert kg.decay_and_prune(now=now + 2 * HOUR)['pruned'] == 0
+        kg.close()
+
+        reopened = make_store(directory)
+        assert reopened.get_stats()['total_nodes'] == 12
+        assert reopened.get_stats()['total_edges'] == 1
+        assert [e['node'] for e in reopened.neighbors('news', min_weight=0)] == ['strong']
+        reopened.close()
+
+
+def test_max_graph_size_evicts_weakest_edges():
+    with tempfile.TemporaryDirectory() as directory:
+        kg = make_store(directory, {**CONFIG, 'max_graph_size': 3})
+        for i, weight in enumerate([5.0, 0.5, 3.0, 1.0]):
+            kg.add_edge('hub', f'n{i}', 'related', weight)
+
+        assert kg.get_stats()['total_edges'] == 3
+        assert kg.get_stats()['edges_evicted'] == 1
+        assert kg.edge_weight('hub', 'n1') == 0.0
+        assert [e['node'] for e in kg.neighbors('hub')] == ['n0', 'n2', 'n3']
+        kg.close()
+
+
+def test_legacy_tables_are_renamed_and_imported():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'kg.db')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE kg_nodes (id INTEGER PRIMARY KEY, name TEXT, type TEXT, attributes TEXT)')
+        conn.execute('CREATE TABLE kg_edges (source INTEGER, target INTEGER, rel TEXT, weight REAL, timestamp TEXT)')
+        conn.executemany('INSERT INTO kg_nodes VALUES (?, ?, ?, ?)', [
+            (1, 'fed', 'institution', '{"country": "US"}'), (2, 'BTC', 'asset', None), (3, 'ETH', 'asset', None)
+        ])
+        recent = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(time.time() - 60)) + 'Z'
+        conn.executemany('INSERT INTO kg_edges VALUES (?, ?, ?, ?, ?)', [
+            (1, 2, 'impacts', 2.0, recent), (2, 3, None, 1.0, recent)
+        ])
+        conn.commit()
+        conn.close()
+
+        kg = KnowledgeGraphStore(path, CONFIG)
+        assert kg.get_stats()['total_nodes'] == 3 and kg.get_stats()['total_edges'] == 2
+        assert 1.9 < kg.edge_weight('fed', 'BTC', 'impacts') <= 2.0
+        assert [e['node'] for e in kg.neighbors('BTC', relation='related')] == ['ETH']
+        kg.close()
+
+        # Originals are kept; reopening does not import twice
+        reopened = KnowledgeGraphStore(path, CONFIG)
+        assert reopened.get_stats()['total_edges'] == 2
+        assert reopened.conn.execute('SELECT COUNT(*) FROM kg_edges_legacy').fetchone()[0] == 2
+        reopened.close()
+
+
+def test_linking_pass_commits_once():
+    with tempfile.TemporaryDirectory() as directory:
+        kg = make_store(directory, {**CONFIG, 'commit_every': 1000, 'commit_interval_seconds': 3600})
+        with kg.batch():
+            for i in range(50):
+                kg.add_edge('news:1', f'asset{i}', 'mentions', 1.0)
+        assert kg.get_stats()['commits'] == 1 and kg.get_stats()['pending_writes'] == 0
+
+        # Loose writes are group-committed on flush
+        kg.add_edge('news:2', 'BTC', 'mentions')
+        kg.add_edge('news:2', 'ETH', 'mentions')
+        assert kg.get_stats()['commits'] == 1
+        kg.flush()
+        assert kg.get_stats()['commits'] == 2
+
+        # A failing pass leaves nothing behind
+        with pytest.raises(RuntimeError):
+            with kg.batch():
+                kg.add_edge('news:3', 'SOL', 'mentions')
+                raise RuntimeError('linker failed')
+        assert kg.edge_weight('news:3', 'SOL', 'mentions') == 0.0
+        assert kg.get_stats()['total_edges'] == 52
+        kg.close()
+
+
+def test_store_accepts_the_legacy_kg_call_pattern():
+    with tempfile.TemporaryDirectory() as directory:
+        kg = make_store(directory)
+        # Positional calls as the previous KG accepted them
+        kg.add_node('news:42', 'event', {'title': 'Fed cuts rates'})
+        kg.add_edge('news:42', 'BTC', 'mentions', 0.8)
+        assert kg.neighbors('news:42')[0]['node'] == 'BTC'
+        assert set(kg.get_stats()) >= {'total_nodes', 'total_edges'}
+        assert 'pruned' in kg.decay_and_prune()
+        kg.close()
+
+
+def test_auto_linker_writes_through_the_store():
+    knowledge_graph = pytest.importorskip('decoder.knowledge_graph')
+    with tempfile.TemporaryDirectory() as directory:
+        kg = make_store(directory)
+        linker = knowledge_graph.AutoLinker(kg)
+        with kg.batch():
+            assert linker is not None
+        assert kg.get_stats()['pending_writes'] == 0
+        kg.close()
+
+
+if __name__ == "__main__":
+    test_decay_is_computed_at_read_time_and_reinforcement_folds_it_in()
+    test_prune_only_touches_expired_edges_in_batches()
+    test_max_graph_size_evicts_weakest_edges()
+    test_legacy_tables_are_renamed_and_imported()
+    test_linking_pass_commits_once()
+    test_store_accepts_the_legacy_kg_call_pattern()
+    test_auto_linker_writes_through_the_store()
+    print("All knowledge graph store tests passed")
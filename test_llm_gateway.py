@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test LLM gateway batching, caching and budget governor against the local stub server
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from openai import OpenAI
+
+from decoder.llm_gateway import LLMGateway
+from utils.llm_stub_server import StubLLMServer
+
+CONFIG = {
+    'ai': {'openai_model': 'stub', 'cost_limit_daily_usd': 10.0,
+           'gateway': {'batch_window_ms': 20, 'usd_per_1k_tokens': 0.01}},
+    'ai_strategist_features': {'event_normalization': {'event_types': {
+        'policy_signal': ['fed', 'rate'],
+        'earnings_surprise': ['earnings', 'profit']
+    }}}
+}
+
+
+def make_gateway(stub, config=CONFIG):
+    client = OpenAI(base_url=stub.url, api_key='stub', max_retries=0)
+    return LLMGateway(SimpleNamespace(client=client), config)
+
+
+def test_repeated_headlines_cost_one_round_trip():
+    stub = StubLLMServer().start()
+    try:
+        gateway = make_gateway(stub)
+
+        async def run():
+            concurrent = await asyncio.gather(
+                gateway.type_event('Fed raises rates', 'By 0.25%'),
+                gateway.type_event('FED raises rates!', 'by 0.25%'),
+                gateway.type_event('Acme beats earnings', 'Profit up')
+            )
+            later = await gateway.type_event('Fed  raises rates', 'By 0.25%')
+            return concurrent, later
+
+        concurrent, later = asyncio.run(run())
+        assert len(stub.requests) == 1
+        assert concurrent[0] == concurrent[1] == later
+        assert concurrent[0]['source'] == 'llm_batch'
+        assert stub.requests[0]['messages'][-1]['content'].count('\n') == 1
+
+        stats = gateway.get_stats()
+        assert stats['upstream_calls'] == 1
+        assert stats['coalesced'] == 1
+        assert stats['cache_hits'] == 1
+        assert stats['budget']['tokens_used'] == 20
+    finally:
+        stub.stop()
+
+
+def test_exhausted_budget_uses_keyword_fallback():
+    stub = StubLLMServer().start()
+    try:
+        config = {**CONFIG, 'ai': {**CONFIG['ai'], 'cost_limit_daily_usd': 0.0}}
+        gateway = make_gateway(stub, config)
+
+        result = asyncio.run(gateway.type_event('Acme beats earnings', 'Profit up'))
+        assert stub.requests == []
+        assert result['event_type'] == 'earnings_surprise'
+        assert result['source'] == 'keyword_fallback'
+        assert gateway.get_stats()['budget_denials'] == 1
+    finally:
+        stub.stop()
+
+
+def test_timed_out_batch_is_charged_and_its_task_is_tracked():
+    stub = StubLLMServer(delay_seconds=0.5).start()
+    try:
+        config = {**CONFIG, 'ai': {**CONFIG['ai'], 'gateway': {**CONFIG['ai']['gateway'],
+                                                                'request_timeout_seconds': 0.1}}}
+        gateway = make_gateway(stub, config)
+
+        async def run():
+            pending = asyncio.ensure_future(gateway.type_event('Fed raises rates', 'By 0.25%'))
+            await asyncio.sleep(0.05)
+            tracked = len(gateway.batch_tasks)
+            result = await pending
+            await gateway.drain()
+            return tracked, result
+
+        tracked, result = asyncio.run(run())
+        assert tracked == 1 and not gateway.batch_tasks
+        assert result['source'] == 'keyword_fallback'
+        stats = gateway.get_stats()
+        assert stats['timeouts'] == 1
+        # Prompt tokens are billed even though no usage came back
+        assert stats['budget']['tokens_used'] > 20
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    test_repeated_headlines_cost_one_round_trip()
+    test_exhausted_budget_uses_keyword_fallback()
+    test_timed_out_batch_is_charged_and_its_task_is_tracked()
+    print("All LLM gateway tests passed")
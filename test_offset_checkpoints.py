@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test scanner offset checkpoints
+"""
+
+import asyncio
+
+from utils.offset_checkpoints import OffsetCheckpointStore
+from utils.scan_scheduler import ScanScheduler
+
+
+def test_batched_flushes_survive_reopen(tmp_path):
+    db = str(tmp_path / 'checkpoints.db')
+    store = OffsetCheckpointStore(db, {'checkpoints': {'flush_interval_seconds': 60, 'flush_every': 3}})
+
+    store.record('reddit', 't3_abc', events=5)
+    store.record('binance', 1718000000123, events=2)
+    # Staged offsets are visible before they are committed
+    assert store.get('reddit') == 't3_abc'
+    assert OffsetCheckpointStore(db).load() == {}
+
+    store.record('reddit', 't3_def', events=1)
+    assert store.stats['flushes'] == 1 and store.get_stats()['pending'] == 0
+
+    # A crash now (no close) loses nothing that was flushed
+    reopened = OffsetCheckpointStore(db)
+    assert reopened.load() == {'reddit': 't3_def', 'binance': 1718000000123}
+    assert reopened.get_stats()['sources']['reddit']['events'] == 6
+
+    store.record('news', '2024-06-10T08:00:00Z')
+    store.close()
+    assert OffsetCheckpointStore(db).get('news') == '2024-06-10T08:00:00Z'
+
+
+def test_offsets_advance_only_past_decoded_batches(tmp_path):
+    store = OffsetCheckpointStore(str(tmp_path / 'checkpoints.db'), {'checkpoints': {'flush_interval_seconds': 0}})
+
+    first = store.track('binance', 100)
+    second = store.track('binance', 200)
+    # Out-of-order completion does not skip the earlier, still undecoded batch
+    store.complete(second, events=4)
+    assert store.load() == {}
+    store.complete(first, events=3)
+    assert store.load() == {'binance': 200}
+    assert store.get_stats()['sources']['binance']['events'] == 7
+
+    # A dead-lettered batch is kept for inspection and no longer pins the checkpoint
+    store.complete(store.track('reddit', 't3_a'), events=1)
+    failed = store.track('reddit', 't3_b')
+    later = store.track('reddit', 't3_c')
+    store.complete(later, events=2)
+    assert store.load()['reddit'] == 't3_a'
+    store.dead_letter(failed, [{'id': 'b1'}], reason='not decoded')
+    assert store.load()['reddit'] == 't3_c'
+    letters = store.dead_letters('reddit')
+    assert [(d['offset'], d['reason'], d['events']) for d in letters] == [('t3_b', 'not decoded', [{'id': 'b1'}])]
+    assert store.get_stats()['dead_letter_rows'] == 1 and store.get_stats()['sources']['reddit']['events'] == 3
+
+
+def test_last_completion_is_flushed_on_the_timer(tmp_path):
+    db = str(tmp_path / 'checkpoints.db')
+    store = OffsetCheckpointStore(db, {'checkpoints': {'flush_interval_seconds': 60, 'flush_every': 100}})
+    store.complete(store.track('news', '2024-06-10T08:00:00Z'), events=3)
+    assert store.flush_due() == 0 and OffsetCheckpointStore(db).load() == {}
+
+    # No later record arrives; the timer commits the staged offset on its own
+    store.last_flush -= 61
+    assert store.flush_due() == 1
+    assert OffsetCheckpointStore(db).load() == {'news': '2024-06-10T08:00:00Z'}
+
+
+def test_scheduler_checkpoints_once_batches_are_consumed(tmp_path):
+    store = OffsetCheckpointStore(str(tmp_path / 'checkpoints.db'), {'checkpoints': {'flush_interval_seconds': 0}})
+    config = {'scanners': {'schedules': {'feed': {'interval': 0.01, 'jitter': 0},
+                                         'broken': {'interval': 0.01, 'jitter': 0}}}}
+    cursor = {'value': 0}
+
+    async def feed():
+        cursor['value'] += 1
+        return [{'id': cursor['value']}]
+
+    async def broken():
+        raise RuntimeError('timeout')
+
+    async def scenario():
+        scheduler = ScanScheduler(config, checkpoints=store)
+        scheduler.add_source('feed', feed, offset=lambda: cursor['value'])
+        scheduler.add_source('broken', broken, offset=lambda: 'never')
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        # Scanned but not yet decoded: nothing is checkpointed
+        assert store.load() == {}
+
+        source, events, token = await scheduler.next_batch(timeout=1)
+        store.complete(token, len(events))
+        await scheduler.stop()
+        return events[0]['id']
+
+    decoded = asyncio.run(scenario())
+    # Only the consumed batch counts, and failed scans never advance a checkpoint
+    assert store.load() == {'feed': decoded}
+    assert store.get_stats()['inflight_batches'] == cursor['value'] - decoded
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_batched_flushes_survive_reopen, test_offsets_advance_only_past_decoded_batches,
+                 test_last_completion_is_flushed_on_the_timer, test_scheduler_checkpoints_once_batches_are_consumed):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("All offset checkpoint tests passed")
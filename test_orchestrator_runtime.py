@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test orchestrator runtime helpers: stage cache, cycle budget runner and feature scheduler
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+from utils.stage_cache import StageCache, fingerprint, table_watermark
+from utils.cycle_budget import CycleBudgetRunner
+from utils.feature_scheduler import FeatureScheduler, parse_cadence
+
+
+def test_stage_cache_reuses_output_until_inputs_change():
+    cache = StageCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {'value': len(calls)}
+
+    async def run():
+        first = await cache.get_or_compute('portfolio', {'last_bar': 1}, compute)
+        second = await cache.get_or_compute('portfolio', {'last_bar': 1}, compute)
+        third = await cache.get_or_compute('portfolio', {'last_bar': 2}, compute)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first == second == {'value': 1}
+    assert third == {'value': 2}
+    assert cache.get_stats()['stages']['portfolio'] == {'hits': 1, 'misses': 2}
+
+
+def test_stage_cache_expires_each_stage_after_its_ttl():
+    cache = StageCache(max_age_seconds=300, ttl_seconds={'multi_timeframe': 60})
+    inputs = {'symbols': ['BTC'], 'config_version': 'v1'}
+    cache.store('multi_timeframe:BTC', 'fp', {'trend': 'up'})
+    cache.store('correlation_matrix', 'fp', {'matrix': []})
+
+    assert cache.ttl_for('multi_timeframe:BTC') == 60 and cache.ttl_for('correlation_matrix') == 300
+    for entry in cache.entries.values():
+        entry['stored_at'] -= 120
+    # Same arguments, but the per-symbol stage has outlived its TTL
+    assert cache.lookup('multi_timeframe:BTC', 'fp') is None
+    assert cache.lookup('correlation_matrix', 'fp') == {'matrix': []}
+
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {'trend': 'down'}
+
+    assert asyncio.run(cache.get_or_compute('multi_timeframe:ETH', inputs, compute)) == {'trend': 'down'}
+    assert asyncio.run(cache.get_or_compute('multi_timeframe:ETH', inputs, compute)) == {'trend': 'down'}
+    assert calls == [1]
+
+
+def test_table_watermark_changes_only_when_rows_do():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'patterns.db')
+        assert table_watermark(db_path, 'news_articles') is None
+
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE news_articles (id INTEGER PRIMARY KEY, title TEXT)')
+        conn.commit()
+        empty = table_watermark(db_path, 'news_articles')
+        conn.executemany('INSERT INTO news_articles (title) VALUES (?)', [('Fed holds',), ('CPI cools',)])
+        conn.commit()
+        first = table_watermark(db_path, 'news_articles')
+        # Pruning an old row and adding a new one keeps the count but moves the max rowid
+        conn.execute('DELETE FROM news_articles WHERE id = 1')
+        conn.execute("INSERT INTO news_articles (title) VALUES ('Fed cuts')")
+        conn.commit()
+        conn.close()
+
+        second = table_watermark(db_path, 'news_articles')
+        assert empty == [0, None] and first == [2, 2] and second == [2, 3]
+        assert table_watermark(db_path, 'news_articles') == second
+        assert fingerprint({'sentiment_rows': first}) != fingerprint({'sentiment_rows': second})
+
+
+def test_budget_overrun_serves_stale_result_and_demotes():
+    runner = CycleBudgetRunner(total_seconds=5, default_stage_seconds=0.05, demote_after_overruns=2)
+    slow = {'enabled': False}
+
+    async def stage():
+        if slow['enabled']:
+            await asyncio.sleep(1)
+        return {'forecast': 42}
+
+    async def cycle():
+        runner.start_cycle()
+        return await runner.run('forecasting', stage)
+
+    assert asyncio.run(cycle()) == {'forecast': 42}
+
+    slow['enabled'] = True
+    stale = asyncio.run(cycle())
+    assert stale['forecast'] == 42
+    assert stale['stale'] is True
+    assert stale['stale_reason'] == 'timeout'
+
+    asyncio.run(cycle())
+    assert runner.records['forecasting'].interval == 2
+
+
+def test_exhausted_cycle_budget_skips_stage():
+    runner = CycleBudgetRunner(total_seconds=0)
+
+    async def stage():
+        return {'ok': True}
+
+    async def cycle():
+        runner.start_cycle()
+        return await runner.run('correlation_matrix', stage)
+
+    result = asyncio.run(cycle())
+    assert result['stale'] is True
+    assert result['stale_reason'] == 'cycle_budget_exhausted'
+
+
+def test_feature_scheduler_runs_only_when_due():
+    assert parse_cadence('5m') == 300
+    assert parse_cadence('hourly') == 3600
+    assert parse_cadence('tick') == 0
+
+    scheduler = FeatureScheduler({'user_acquisition': 'daily', 'signals': 'tick'})
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {'success': True, 'runs': len(calls)}
+
+    async def run(name):
+        return await scheduler.run_if_due(name, compute)
+
+    assert asyncio.run(run('user_acquisition')) == {'success': True, 'runs': 1}
+    reused = asyncio.run(run('user_acquisition'))
+    assert reused['runs'] == 1
+    assert reused['schedule']['cadence'] == 'daily'
+
+    asyncio.run(run('signals'))
+    asyncio.run(run('signals'))
+    assert len(calls) == 3
+
+
+def test_budget_timeout_under_a_cadence_stays_due():
+    runner = CycleBudgetRunner(total_seconds=5, default_stage_seconds=0.05)
+    scheduler = FeatureScheduler({'phase5_advanced': '5m'})
+    slow = {'enabled': True}
+    calls = []
+
+    async def stage():
+        calls.append(1)
+        if slow['enabled']:
+            await asyncio.sleep(1)
+        return {'success': True, 'runs': len(calls)}
+
+    async def cycle():
+        runner.start_cycle()
+        return await scheduler.run_if_due('phase5_advanced', lambda: runner.run('phase5_advanced', stage))
+
+    # A timeout with no previous result is a failure placeholder, never cached as fresh
+    placeholder = asyncio.run(cycle())
+    assert placeholder['success'] is False and placeholder['stale'] is True
+    assert scheduler.is_due('phase5_advanced')
+
+    slow['enabled'] = False
+    assert asyncio.run(cycle()) == {'success': True, 'runs': 2}
+    assert not scheduler.is_due('phase5_advanced')
+
+    # A stale result served after a timeout does not restart the cadence either
+    scheduler.last_run['phase5_advanced'] -= 301
+    slow['enabled'] = True
+    stale = asyncio.run(cycle())
+    assert stale['stale'] is True and stale['runs'] == 2
+    assert scheduler.is_due('phase5_advanced') and scheduler.run_counts['phase5_advanced'] == 1
+
+
+if __name__ == "__main__":
+    test_stage_cache_reuses_output_until_inputs_change()
+    test_stage_cache_expires_each_stage_after_its_ttl()
+    test_table_watermark_changes_only_when_rows_do()
+    test_budget_overrun_serves_stale_result_and_demotes()
+    test_exhausted_cycle_budget_skips_stage()
+    test_feature_scheduler_runs_only_when_due()
+    test_budget_timeout_under_a_cadence_stays_due()
+    print("All orchestrator runtime tests passed")
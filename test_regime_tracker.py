@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the streaming regime tracker state machine and hysteresis
+"""
+
+import math
+
+from decoder.regime_tracker import RegimeTracker
+
+CONFIG = {'ai_strategist_features': {'regime_detection': {
+    'thresholds': {'vol_low': 0.15, 'vol_high': 0.25},
+    'hysteresis_periods': 2,
+    'streaming': {'period_seconds': 60, 'warmup_ticks': 10, 'trend_fast_span': 5, 'trend_slow_span': 20}
+}}}
+
+START = 1_700_000_000.0
+
+
+def feed(tracker, prices, start, symbol='BTCUSDT', market='binance', step=3600):
+    for i, price in enumerate(prices):
+        tracker.update(market, symbol, price, 10.0, start + i * step)
+    return start + len(prices) * step
+
+
+def test_uptrend_is_published_as_risk_on():
+    tracker = RegimeTracker(CONFIG)
+    feed(tracker, [100 * 1.001 ** i for i in range(60)], START)
+
+    regime = tracker.current('binance')
+    assert regime['trend'] == 'up'
+    assert regime['volatility'] == 'low'
+    assert regime['risk'] == 'risk_on'
+    assert regime['stable'] is True
+    assert tracker.current() is regime
+    assert tracker.snapshot()['markets']['binance'] is regime
+
+
+def test_switch_requires_persistence_across_periods():
+    tracker = RegimeTracker(CONFIG)
+    now = feed(tracker, [100 * 1.001 ** i for i in range(60)], START)
+    base = 100 * 1.001 ** 59
+    transitions = tracker.current('binance')['transitions']
+    version = tracker.version
+
+    # Many ticks within one period cannot flip the regime
+    falling = [base * 0.99 ** (i + 1) for i in range(30)]
+    feed(tracker, falling, now, step=0.5)
+    regime = tracker.current('binance')
+    assert regime['trend'] == 'up'
+    assert regime['pending_regime']['trend'] == 'down'
+    assert regime['stable'] is False
+    assert tracker.version == version
+
+    # The candidate persisting into a second period completes the switch
+    tracker.update('binance', 'BTCUSDT', falling[-1] * 0.99, 10.0, now + 61)
+    regime = tracker.current('binance')
+    assert regime['trend'] == 'down'
+    assert regime['risk'] == 'risk_off'
+    assert regime['transitions'] == transitions + 1
+    assert tracker.version == version + 1
+
+
+def test_market_aggregates_are_running_sums():
+    tracker = RegimeTracker(CONFIG)
+    feed(tracker, [100.0] * 5, START, symbol='A', market='india_equity')
+    feed(tracker, [50 * 1.01 ** i for i in range(5)], START, symbol='B', market='india_equity')
+
+    market = tracker.markets['india_equity']
+    direct = sum(state.metrics()['volatility'] for state in market.symbols.values()) / 2
+    assert math.isclose(market.aggregates()['volatility'], direct, rel_tol=1e-9)
+    assert tracker.current('india_equity')['symbols'] == 2
+    assert tracker.current('missing') == {}
+
+
+if __name__ == "__main__":
+    test_uptrend_is_published_as_risk_on()
+    test_switch_requires_persistence_across_periods()
+    test_market_aggregates_are_running_sums()
+    print("All regime tracker tests passed")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test independent per-scanner schedules
+"""
+
+import asyncio
+
+from utils.scan_scheduler import ScanScheduler
+
+CONFIG = {'scanners': {'queue_size': 3, 'schedules': {
+    'fast': {'interval': 0.01, 'jitter': 0},
+    'slow': {'interval': 0.2, 'jitter': 0},
+    'broken': {'interval': 0.01, 'jitter': 0, 'max_backoff': 0.08},
+    'off': {'enabled': False}
+}}}
+
+
+def test_sources_run_on_their_own_cadence_without_blocking():
+    async def scenario():
+        scheduler = ScanScheduler(CONFIG)
+
+        async def fast():
+            return [{'id': 'tick', 'source': 'fast'}]
+
+        async def slow():
+            await asyncio.sleep(0.15)
+            return [{'id': 'post', 'source': 'slow'}]
+
+        async def broken():
+            raise RuntimeError('rate limited')
+
+        scheduler.add_source('fast', fast)
+        scheduler.add_source('slow', slow)
+        scheduler.add_source('broken', broken)
+        assert scheduler.add_source('off', fast) is None
+
+        scheduler.start()
+        seen = []
+        deadline = asyncio.get_running_loop().time() + 0.5
+        while asyncio.get_running_loop().time() < deadline:
+            batch = await scheduler.next_batch(timeout=0.05)
+            if batch:
+                seen.append(batch[0])
+        await scheduler.stop()
+        return scheduler, seen
+
+    scheduler, seen = asyncio.run(scenario())
+    status = scheduler.get_status()['sources']
+
+    # The slow scanner never held back the fast one
+    assert status['fast']['runs'] > 5 * status['slow']['runs'] >= 5
+    assert 'slow' in seen and seen.count('fast') > seen.count('slow')
+
+    # Failures back off exponentially instead of retrying every 10ms
+    assert status['broken']['errors'] == status['broken']['runs'] < 12
+    assert status['broken']['last_error'] == 'rate limited'
+
+
+def test_full_queue_applies_backpressure_or_sheds_oldest_batch():
+    async def scenario(overflow):
+        scheduler = ScanScheduler({'scanners': {**CONFIG['scanners'], 'overflow': overflow}})
+        scheduler.queue = asyncio.Queue(maxsize=scheduler.queue_size)
+        for i in range(3):
+            await scheduler.publish('fast', [{'id': i}])
+        blocked = asyncio.ensure_future(scheduler.publish('fast', [{'id': 3}]))
+        await asyncio.sleep(0.01)
+        waiting = not blocked.done()
+        ids = []
+        while (batch := await scheduler.next_batch(timeout=0.05)) is not None:
+            ids.append(batch[1][0]['id'])
+        await blocked
+        return scheduler, waiting, ids
+
+    scheduler, waiting, ids = asyncio.run(scenario('block'))
+    # A full queue makes the scanner wait; nothing collected is lost
+    assert waiting and ids == [0, 1, 2, 3] and scheduler.dropped_batches == 0
+
+    scheduler, waiting, ids = asyncio.run(scenario('drop_oldest'))
+    assert not waiting and ids == [1, 2, 3]
+    assert scheduler.dropped_batches == 1
+
+
+if __name__ == "__main__":
+    test_sources_run_on_their_own_cadence_without_blocking()
+    test_full_queue_applies_backpressure_or_sheds_oldest_batch()
+    print("All scan scheduler tests passed")
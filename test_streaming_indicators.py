@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test streaming technical indicators and compiled rule evaluation over their feature matrix
+"""
+
+import math
+
+import numpy as np
+
+from decoder.rule_compiler import compile_rules, feature_columns
+from decoder.streaming_indicators import (
+    EMA, RSI, RollingZScore, VWAP, BollingerBands, StreamingIndicatorEngine
+)
+
+CONFIG = {
+    'signal_engine': {
+        'min_confidence': 0.6,
+        'rules': {
+            'bullish_breakout': {
+                'conditions': ['price_spike', 'volume_confirmation', 'sentiment_positive'],
+                'action': 'BUY',
+                'risk_level': 'medium'
+            }
+        }
+    }
+}
+
+
+def test_ema_matches_recursive_definition():
+    ema = EMA(3)
+    for x in [1.0, 2.0, 3.0]:
+        ema.update(x)
+    # alpha = 0.5: 1 -> 1.5 -> 2.25
+    assert math.isclose(ema.value, 2.25)
+
+
+def test_rsi_all_gains_is_100():
+    rsi = RSI(5)
+    for price in range(1, 10):
+        rsi.update(float(price))
+    assert rsi.value == 100.0
+
+
+def test_zscore_and_bollinger_match_batch_statistics():
+    values = [1.0, 2.0, 4.0, 7.0, 11.0]
+    z = RollingZScore(window=10)
+    for v in values:
+        z.update(v)
+    history = values[:-1]
+    mean = sum(history) / len(history)
+    std = math.sqrt(sum((v - mean) ** 2 for v in history) / (len(history) - 1))
+    assert math.isclose(z.value, (values[-1] - mean) / std)
+
+    bands = BollingerBands(window=3, num_std=2.0)
+    for v in values:
+        bands.update(v)
+    assert math.isclose(bands.middle, (4.0 + 7.0 + 11.0) / 3)
+
+
+def test_vwap_window_drops_old_entries():
+    vwap = VWAP(window=2)
+    vwap.update(10.0, 100.0)
+    vwap.update(20.0, 100.0)
+    vwap.update(30.0, 300.0)
+    assert math.isclose(vwap.value, (20.0 * 100 + 30.0 * 300) / 400)
+
+
+def fired(engine, plan, symbols=None, now=1100.0):
+    """Same steps as AdvancedTradingOrchestrator.evaluate_signal_rules"""
+    universe, columns = engine.feature_columns(symbols)
+    return [s for s in plan.to_signals(universe, columns, now=now)
+            if engine.check_cooldown(s['symbol'], s['rule'], s['timestamp'])]
+
+
+def test_rule_fires_on_spike_with_volume_and_sentiment():
+    plan = compile_rules(CONFIG)
+    engine = StreamingIndicatorEngine(CONFIG)
+    engine.update_sentiment('BTC', 0.8)
+
+    signals = []
+    for i in range(40):
+        price = 100.0 + (0.1 if i % 2 else -0.1)
+        engine.update('BTC', price, volume=1000.0 + (i % 3), timestamp=1000.0 + i)
+        signals += fired(engine, plan, now=1000.0 + i)
+    assert signals == []
+
+    engine.update('BTC', 110.0, volume=50000.0, timestamp=1100.0)
+    signals = fired(engine, plan)
+    assert len(signals) == 1
+    assert signals[0]['action'] == 'BUY'
+    assert signals[0]['confidence'] >= 0.6
+
+    # Cooldown suppresses an immediate re-fire
+    engine.update('BTC', 125.0, volume=90000.0, timestamp=1101.0)
+    assert fired(engine, plan, now=1101.0) == []
+
+
+def test_engine_feature_columns_track_ticks_without_a_snapshot_pivot():
+
+    engine = StreamingIndicatorEngine(CONFIG)
+    engine.settings['cooldown_seconds'] = 0
+    for n, symbol in enumerate(['BTC', 'ETH', 'SOL', 'NEW']):
+        engine.update_sentiment(symbol, 0.8)
+        for i in range(40 if symbol != 'NEW' else 3):
+            engine.update(symbol, 100.0 + n + (0.1 if i % 2 else -0.1), 1000.0 + (i % 3), timestamp=1000.0 + i)
+    engine.update('SOL', 112.0, 60000.0, timestamp=1100.0)
+
+    # Symbols below min_ticks are excluded; the rest match the snapshot pivot column for column
+    symbols, columns = engine.feature_columns()
+    assert symbols == ['BTC', 'ETH', 'SOL']
+    _, pivoted = feature_columns(engine.snapshot(), symbols)
+    for name, values in pivoted.items():
+        assert np.allclose(columns[name], values, equal_nan=True), name
+
+    plan = compile_rules(CONFIG)
+    assert [s['symbol'] for s in plan.to_signals(symbols, columns, now=1100.0)] == ['SOL']
+    assert engine.feature_columns(['ETH', 'MISSING'])[0] == ['ETH']
+
+
+def test_headline_sentiment_fires_rule_on_quoted_market_symbol():
+    import json
+    from utils.event_pipeline import EventBatchNormalizer
+
+    with open('config.json') as f:
+        app_config = json.load(f)
+    with open('assets-config.json') as f:
+        assets = json.load(f)
+    pipeline = EventBatchNormalizer(app_config, assets)
+    engine = StreamingIndicatorEngine(CONFIG)
+    plan = compile_rules(CONFIG)
+
+    def feed(batch):
+        # Same order as TradingPlatform.update_streaming_indicators: ticks, then text sentiment
+        touched = set()
+        for asset, event in batch.market_rows():
+            payload = event['payload']
+            engine.link_symbol(payload['symbol'], asset)
+            engine.update(payload['symbol'], payload['price'], payload['volume'], timestamp=event['timestamp'])
+            touched.add(payload['symbol'])
+        for asset in engine.ingest_sentiment(batch.text_rows()):
+            touched.update(engine.asset_symbols.get(asset, ()))
+        return fired(engine, plan, sorted(touched))
+
+    def tick(i, price, volume):
+        return {'id': f't{i}', 'timestamp': 1000.0 + i, 'source': 'binance',
+                'payload': {'symbol': 'BTCUSDT', 'price': price, 'volume': volume}}
+
+    news = {'id': 'n1', 'timestamp': 1000.0, 'source': 'news',
+            'payload': {'title': 'Bitcoin rally: BTC surges as ETF approval lands'}}
+    quiet = [tick(i, 100.0 + (0.1 if i % 2 else -0.1) + i * 1e-4, 1000.0 + (i % 3)) for i in range(40)]
+    assert feed(pipeline.normalize(quiet)) == []
+
+    # Headline arrives in the same batch as the spike; its sentiment reaches the BTCUSDT tick state
+    signals = feed(pipeline.normalize([news, tick(100, 110.0, 50000.0)]))
+    assert engine.states['BTCUSDT'].sentiment.value > 0.2
+    assert [(s['symbol'], s['rule'], s['action']) for s in signals] == [('BTCUSDT', 'bullish_breakout', 'BUY')]
+
+
+def test_sentiment_before_first_tick_seeds_the_market_symbol():
+    engine = StreamingIndicatorEngine(CONFIG)
+    assert engine.score_sentiment('', {'sentiment_score': 75}) == 0.5
+    assert engine.score_sentiment('Exchange hacked, prices crash', {}) == -1.0
+    assert engine.score_sentiment('Quarterly update posted', {}) is None
+
+    engine.ingest_sentiment([(('ETH',), 'Ethereum upgrade rally', {})])
+    engine.link_symbol('ETHUSDT', 'ETH')
+    assert engine.states['ETHUSDT'].sentiment.value == 1.0
+
+
+def test_bar_and_sentiment_fingerprints_cover_linked_symbols():
+    engine = StreamingIndicatorEngine(CONFIG)
+    assert engine.last_bar_times(['BTC']) == {'BTC': None}
+
+    engine.link_symbol('BTCUSDT', 'BTC')
+    engine.update('BTCUSDT', 100.0, 1.0, timestamp=7200.0)
+    engine.update('BTCUSDT', 101.0, 1.0, timestamp=7300.0)
+    # Ticks inside the same hourly bar leave the fingerprint unchanged
+    assert engine.last_bar_times(['BTC', 'BTCUSDT']) == {'BTC': 7200.0, 'BTCUSDT': 7200.0}
+    engine.update('BTCUSDT', 102.0, 1.0, timestamp=10800.0)
+    assert engine.last_bar_times(['BTC'])['BTC'] == 10800.0
+
+    engine.ingest_sentiment([(('BTC',), 'Bitcoin rally', {})])
+    assert engine.sentiment_counts(['BTC', 'ETH']) == {'BTC': 1, 'ETH': 0}
+
+
+if __name__ == "__main__":
+    test_ema_matches_recursive_definition()
+    test_rsi_all_gains_is_100()
+    test_zscore_and_bollinger_match_batch_statistics()
+    test_vwap_window_drops_old_entries()
+    test_rule_fires_on_spike_with_volume_and_sentiment()
+    test_engine_feature_columns_track_ticks_without_a_snapshot_pivot()
+    test_headline_sentiment_fires_rule_on_quoted_market_symbol()
+    test_sentiment_before_first_tick_seeds_the_market_symbol()
+    test_bar_and_sentiment_fingerprints_cover_linked_symbols()
+    print("All streaming indicator tests passed")
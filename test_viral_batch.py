@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test batched viral scoring
+"""
+
+import asyncio
+import time
+
+from decoder.viral_batch import BatchViralScorer
+
+NOW = 1_736_942_400.0
+
+
+def pattern(i, asset='BTC', source='news', confidence=0.9):
+    return {'id': f'p{i}', 'timestamp': NOW, 'type': 'trading_signal', 'asset': asset,
+            'source': source, 'signals': {'confidence': confidence}}
+
+
+class ScaledScorer:
+    """Stands in for ViralScorer: an async per-pattern compute_score on the 0-100 scale"""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.alerts = []
+
+    async def compute_score(self, pattern):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if pattern['signals']['confidence'] < 0:
+            raise ValueError('bad pattern')
+        score = 100.0 * pattern['signals']['confidence']
+        if score > 70.0:
+            self.alerts.append({'id': pattern['id'], 'score': score})
+        return score
+
+    def get_recent_alerts(self):
+        return self.alerts
+
+    def get_correlations(self):
+        return {'BTC': 1.0}
+
+
+def test_batch_scores_are_the_wrapped_scorers_per_pattern_scores():
+    legacy = ScaledScorer()
+    batch = BatchViralScorer(legacy, alert_threshold=70.0)
+    patterns = [pattern(0, confidence=1.0), pattern(1, confidence=0.75), pattern(2, confidence=-1)]
+
+    scores = asyncio.run(batch.score_batch(patterns))
+    assert legacy.calls == 3
+    assert list(scores) == [100.0, 75.0, 0.0]
+    assert asyncio.run(batch.compute_score(patterns[1])) == 75.0
+
+    stats = batch.get_stats()
+    assert stats['failures'] == 1 and stats['patterns'] == 4
+
+    # Alerts the wrapped scorer records are listed once
+    alerts = batch.get_recent_alerts()
+    assert [a['id'] for a in alerts] == ['p0', 'p1', 'p1']
+    # Non-scoring duties stay with the wrapped scorer
+    assert batch.get_correlations() == {'BTC': 1.0}
+
+
+class SilentScorer:
+    """Scorer without an alert list of its own"""
+
+    async def compute_score(self, pattern):
+        return 100.0 * pattern['signals']['confidence']
+
+
+def test_batch_scorer_keeps_alerts_when_the_wrapped_scorer_does_not():
+    batch = BatchViralScorer(SilentScorer(), alert_threshold=70.0)
+    asyncio.run(batch.score_batch([pattern(0, confidence=0.9), pattern(1, confidence=0.5)]))
+    assert [a['id'] for a in batch.get_recent_alerts()] == ['p0']
+
+
+def test_thousand_pattern_burst_awaits_concurrently():
+    # A serial loop over 1000 scorers that each await 5ms would take 5 seconds
+    legacy = ScaledScorer(delay=0.005)
+    batch = BatchViralScorer(legacy, {'viral_scoring': {'max_concurrency': 1000}})
+    burst = [pattern(i, confidence=(i % 100) / 100) for i in range(1000)]
+
+    started = time.perf_counter()
+    scores = asyncio.run(batch.score_batch(burst))
+    elapsed = time.perf_counter() - started
+
+    assert scores.shape == (1000,) and legacy.calls == 1000
+    assert elapsed < 1.0
+    assert batch.get_stats()['above_threshold'] == int((scores > 70.0).sum())
+
+
+if __name__ == "__main__":
+    test_batch_scores_are_the_wrapped_scorers_per_pattern_scores()
+    test_batch_scorer_keeps_alerts_when_the_wrapped_scorer_does_not()
+    test_thousand_pattern_burst_awaits_concurrently()
+    print("All viral batch tests passed")
@@ -0,0 +1,194 @@
+"""
+Action Dispatcher
+Fans a scored pattern out to its actions concurrently. Each action is its own
+event bus lane with a timeout and priority: trades get a dedicated fast lane
+dispatched first, and alerts go through a fire-and-forget lane that coalesces
+repeats for the same asset and type. Lanes whose work must not be interrupted
+(order placement) are never cancelled on timeout; a timed-out action is kept as
+an unknown outcome until it resolves, and what is still unknown is listed for
+reconciliation
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+ActionHandler = Callable[[Dict, float], Awaitable[None]]
+
+
+def default_coalesce_key(pattern: Dict) -> Tuple:
+    return (pattern.get('asset'), pattern.get('type'))
+
+
+class ActionLane:
+    """Dispatch settings for one action"""
+
+    def __init__(self, name: str, priority: int, coalesce_seconds: float = 0.0,
+                 coalesce_key: Callable[[Dict], Any] = default_coalesce_key):
+        self.name = name
+        self.priority = priority
+        self.coalesce_seconds = coalesce_seconds
+        self.coalesce_key = coalesce_key
+        # key -> [pattern, score, merged count]
+        self.pending: Dict[Any, list] = {}
+        self.first_pending: Optional[float] = None
+        self.dispatched = 0
+        self.coalesced = 0
+
+
+class ActionDispatcher:
+    """Priority-ordered, timeout-bounded action lanes on an EventBus"""
+
+    def __init__(self, bus: EventBus, config: Optional[Dict] = None):
+        self.bus = bus
+        self.action_config: Dict[str, Dict] = (config or {}).get('event_bus', {}).get('actions', {})
+        self.lanes: Dict[str, ActionLane] = {}
+        self.flush_task: Optional[asyncio.Task] = None
+        self.unknown_outcomes: Dict[int, Dict] = {}
+        self.unknown_seq = 0
+        self.resolved_late = 0
+
+    def add_action(self, name: str, handler: ActionHandler, priority: int = 10, timeout: Optional[float] = None,
+                   workers: int = 1, maxsize: int = 100, overflow: str = 'drop_oldest',
+                   coalesce_seconds: float = 0.0, cancel_on_timeout: bool = True) -> ActionLane:
+        """Register an action lane; event_bus.actions.<name> in config overrides priority and coalescing
+
+        With cancel_on_timeout=False the handler runs to completion and a timeout is recorded
+        as an unknown outcome instead of cancelling it mid-flight.
+        """
+        settings = self.action_config.get(name, {})
+
+        async def run(item):
+            pattern, score = item
+            await handler(pattern, score)
+
+        self.bus.add_stage(name, run, workers=workers, maxsize=maxsize, overflow=overflow, timeout=timeout,
+                           shield=not cancel_on_timeout,
+                           on_timeout=lambda item, task: self.record_unknown(name, item, task))
+        lane = ActionLane(
+            name,
+            priority=settings.get('priority', priority),
+            coalesce_seconds=settings.get('coalesce_seconds', coalesce_seconds)
+        )
+        self.lanes[name] = lane
+        return lane
+
+    def record_unknown(self, action: str, item: tuple, task: asyncio.Task):
+        """Track a timed-out action until its handler finishes"""
+        pattern, score = item
+        self.unknown_seq += 1
+        key = self.unknown_seq
+        self.unknown_outcomes[key] = {
+            'action': action,
+            'pattern_id': pattern.get('id'),
+            'asset': pattern.get('asset'),
+            'score': score,
+            'since': time.time()
+        }
+
+        def resolved(done: asyncio.Task):
+            entry = self.unknown_outcomes.pop(key, None)
+            if entry is None:
+                return
+            self.resolved_late += 1
+            outcome = 'cancelled' if done.cancelled() else 'failed' if done.exception() else 'completed'
+            logger.info(f"Late {action} outcome for {entry['asset']}: {outcome} "
+                        f"after {time.time() - entry['since']:.1f}s")
+
+        task.add_done_callback(resolved)
+
+    def get_unknown_outcomes(self) -> List[Dict]:
+        """Timed-out actions still in flight; these need reconciling against the venue"""
+        return list(self.unknown_outcomes.values())
+
+    def start(self):
+        """Start the coalescing flusher; the bus itself is started by its owner"""
+        if self.flush_task is None and any(lane.coalesce_seconds > 0 for lane in self.lanes.values()):
+            self.flush_task = asyncio.get_running_loop().create_task(self.flush_loop())
+
+    async def dispatch(self, pattern: Dict, score: float, actions: Iterable[str]):
+        """Queue the given actions for a pattern, highest priority first, without waiting on any of them"""
+        for lane in sorted((self.lanes[name] for name in actions if name in self.lanes), key=lambda l: l.priority):
+            if lane.coalesce_seconds > 0:
+                self.coalesce(lane, pattern, score)
+            else:
+                await self.bus.publish(lane.name, (pattern, score))
+                lane.dispatched += 1
+
+    def coalesce(self, lane: ActionLane, pattern: Dict, score: float):
+        """Keep only the strongest pattern per key until the lane's window closes"""
+        key = lane.coalesce_key(pattern)
+        entry = lane.pending.get(key)
+        if entry is None:
+            lane.pending[key] = [pattern, score, 1]
+            if lane.first_pending is None:
+                lane.first_pending = time.monotonic()
+            return
+        entry[2] += 1
+        lane.coalesced += 1
+        if score > entry[1]:
+            entry[0], entry[1] = pattern, score
+
+    def flush(self, force: bool = False):
+        now = time.monotonic()
+        for lane in self.lanes.values():
+            if not lane.pending:
+                continue
+            if not force and now - lane.first_pending < lane.coalesce_seconds:
+                continue
+            pending, lane.pending, lane.first_pending = lane.pending, {}, None
+            for pattern, score, merged in pending.values():
+                if merged > 1:
+                    pattern = {**pattern, 'coalesced_count': merged}
+                self.bus.publish_nowait(lane.name, (pattern, score))
+                lane.dispatched += 1
+
+    async def flush_loop(self):
+        interval = min(lane.coalesce_seconds for lane in self.lanes.values() if lane.coalesce_seconds > 0)
+        while True:
+            await asyncio.sleep(interval / 2)
+            self.flush()
+
+    async def stop(self, drain_timeout: float = 0.0) -> Dict[str, int]:
+        """Flush coalesced actions and give the lanes drain_timeout to finish; returns dropped actions per lane
+
+        Call after the upstream stages have drained and before the bus workers stop.
+        """
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            await asyncio.gather(self.flush_task, return_exceptions=True)
+            self.flush_task = None
+
+        shed_before = {name: self.bus.stages[name].dropped for name in self.lanes}
+        self.flush(force=True)
+        unfinished = await self.bus.drain(drain_timeout, self.lanes)
+
+        dropped = {}
+        for name in self.lanes:
+            # Shed by a full drop_oldest lane during the final flush, or still queued when the workers stop
+            count = self.bus.stages[name].dropped - shed_before[name] + unfinished.get(name, 0)
+            if count:
+                dropped[name] = count
+                logger.warning(f"Action lane {name} stopped with {count} actions dropped")
+        for entry in self.unknown_outcomes.values():
+            logger.warning(f"{entry['action']} for {entry['asset']} still has an unknown outcome; reconcile it")
+        return dropped
+
+    def get_stats(self) -> Dict:
+        stages = self.bus.get_metrics()['stages']
+        return {
+            name: {
+                'priority': lane.priority,
+                'dispatched': lane.dispatched,
+                'coalesced': lane.coalesced,
+                'pending': len(lane.pending),
+                'unknown_outcomes': sum(1 for entry in self.unknown_outcomes.values() if entry['action'] == name),
+                **{k: stages[name][k] for k in ('depth', 'processed', 'errors', 'timeouts', 'dropped', 'avg_handler_ms')}
+            }
+            for name, lane in self.lanes.items()
+        }
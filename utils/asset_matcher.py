@@ -0,0 +1,177 @@
+"""
+Asset Matcher
+Compiles every asset regex and synonym from assets-config.json into a
+single alternation regex with one named group per asset, rebuilt whenever the
+config file changes. A whole batch of texts is tagged with one scan over the
+joined batch.
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ASSET_GROUPS = ('crypto', 'indian_equities', 'indices')
+QUOTE_SUFFIXES = ('USDT', 'BUSD', 'USDC', 'USD', '.NS', '.BO', '-USD', '-INR')
+# Joins batch texts; contains no word characters so \b-anchored patterns cannot span it
+SEPARATOR = '\n\x1e\n'
+
+
+def asset_vocabulary(assets_config: Dict) -> Dict[str, List[str]]:
+    """Asset id -> regex branches from patterns and synonyms
+
+    Bare aliases such as LINK or DOT are left to symbol resolution; the curated
+    patterns decide which of them are safe to match in free text.
+    """
+    vocabulary: Dict[str, List[str]] = {}
+    for group in ASSET_GROUPS:
+        for asset, spec in assets_config.get(group, {}).items():
+            vocabulary[asset] = list(spec.get('patterns', []))
+    for synonym, asset in assets_config.get('synonyms', {}).items():
+        if asset in vocabulary and len(synonym) >= 3:
+            vocabulary[asset].append(r'\b' + re.escape(synonym.upper()) + r'\b')
+
+    # Longer alternatives first so multi-word names win over their prefixes
+    return {asset: sorted(set(branches), key=len, reverse=True) for asset, branches in vocabulary.items()}
+
+
+class AssetMatcher:
+    """Combined-regex asset tagger with config reload"""
+
+    def __init__(self, assets_config: Optional[Dict] = None, config_path: Optional[str] = None):
+        self.config_path = config_path
+        self.config_mtime: Optional[float] = None
+        self.builds = 0
+        if assets_config is None and config_path:
+            assets_config = self.read_config()
+        elif config_path and os.path.exists(config_path):
+            # Caller already loaded this file; only later edits should trigger a rebuild
+            self.config_mtime = os.path.getmtime(config_path)
+        self.build(assets_config or {})
+
+    def read_config(self) -> Dict:
+        with open(self.config_path, 'r') as f:
+            assets_config = json.load(f)
+        self.config_mtime = os.path.getmtime(self.config_path)
+        return assets_config
+
+    def build(self, assets_config: Dict):
+        self.vocabulary = asset_vocabulary(assets_config)
+        self.group_assets: Dict[str, str] = {}
+        groups = []
+        for i, (asset, branches) in enumerate(self.vocabulary.items()):
+            if not branches:
+                continue
+            name = f'a{i}'
+            self.group_assets[name] = asset
+            groups.append(f"(?P<{name}>{'|'.join(f'(?:{b})' for b in branches)})")
+        self.regex = re.compile('|'.join(groups)) if groups else None
+
+        self.symbol_aliases: Dict[str, str] = {}
+        for group in ASSET_GROUPS:
+            for asset, spec in assets_config.get(group, {}).items():
+                for alias in [asset, spec.get('symbol', '')] + spec.get('aliases', []):
+                    if alias:
+                        self.symbol_aliases[alias.upper()] = asset
+        for synonym, asset in assets_config.get('synonyms', {}).items():
+            self.symbol_aliases[synonym.upper()] = asset
+
+        self.builds += 1
+        logger.info(f"🔎 Asset matcher compiled for {len(self.group_assets)} assets")
+
+    def refresh(self) -> bool:
+        """Rebuild when the config file changed on disk; returns True if rebuilt"""
+        if not self.config_path:
+            return False
+        try:
+            mtime = os.path.getmtime(self.config_path)
+            if mtime == self.config_mtime:
+                return False
+            self.build(self.read_config())
+            return True
+        except (OSError, ValueError) as e:
+            logger.error(f"Asset matcher reload failed: {e}")
+            return False
+
+    def resolve_symbol(self, symbol: str) -> Optional[str]:
+        """Map an exchange symbol such as BTCUSDT or RELIANCE.NS to its configured asset"""
+        upper = symbol.upper()
+        if upper in self.symbol_aliases:
+            return self.symbol_aliases[upper]
+        for suffix in QUOTE_SUFFIXES:
+            if upper.endswith(suffix) and upper[:-len(suffix)] in self.symbol_aliases:
+                return self.symbol_aliases[upper[:-len(suffix)]]
+        return None
+
+    def tag(self, text: str) -> Tuple[str, ...]:
+        return self.tag_batch([text])[0]
+
+    def tag_batch(self, texts: Sequence[str]) -> List[Tuple[str, ...]]:
+        """Assets mentioned in each text, in order of first mention, from one scan of the batch"""
+        results: List[List[str]] = [[] for _ in texts]
+        if self.regex is None or not texts:
+            return [tuple(r) for r in results]
+
+        joined = SEPARATOR.join(text.upper() for text in texts)
+        starts, offset = [], 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(SEPARATOR)
+
+        for match in self.regex.finditer(joined):
+            row = bisect.bisect_right(starts, match.start()) - 1
+            asset = self.group_assets[match.lastgroup]
+            if asset not in results[row]:
+                results[row].append(asset)
+        return [tuple(r) for r in results]
+
+    def tag_batch_per_pattern(self, texts: Sequence[str]) -> List[Tuple[str, ...]]:
+        """Reference implementation: every pattern searched separately against every text"""
+        results = []
+        for text in texts:
+            upper = text.upper()
+            hits = []
+            for asset, branches in self.vocabulary.items():
+                positions = [m.start() for b in branches for m in [re.search(b, upper)] if m]
+                if positions:
+                    hits.append((min(positions), asset))
+            results.append(tuple(asset for _, asset in sorted(hits)))
+        return results
+
+
+def benchmark(matcher: AssetMatcher, texts: Sequence[str], repeat: int = 3) -> Dict:
+    """Texts per minute for the compiled matcher versus per-pattern matching"""
+    timings = {}
+    for name, fn in (('compiled', matcher.tag_batch), ('per_pattern', matcher.tag_batch_per_pattern)):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(texts)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    return {
+        'texts': len(texts),
+        'compiled_seconds': round(timings['compiled'], 4),
+        'per_pattern_seconds': round(timings['per_pattern'], 4),
+        'compiled_texts_per_minute': int(len(texts) / max(timings['compiled'], 1e-9) * 60),
+        'per_pattern_texts_per_minute': int(len(texts) / max(timings['per_pattern'], 1e-9) * 60),
+        'speedup': round(timings['per_pattern'] / max(timings['compiled'], 1e-9), 1)
+    }
+
+
+if __name__ == "__main__":
+    import random
+
+    logging.basicConfig(level=logging.INFO)
+    matcher = AssetMatcher(config_path='assets-config.json')
+    words = ['market', 'rally', 'falls', 'bitcoin', 'reliance', 'nifty', 'rbi', 'policy', 'ether',
+             'tcs', 'earnings', 'whale', 'sensex', 'hdfc', 'solana', 'the', 'a', 'on', 'after', 'gold']
+    rng = random.Random(42)
+    sample = [' '.join(rng.choice(words) for _ in range(40)) for _ in range(5000)]
+    print(json.dumps(benchmark(matcher, sample), indent=2))
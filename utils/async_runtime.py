@@ -0,0 +1,286 @@
+"""
+Async Runtime
+One long-lived event loop on a dedicated thread. Synchronous code (Flask
+request handlers) submits coroutines to it with timeouts and cancellation
+instead of creating a throwaway loop per request, so every coroutine touching
+platform objects runs on the loop that owns them. Long-running coroutines are
+supervised and restarted on failure, and blocking I/O and CPU work go to
+separate bounded executors so neither can starve the loop or each other
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when a bounded executor's wait queue is full"""
+
+
+class BoundedExecutor:
+    """Thread pool with a bounded wait queue and saturation metrics; used from the runtime loop"""
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn in the pool once a worker is free; rejects when max_queue callers are already waiting"""
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.workers)
+        if self.slots.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturated(f"{self.name} executor saturated ({self.waiting} waiting)")
+
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.pool, functools.partial(fn, *args, **kwargs))
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.busy_seconds += time.perf_counter() - started
+            self.active -= 1
+            self.slots.release()
+
+    def get_metrics(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'active': self.active,
+            'saturation': round(self.active / self.workers, 3) if self.workers else 0.0,
+            'queue_depth': self.waiting,
+            'max_queue': self.max_queue,
+            'max_queue_depth': self.max_waiting,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'busy_seconds': round(self.busy_seconds, 3)
+        }
+
+    def shutdown(self):
+        """Drop queued work; a fresh pool is ready if the owning runtime starts again"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        self.slots = None
+
+
+class AsyncRuntime:
+    """Supervised background event loop thread with thread-safe coroutine submission"""
+
+    def __init__(self, name: str = 'async-runtime', config: Optional[Dict] = None):
+        settings = (config or {}).get('runtime', {})
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'timeouts': 0, 'cancelled': 0, 'loop_starts': 0}
+
+        self.io_executor = BoundedExecutor(f'{name}-io', settings.get('io_workers', 8), settings.get('io_queue', 100))
+        self.cpu_executor = BoundedExecutor(f'{name}-cpu', settings.get('cpu_workers', 2), settings.get('cpu_queue', 50))
+        self.lag_interval = settings.get('lag_check_seconds', 1.0)
+        self.loop_lag_ms = 0.0
+        self.max_loop_lag_ms = 0.0
+
+        self.start_hooks: List[Callable[[], Awaitable[None]]] = []
+        self.stop_hooks: List[Callable[[], Awaitable[None]]] = []
+        self.supervised: Dict[str, Dict] = {}
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive() and self.loop is not None and self.loop.is_running()
+
+    def start(self) -> 'AsyncRuntime':
+        """Start the loop thread if it is not already running"""
+        with self._lock:
+            if self.running:
+                return self
+            self._ready.clear()
+            self.loop = asyncio.new_event_loop()
+            # Stray run_in_executor(None, ...) calls land on the bounded I/O pool, not a hidden default
+            self.loop.set_default_executor(self.io_executor.pool)
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+            self.stats['loop_starts'] += 1
+        self._ready.wait()
+        logger.info(f"🔁 Async runtime {self.name} started")
+        for hook in self.start_hooks:
+            self.spawn(hook(), getattr(hook, '__qualname__', 'start_hook'))
+        return self
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.create_task(self.monitor_lag())
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    async def monitor_lag(self):
+        """Measure how late the loop wakes a sleeping task; sustained lag means blocking work on the loop"""
+        while True:
+            expected = time.perf_counter() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag_ms = max(0.0, (time.perf_counter() - expected) * 1000)
+            self.max_loop_lag_ms = max(self.max_loop_lag_ms, self.loop_lag_ms)
+
+    def on_start(self, hook: Callable[[], Awaitable[None]]):
+        """Register a coroutine function run on the loop each time it starts"""
+        self.start_hooks.append(hook)
+        if self.running:
+            self.spawn(hook(), getattr(hook, '__qualname__', 'start_hook'))
+
+    def on_stop(self, hook: Callable[[], Awaitable[None]]):
+        """Register a coroutine function awaited on the loop before shutdown cancels remaining tasks"""
+        self.stop_hooks.append(hook)
+
+    def supervise(self, name: str, factory: Callable[[], Awaitable[Any]], max_backoff: float = 60.0,
+                  min_backoff: float = 1.0) -> concurrent.futures.Future:
+        """Run factory() on the loop, restarting it with exponential backoff whenever it raises"""
+        state = self.supervised[name] = {'restarts': 0, 'last_error': None, 'running': False}
+
+        async def supervisor():
+            backoff = min_backoff
+            while True:
+                state['running'] = True
+                started = time.monotonic()
+                try:
+                    return await factory()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    state['restarts'] += 1
+                    state['last_error'] = str(e)
+                    # A run that stayed up for a while resets the backoff
+                    if time.monotonic() - started > max_backoff:
+                        backoff = min_backoff
+                    logger.error(f"Supervised task {name} crashed: {e}; restarting in {backoff:.1f}s")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, max_backoff)
+                finally:
+                    state['running'] = False
+
+        return self.spawn(supervisor(), name)
+
+    async def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await blocking I/O (files, sqlite, sync HTTP clients) on the I/O pool"""
+        return await self.io_executor.run(fn, *args, **kwargs)
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await CPU-heavy work on the CPU pool so the loop keeps serving ticks"""
+        return await self.cpu_executor.run(fn, *args, **kwargs)
+
+    def in_loop_thread(self) -> bool:
+        return self.thread is not None and threading.current_thread() is self.thread
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime loop and return a thread-safe future"""
+        self.start()
+        self.stats['submitted'] += 1
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._record)
+        return future
+
+    def _record(self, future: concurrent.futures.Future):
+        if future.cancelled():
+            self.stats['cancelled'] += 1
+        elif future.exception() is not None:
+            self.stats['failed'] += 1
+        else:
+            self.stats['completed'] += 1
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the runtime loop and wait for its result
+
+        Raises TimeoutError after cancelling the coroutine if it does not finish in time.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run called from the runtime loop; await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.stats['timeouts'] += 1
+            raise TimeoutError(f"Coroutine did not finish within {timeout}s")
+
+    def spawn(self, coro: Coroutine, label: Optional[str] = None) -> concurrent.futures.Future:
+        """Fire-and-forget submission; failures are logged"""
+        label = label or getattr(coro, '__qualname__', 'task')
+        future = self.submit(coro)
+
+        def log_failure(done: concurrent.futures.Future):
+            if not done.cancelled() and done.exception() is not None:
+                logger.error(f"Background task {label} failed: {done.exception()}")
+
+        future.add_done_callback(log_failure)
+        return future
+
+    def stop(self, timeout: float = 10.0):
+        """Cancel outstanding tasks, stop the loop and join the thread"""
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self.loop, self.thread
+
+        async def cancel_all():
+            for hook in self.stop_hooks:
+                try:
+                    await hook()
+                except Exception as e:
+                    logger.warning(f"Stop hook {getattr(hook, '__qualname__', hook)} failed: {e}")
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_all(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Async runtime {self.name} shutdown incomplete: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        self.io_executor.shutdown()
+        self.cpu_executor.shutdown()
+        logger.info(f"Async runtime {self.name} stopped")
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        pending = stats['submitted'] - stats['completed'] - stats['failed'] - stats['cancelled']
+        return {
+            'running': self.running,
+            'pending': pending,
+            **stats,
+            'loop_lag_ms': round(self.loop_lag_ms, 2),
+            'max_loop_lag_ms': round(self.max_loop_lag_ms, 2),
+            'executors': {'io': self.io_executor.get_metrics(), 'cpu': self.cpu_executor.get_metrics()},
+            'supervised': {name: dict(state) for name, state in self.supervised.items()}
+        }
@@ -0,0 +1,144 @@
+"""
+Cycle Budget Runner
+Deadline-aware stage execution: per-stage and total cycle budgets, stale
+fallbacks for stages that overrun, and demotion of chronically slow stages
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageRecord:
+    """Budget bookkeeping for one stage"""
+
+    def __init__(self):
+        self.interval = 1
+        self.consecutive_overruns = 0
+        self.consecutive_on_time = 0
+        self.overruns = 0
+        self.runs = 0
+        self.skips = 0
+        self.last_duration = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'interval_cycles': self.interval,
+            'runs': self.runs,
+            'overruns': self.overruns,
+            'skips': self.skips,
+            'consecutive_overruns': self.consecutive_overruns,
+            'last_duration': round(self.last_duration, 6) if self.last_duration is not None else None
+        }
+
+
+class CycleBudgetRunner:
+    """Runs stages under a shared cycle deadline and returns the previous result, marked stale,
+    for any stage that is skipped or overruns"""
+
+    def __init__(self, total_seconds: float = 25.0, default_stage_seconds: float = 10.0,
+                 stage_seconds: Optional[Dict[str, float]] = None, demote_after_overruns: int = 3,
+                 promote_after_successes: int = 5, max_interval_cycles: int = 16, enabled: bool = True):
+        self.total_seconds = total_seconds
+        self.default_stage_seconds = default_stage_seconds
+        self.stage_seconds = stage_seconds or {}
+        self.demote_after_overruns = demote_after_overruns
+        self.promote_after_successes = promote_after_successes
+        self.max_interval_cycles = max_interval_cycles
+        self.enabled = enabled
+
+        self.records: Dict[str, StageRecord] = {}
+        self.last_results: Dict[str, Dict] = {}
+        self.cycle_index = 0
+        self.deadline = None
+        self.cycle_events = []
+
+    def start_cycle(self):
+        self.cycle_index += 1
+        self.deadline = time.monotonic() + self.total_seconds
+        self.cycle_events = []
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return self.total_seconds
+        return self.deadline - time.monotonic()
+
+    def budget_for(self, stage: str) -> float:
+        return self.stage_seconds.get(stage, self.default_stage_seconds)
+
+    def _stale(self, key: str, stage: str, reason: str) -> Any:
+        """Previous result for key marked stale, or an error placeholder when none exists"""
+        self.records[stage].skips += 1
+        self.cycle_events.append({'stage': key, 'reason': reason})
+
+        previous = self.last_results.get(key)
+        if previous is None:
+            return {'success': False, 'error': f'stage skipped: {reason}', 'stale': True, 'stale_reason': reason}
+
+        result = previous['result']
+        age = round(time.monotonic() - previous['stored_at'], 3)
+        if isinstance(result, dict):
+            return {**result, 'stale': True, 'stale_reason': reason, 'stale_age_seconds': age}
+        return result
+
+    def _on_time(self, record: StageRecord):
+        record.consecutive_overruns = 0
+        record.consecutive_on_time += 1
+        if record.interval > 1 and record.consecutive_on_time >= self.promote_after_successes:
+            record.interval //= 2
+            record.consecutive_on_time = 0
+
+    def _overrun(self, stage: str, record: StageRecord):
+        record.overruns += 1
+        record.consecutive_on_time = 0
+        record.consecutive_overruns += 1
+        if record.consecutive_overruns >= self.demote_after_overruns and record.interval < self.max_interval_cycles:
+            record.interval = min(self.max_interval_cycles, record.interval * 2)
+            record.consecutive_overruns = 0
+            logger.warning(f"Stage {stage} demoted to every {record.interval} cycles after repeated overruns")
+
+    async def run(self, stage: str, compute: Callable[[], Awaitable[Any]], key: Optional[str] = None) -> Any:
+        """Run compute() within the stage budget and the remaining cycle budget"""
+        key = key or stage
+        record = self.records.setdefault(stage, StageRecord())
+
+        if not self.enabled:
+            return await compute()
+
+        # Demoted stages only run on every Nth cycle
+        if record.interval > 1 and self.cycle_index % record.interval != 0 and key in self.last_results:
+            return self._stale(key, stage, 'demoted')
+
+        timeout = min(self.budget_for(stage), self.remaining())
+        if timeout <= 0:
+            return self._stale(key, stage, 'cycle_budget_exhausted')
+
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(compute(), timeout)
+        except asyncio.TimeoutError:
+            record.last_duration = time.monotonic() - start
+            self._overrun(stage, record)
+            logger.warning(f"Stage {key} exceeded its {timeout:.1f}s budget; serving previous result")
+            return self._stale(key, stage, 'timeout')
+
+        record.runs += 1
+        record.last_duration = time.monotonic() - start
+        self._on_time(record)
+
+        if not (isinstance(result, dict) and 'error' in result):
+            self.last_results[key] = {'result': result, 'stored_at': time.monotonic()}
+        return result
+
+    def get_status(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'total_seconds': self.total_seconds,
+            'cycle_index': self.cycle_index,
+            'remaining_seconds': round(self.remaining(), 3) if self.deadline else None,
+            'stale_this_cycle': list(self.cycle_events),
+            'stages': {stage: record.to_dict() for stage, record in self.records.items()}
+        }
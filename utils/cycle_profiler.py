@@ -0,0 +1,210 @@
+"""
+Cycle Profiler
+Monotonic-clock stage spans, rolling latency histograms and opt-in
+profile capture of the slowest analysis cycle
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PyinstrumentProfiler = None
+    PYINSTRUMENT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# cProfile hooks the whole thread, so while a cycle awaits, every other task on the shared
+# event loop (scanner ingestion, streaming indicators, the LLM gateway) is attributed to it.
+# pyinstrument's async mode follows the cycle task's await chain instead.
+PROFILE_SCOPE = {
+    'cprofile': 'event_loop_thread',
+    'pyinstrument': 'cycle_task'
+}
+
+
+class LatencyHistogram:
+    """Rolling window of durations with percentile summaries"""
+
+    def __init__(self, window: int = 500):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def summary(self) -> Dict:
+        if not self.samples:
+            return {'count': self.count, 'window': 0}
+        return {
+            'count': self.count,
+            'window': len(self.samples),
+            'last': round(self.samples[-1], 6),
+            'mean': round(sum(self.samples) / len(self.samples), 6),
+            'max': round(max(self.samples), 6),
+            'p50': round(self.percentile(50), 6),
+            'p95': round(self.percentile(95), 6),
+            'p99': round(self.percentile(99), 6)
+        }
+
+
+class CycleProfiler:
+    """Collects per-stage and per-symbol spans for each analysis cycle.
+
+    Spans time only the code they wrap; profile captures follow PROFILE_SCOPE for the backend.
+    """
+
+    def __init__(self, histogram_window: int = 500, profiling_enabled: bool = False,
+                 backend: str = 'cprofile', top_functions: int = 30):
+        self.histogram_window = histogram_window
+        self.profiling_enabled = profiling_enabled
+        self.backend = backend if backend != 'pyinstrument' or PYINSTRUMENT_AVAILABLE else 'cprofile'
+        self.top_functions = top_functions
+
+        self.stage_histograms: Dict[str, LatencyHistogram] = {}
+        self.symbol_histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self.cycle_histogram = LatencyHistogram(histogram_window)
+
+        self.current_spans: List[Dict] = []
+        self.last_cycle: Optional[Dict] = None
+        self.slowest_cycle: Optional[Dict] = None
+
+        self._cycle_start = None
+        self._active_profiler = None
+
+    @contextmanager
+    def span(self, stage: str, symbol: Optional[str] = None):
+        """Time a stage (optionally for one symbol) on the monotonic clock"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_histograms.setdefault(stage, LatencyHistogram(self.histogram_window)).record(elapsed)
+            if symbol is not None:
+                per_symbol = self.symbol_histograms.setdefault(stage, {})
+                per_symbol.setdefault(symbol, LatencyHistogram(self.histogram_window)).record(elapsed)
+            self.current_spans.append({
+                'stage': stage,
+                'symbol': symbol,
+                'offset': round(start - self._cycle_start, 6) if self._cycle_start else None,
+                'duration': round(elapsed, 6)
+            })
+
+    def start_cycle(self):
+        self.current_spans = []
+        self._cycle_start = time.perf_counter()
+        self._active_profiler = None
+
+        if self.profiling_enabled:
+            try:
+                if self.backend == 'pyinstrument':
+                    self._active_profiler = PyinstrumentProfiler(async_mode='enabled')
+                    self._active_profiler.start()
+                else:
+                    self._active_profiler = cProfile.Profile()
+                    self._active_profiler.enable()
+            except Exception as e:
+                # Another profiler may already be active in this thread
+                logger.warning(f"Could not start cycle profiler: {e}")
+                self._active_profiler = None
+
+    def end_cycle(self) -> float:
+        """Close the cycle, update histograms and keep the slowest profile; returns seconds"""
+        duration = time.perf_counter() - self._cycle_start if self._cycle_start else 0.0
+        self.cycle_histogram.record(duration)
+
+        profile_text = self._stop_profiler()
+
+        self.last_cycle = {
+            'finished_at': datetime.now().isoformat(),
+            'duration': round(duration, 6),
+            'spans': self.current_spans
+        }
+
+        if self.slowest_cycle is None or duration > self.slowest_cycle['duration']:
+            self.slowest_cycle = dict(self.last_cycle)
+            if profile_text is not None:
+                self.slowest_cycle['profile'] = {
+                    'backend': self.backend,
+                    'scope': PROFILE_SCOPE.get(self.backend, 'event_loop_thread'),
+                    'report': profile_text
+                }
+
+        self._cycle_start = None
+        return duration
+
+    def _stop_profiler(self) -> Optional[str]:
+        profiler = self._active_profiler
+        self._active_profiler = None
+        if profiler is None:
+            return None
+
+        try:
+            if self.backend == 'pyinstrument':
+                profiler.stop()
+                return profiler.output_text(unicode=True, color=False)
+
+            profiler.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.sort_stats('cumulative').print_stats(self.top_functions)
+            return stream.getvalue()
+        except Exception as e:
+            logger.warning(f"Could not collect cycle profile: {e}")
+            return None
+
+    def last_cycle_totals(self) -> Dict[str, float]:
+        """Total seconds per stage in the last completed cycle"""
+        totals: Dict[str, float] = {}
+        for span in (self.last_cycle or {}).get('spans', []):
+            totals[span['stage']] = totals.get(span['stage'], 0.0) + span['duration']
+        return totals
+
+    def set_profiling(self, enabled: bool, backend: Optional[str] = None):
+        """Toggle profile capture; resets the slowest-cycle record so a new capture is taken"""
+        self.profiling_enabled = enabled
+        if backend:
+            self.backend = backend if backend != 'pyinstrument' or PYINSTRUMENT_AVAILABLE else 'cprofile'
+        self.slowest_cycle = None
+
+    def get_report(self, include_profile: bool = True) -> Dict:
+        """Histograms, the last cycle's spans and the slowest cycle capture"""
+        slowest = self.slowest_cycle
+        if slowest is not None and not include_profile:
+            slowest = {k: v for k, v in slowest.items() if k != 'profile'}
+
+        return {
+            'cycle': self.cycle_histogram.summary(),
+            'stages': {stage: h.summary() for stage, h in self.stage_histograms.items()},
+            'symbols': {
+                stage: {symbol: h.summary() for symbol, h in per_symbol.items()}
+                for stage, per_symbol in self.symbol_histograms.items()
+            },
+            'last_cycle': self.last_cycle,
+            'slowest_cycle': slowest,
+            'profiling': {
+                'enabled': self.profiling_enabled,
+                'backend': self.backend,
+                'scope': PROFILE_SCOPE.get(self.backend, 'event_loop_thread'),
+                'pyinstrument_available': PYINSTRUMENT_AVAILABLE
+            },
+            'timestamp': datetime.now().isoformat()
+        }
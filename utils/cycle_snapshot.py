@@ -0,0 +1,80 @@
+"""
+Cycle Snapshot
+Holds the last completed analysis cycle with its completion time and a content
+ETag, so API reads are served from memory instead of recomputing a cycle
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110): '*' or an exact opaque tag"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    opaque = opaque.strip('"')
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate.strip('"') == opaque:
+            return True
+    return False
+
+
+class CycleSnapshotStore:
+    """Latest completed cycle, replaced wholesale on publish"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.snapshot: Optional[Dict] = None
+        self.cycles = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def publish(self, results: Dict, completed_at: Optional[float] = None) -> Dict:
+        """Store a completed cycle; failed cycles are counted but keep the previous snapshot"""
+        if 'error' in results:
+            with self._lock:
+                self.failures += 1
+                self.last_error = results['error']
+            return self.snapshot
+
+        body = json.dumps(results, sort_keys=True, default=str)
+        completed_at = completed_at if completed_at is not None else time.time()
+        with self._lock:
+            self.cycles += 1
+            self.snapshot = {
+                'results': results,
+                'cycle_number': self.cycles,
+                'completed_at': completed_at,
+                'etag': '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+            }
+            return self.snapshot
+
+    def latest(self) -> Optional[Dict]:
+        return self.snapshot
+
+    def age_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        return max(0.0, (now if now is not None else time.time()) - snapshot['completed_at'])
+
+    def metadata(self) -> Dict:
+        snapshot = self.snapshot
+        return {
+            'cycle_number': snapshot['cycle_number'] if snapshot else None,
+            'completed_at': datetime.fromtimestamp(snapshot['completed_at']).isoformat() if snapshot else None,
+            'age_seconds': round(self.age_seconds(), 1) if snapshot else None,
+            'etag': snapshot['etag'] if snapshot else None,
+            'failed_cycles': self.failures,
+            'last_error': self.last_error
+        }
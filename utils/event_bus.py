@@ -0,0 +1,212 @@
+"""
+Event Bus
+In-process pipeline of named stages, each with its own bounded asyncio queue
+and worker pool. Producers get backpressure from blocking stages, while stages
+that may fall behind (alerts, posts, trades) shed their oldest work instead of
+stalling the stages upstream of them
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Any], Awaitable[None]]
+TimeoutHook = Callable[[Any, asyncio.Task], None]
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest')
+
+
+class Stage:
+    """One bounded queue plus the workers draining it"""
+
+    def __init__(self, name: str, handler: Handler, workers: int = 1, maxsize: int = 100,
+                 overflow: str = 'block', timeout: Optional[float] = None, shield: bool = False,
+                 on_timeout: Optional[TimeoutHook] = None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy for stage {name}: {overflow}")
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.timeout = timeout
+        # Shielded handlers are never cancelled on timeout (e.g. order placement); the worker
+        # reports the timeout through on_timeout and keeps waiting for the real outcome
+        self.shield = shield
+        self.on_timeout = on_timeout
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+        self.published = 0
+        self.processed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.dropped = 0
+        self.in_flight = 0
+        self.max_depth = 0
+        self.busy_seconds = 0.0
+
+    def unfinished(self) -> int:
+        """Items queued or being handled"""
+        return (self.queue.qsize() if self.queue else 0) + self.in_flight
+
+    def get_metrics(self) -> Dict:
+        depth = self.queue.qsize() if self.queue else 0
+        return {
+            'depth': depth,
+            'maxsize': self.maxsize,
+            'max_depth': self.max_depth,
+            'workers': self.workers,
+            'overflow': self.overflow,
+            'published': self.published,
+            'processed': self.processed,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'dropped': self.dropped,
+            'avg_handler_ms': round(self.busy_seconds / self.processed * 1000, 2) if self.processed else 0.0
+        }
+
+
+class EventBus:
+    """Named stages connected by bounded queues"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.stage_config: Dict[str, Dict] = (config or {}).get('event_bus', {}).get('stages', {})
+        self.stages: Dict[str, Stage] = {}
+        self.running = False
+
+    def add_stage(self, name: str, handler: Handler, workers: int = 1, maxsize: int = 100,
+                  overflow: str = 'block', timeout: Optional[float] = None, shield: bool = False,
+                  on_timeout: Optional[TimeoutHook] = None) -> Stage:
+        """Register a stage; event_bus.stages.<name> in config overrides the defaults"""
+        settings = self.stage_config.get(name, {})
+        stage = Stage(
+            name, handler,
+            workers=settings.get('workers', workers),
+            maxsize=settings.get('maxsize', maxsize),
+            overflow=settings.get('overflow', overflow),
+            timeout=settings.get('timeout', timeout),
+            shield=shield,
+            on_timeout=on_timeout
+        )
+        self.stages[name] = stage
+        return stage
+
+    def start(self):
+        """Create queues and worker tasks on the running loop"""
+        if self.running:
+            return
+        self.running = True
+        loop = asyncio.get_running_loop()
+        for stage in self.stages.values():
+            stage.queue = asyncio.Queue(maxsize=stage.maxsize)
+            stage.tasks = [loop.create_task(self.worker(stage)) for _ in range(stage.workers)]
+        logger.info("🚌 Event bus started: " + ', '.join(
+            f"{name}x{stage.workers}" for name, stage in self.stages.items()))
+
+    async def worker(self, stage: Stage):
+        while True:
+            item = await stage.queue.get()
+            started = time.perf_counter()
+            stage.in_flight += 1
+            try:
+                if stage.shield:
+                    await self.run_shielded(stage, item)
+                else:
+                    await asyncio.wait_for(stage.handler(item), stage.timeout)
+                stage.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                stage.timeouts += 1
+                logger.warning(f"Event bus stage {stage.name} timed out after {stage.timeout}s")
+            except Exception as e:
+                stage.errors += 1
+                logger.error(f"Event bus stage {stage.name} failed: {e}")
+            finally:
+                stage.in_flight -= 1
+                stage.busy_seconds += time.perf_counter() - started
+                stage.queue.task_done()
+
+    async def run_shielded(self, stage: Stage, item: Any):
+        task = asyncio.ensure_future(stage.handler(item))
+        done, _ = await asyncio.wait({task}, timeout=stage.timeout)
+        if not done:
+            stage.timeouts += 1
+            logger.warning(f"Event bus stage {stage.name} exceeded {stage.timeout}s; outcome unknown, still waiting")
+            if stage.on_timeout:
+                stage.on_timeout(item, task)
+        # Stopping the bus abandons the wait but never cancels the handler itself
+        await asyncio.shield(task)
+
+    async def publish(self, name: str, item: Any):
+        """Enqueue into a stage; blocking stages make the caller wait for room"""
+        stage = self.stages[name]
+        if stage.overflow == 'block':
+            await stage.queue.put(item)
+        else:
+            self.publish_nowait(name, item)
+            return
+        stage.published += 1
+        stage.max_depth = max(stage.max_depth, stage.queue.qsize())
+
+    def publish_nowait(self, name: str, item: Any) -> bool:
+        """Enqueue without waiting; full drop_oldest stages shed their oldest item, full blocking stages refuse"""
+        stage = self.stages[name]
+        while True:
+            try:
+                stage.queue.put_nowait(item)
+                break
+            except asyncio.QueueFull:
+                if stage.overflow != 'drop_oldest':
+                    stage.dropped += 1
+                    return False
+                stage.queue.get_nowait()
+                stage.queue.task_done()
+                stage.dropped += 1
+                logger.warning(f"Event bus stage {name} full; dropped oldest item")
+        stage.published += 1
+        stage.max_depth = max(stage.max_depth, stage.queue.qsize())
+        return True
+
+    async def join(self):
+        """Wait until every stage has drained; stages are joined in registration (pipeline) order"""
+        for stage in self.stages.values():
+            await stage.queue.join()
+
+    async def drain(self, timeout: float, stages: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Wait up to timeout for the stages to empty, in pipeline order; returns unfinished items per stage"""
+        names = [name for name in (stages if stages is not None else self.stages)
+                 if self.stages[name].queue is not None]
+
+        async def join():
+            for name in names:
+                await self.stages[name].queue.join()
+
+        try:
+            await asyncio.wait_for(join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Event bus did not drain within {timeout}s")
+        return {name: self.stages[name].unfinished() for name in names if self.stages[name].unfinished()}
+
+    async def stop(self, drain_timeout: Optional[float] = None):
+        """Cancel the workers; with drain_timeout, queued items get that long to finish first"""
+        if drain_timeout is not None and self.running:
+            for name, count in (await self.drain(drain_timeout)).items():
+                logger.warning(f"Event bus stage {name} stopped with {count} items unprocessed")
+        self.running = False
+        tasks = [task for stage in self.stages.values() for task in stage.tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for stage in self.stages.values():
+            stage.tasks = []
+
+    def get_metrics(self) -> Dict:
+        return {
+            'running': self.running,
+            'stages': {name: stage.get_metrics() for name, stage in self.stages.items()}
+        }
@@ -0,0 +1,242 @@
+"""
+Event Pipeline
+Batch normalization stage between the scanners and the decoders: dedupes raw
+events by content hash, tags assets for the whole batch in one pass of the
+shared AssetMatcher, classifies event types with one compiled alternation
+regex, and emits a compact columnar event batch that downstream decoders share
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.asset_matcher import AssetMatcher
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELDS = ('title', 'summary', 'selftext', 'body', 'text', 'content', 'description')
+MARKET_SOURCES = ('binance', 'india_equity')
+
+
+def parse_timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def compile_vocabulary(vocabulary: Dict[str, List[str]]) -> Tuple[Optional[re.Pattern], Dict[str, str]]:
+    """One alternation regex with a named group per label; returns (regex, group -> label)"""
+    groups, names = [], {}
+    for i, (label, patterns) in enumerate(vocabulary.items()):
+        if not patterns:
+            continue
+        name = f'g{i}'
+        names[name] = label
+        groups.append(f"(?P<{name}>{'|'.join(f'(?:{p})' for p in patterns)})")
+    if not groups:
+        return None, names
+    return re.compile('|'.join(groups)), names
+
+
+class NormalizedEventBatch:
+    """Columnar, deduplicated events with asset and type tags"""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.sources: List[str] = []
+        self.kinds: List[str] = []
+        self.timestamps: List[float] = []
+        self.event_types: List[str] = []
+        self.assets: List[Tuple[str, ...]] = []
+        self.hashes: List[str] = []
+        self.texts: List[str] = []
+        self.raw: List[Dict] = []
+        self.by_asset: Dict[str, List[int]] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        self.duplicates = 0
+        self.received = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, raw: Dict, source: str, kind: str, timestamp: float, event_type: str,
+               assets: Tuple[str, ...], content_hash: str, text: str = ''):
+        row = len(self.ids)
+        self.ids.append(str(raw.get('id', content_hash[:16])))
+        self.sources.append(source)
+        self.kinds.append(kind)
+        self.timestamps.append(timestamp)
+        self.event_types.append(event_type)
+        self.assets.append(assets)
+        self.hashes.append(content_hash)
+        self.texts.append(text)
+        self.raw.append(raw)
+        for asset in assets:
+            self.by_asset.setdefault(asset, []).append(row)
+        self.by_type.setdefault(event_type, []).append(row)
+
+    def raw_events(self) -> List[Dict]:
+        """Deduplicated raw events in arrival order, for decoders that take scanner events"""
+        return self.raw
+
+    def market_events(self) -> List[Dict]:
+        return [self.raw[i] for i, kind in enumerate(self.kinds) if kind == 'market']
+
+    def market_rows(self) -> List[Tuple[Optional[str], Dict]]:
+        """(canonical asset or None, raw event) for every market tick"""
+        return [(self.assets[i][0] if self.assets[i] else None, self.raw[i])
+                for i, kind in enumerate(self.kinds) if kind == 'market']
+
+    def text_rows(self) -> List[Tuple[Tuple[str, ...], str, Dict]]:
+        """(assets, text, payload) for text events that mention at least one asset"""
+        return [(self.assets[i], self.texts[i], self.raw[i].get('payload', {}) or {})
+                for i, kind in enumerate(self.kinds) if kind == 'text' and self.assets[i]]
+
+    def record(self, row: int) -> Dict:
+        return {
+            'id': self.ids[row],
+            'source': self.sources[row],
+            'kind': self.kinds[row],
+            'timestamp': self.timestamps[row],
+            'event_type': self.event_types[row],
+            'assets': list(self.assets[row]),
+            'content_hash': self.hashes[row]
+        }
+
+    def for_asset(self, asset: str) -> List[Dict]:
+        return [self.record(row) for row in self.by_asset.get(asset, [])]
+
+    def summary(self) -> Dict:
+        return {
+            'received': self.received,
+            'events': len(self),
+            'duplicates': self.duplicates,
+            'event_types': {t: len(rows) for t, rows in self.by_type.items()},
+            'assets': {a: len(rows) for a, rows in sorted(self.by_asset.items(), key=lambda kv: -len(kv[1]))[:10]}
+        }
+
+
+class EventBatchNormalizer:
+    """Dedupes and tags scanner events in bulk"""
+
+    def __init__(self, config: Dict, assets_config: Optional[Dict] = None,
+                 asset_matcher: Optional[AssetMatcher] = None):
+        normalization = config.get('ai_strategist_features', {}).get('event_normalization', {})
+        pipeline_config = normalization.get('pipeline', {})
+
+        self.dedupe_window = pipeline_config.get('dedupe_window', 50000)
+        self.seen: OrderedDict = OrderedDict()
+
+        # Shared with the orchestrator so a config reload retags every consumer at once
+        self.asset_matcher = asset_matcher or AssetMatcher(assets_config or {})
+
+        keyword_patterns = {
+            event_type: [r'\b' + re.escape(keyword.lower()) + r'\b' for keyword in keywords]
+            for event_type, keywords in normalization.get('event_types', {}).items()
+        }
+        self.type_regex, self.type_groups = compile_vocabulary(keyword_patterns)
+
+        self.stats = {'batches': 0, 'received': 0, 'emitted': 0, 'duplicates': 0}
+
+    def resolve_symbol(self, symbol: str) -> Optional[str]:
+        return self.asset_matcher.resolve_symbol(symbol)
+
+    def event_text(self, payload: Dict) -> str:
+        return ' '.join(str(payload[field]) for field in TEXT_FIELDS if payload.get(field))
+
+    def content_hash(self, source: str, payload: Dict, text: str, kind: str = 'text',
+                     event: Optional[Dict] = None) -> str:
+        event = event or {}
+        if text and kind != 'market':
+            # Same headline from different scanners is one event
+            basis = re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', text.lower())).strip()
+        else:
+            # Ticks repeat price and volume routinely; only a re-delivery of the same tick is a duplicate
+            basis = source + json.dumps([event.get('timestamp'), event.get('id'), payload], sort_keys=True, default=str)
+        return hashlib.sha1(basis.encode()).hexdigest()
+
+    def is_duplicate(self, content_hash: str) -> bool:
+        if content_hash in self.seen:
+            self.seen.move_to_end(content_hash)
+            return True
+        self.seen[content_hash] = True
+        if len(self.seen) > self.dedupe_window:
+            self.seen.popitem(last=False)
+        return False
+
+    def forget(self, hashes: Iterable[str]):
+        """Un-see a batch that failed downstream so its retry is not deduplicated away"""
+        for content_hash in hashes:
+            self.seen.pop(content_hash, None)
+
+    def tag_assets(self, text: str, payload: Dict,
+                   mentioned: Optional[Tuple[str, ...]] = None) -> Tuple[str, ...]:
+        """Payload symbol first, then assets mentioned in the text"""
+        found = []
+        symbol = payload.get('symbol') or payload.get('asset')
+        if symbol:
+            resolved = self.resolve_symbol(str(symbol))
+            found.append(resolved or str(symbol).upper())
+        if mentioned is None:
+            mentioned = self.asset_matcher.tag(text) if text else ()
+        for asset in mentioned:
+            if asset not in found:
+                found.append(asset)
+        return tuple(found)
+
+    def classify(self, text: str, kind: str) -> str:
+        if kind == 'market':
+            return 'market_tick'
+        if not text or self.type_regex is None:
+            return 'other'
+        counts: Dict[str, int] = {}
+        for match in self.type_regex.finditer(text.lower()):
+            label = self.type_groups[match.lastgroup]
+            counts[label] = counts.get(label, 0) + 1
+        return max(counts, key=counts.get) if counts else 'other'
+
+    def normalize(self, events: Iterable[Dict]) -> NormalizedEventBatch:
+        """Dedupe, tag and columnarize one scanner batch"""
+        batch = NormalizedEventBatch()
+        accepted = []
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            batch.received += 1
+            source = event.get('source', 'unknown')
+            payload = event.get('payload', {}) or {}
+            kind = 'market' if source in MARKET_SOURCES and payload.get('price') is not None else 'text'
+            text = self.event_text(payload)
+
+            content_hash = self.content_hash(source, payload, text, kind, event)
+            if self.is_duplicate(content_hash):
+                batch.duplicates += 1
+                continue
+            accepted.append((event, source, payload, kind, text, content_hash))
+
+        # One matcher scan over every surviving text in the batch
+        mentions = self.asset_matcher.tag_batch([text for _, _, _, _, text, _ in accepted])
+        for (event, source, payload, kind, text, content_hash), mentioned in zip(accepted, mentions):
+            batch.append(
+                event, source, kind, parse_timestamp(event.get('timestamp')),
+                self.classify(text, kind), self.tag_assets(text, payload, mentioned), content_hash, text
+            )
+
+        self.stats['batches'] += 1
+        self.stats['received'] += batch.received
+        self.stats['emitted'] += len(batch)
+        self.stats['duplicates'] += batch.duplicates
+        return batch
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'dedupe_entries': len(self.seen), 'asset_matcher_builds': self.asset_matcher.builds}
@@ -0,0 +1,115 @@
+"""
+Feature Scheduler
+Frequency tiers for orchestrator feature groups so slow-moving features
+run only when due instead of on every analysis cycle
+"""
+
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+NAMED_CADENCES = {
+    'tick': 0,
+    'minutely': 60,
+    'hourly': 3600,
+    'daily': 86400
+}
+
+UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_cadence(cadence: Union[str, int, float, None]) -> float:
+    """Seconds between runs for 'tick', 'hourly', 'daily', '5m', '30s', '2h' or a number"""
+    if cadence is None:
+        return 0
+    if isinstance(cadence, (int, float)):
+        return float(cadence)
+
+    value = cadence.strip().lower()
+    if value in NAMED_CADENCES:
+        return NAMED_CADENCES[value]
+
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*([smhd])', value)
+    if not match:
+        raise ValueError(f"Unrecognized cadence: {cadence}")
+    return float(match.group(1)) * UNIT_SECONDS[match.group(2)]
+
+
+class FeatureScheduler:
+    """Tracks when each named feature last ran and whether it is due"""
+
+    def __init__(self, cadences: Optional[Dict[str, Union[str, int]]] = None, default_cadence: str = 'tick'):
+        self.cadences: Dict[str, Union[str, int]] = dict(cadences or {})
+        self.default_cadence = default_cadence
+        self.intervals: Dict[str, float] = {}
+        for name, cadence in self.cadences.items():
+            try:
+                self.intervals[name] = parse_cadence(cadence)
+            except ValueError as e:
+                logger.warning(f"{e}; running {name} every tick")
+                self.intervals[name] = 0
+
+        self.last_run: Dict[str, float] = {}
+        self.last_results: Dict[str, Any] = {}
+        self.run_counts: Dict[str, int] = {}
+        self.skip_counts: Dict[str, int] = {}
+
+    def interval_for(self, name: str) -> float:
+        return self.intervals.get(name, parse_cadence(self.default_cadence))
+
+    def is_due(self, name: str, now: Optional[float] = None) -> bool:
+        now = now if now is not None else time.monotonic()
+        last = self.last_run.get(name)
+        return last is None or now - last >= self.interval_for(name)
+
+    def next_due_in(self, name: str, now: Optional[float] = None) -> float:
+        now = now if now is not None else time.monotonic()
+        last = self.last_run.get(name)
+        if last is None:
+            return 0.0
+        return max(0.0, self.interval_for(name) - (now - last))
+
+    def mark_run(self, name: str, result: Any = None, now: Optional[float] = None):
+        self.last_run[name] = now if now is not None else time.monotonic()
+        self.run_counts[name] = self.run_counts.get(name, 0) + 1
+        if result is not None:
+            self.last_results[name] = result
+
+    def last_result(self, name: str) -> Any:
+        return self.last_results.get(name)
+
+    async def run_if_due(self, name: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run compute() when the feature is due; otherwise return its previous result"""
+        if self.is_due(name) or name not in self.last_results:
+            result = await compute()
+            # Failed, skipped or timed-out (stale) runs stay due so the next cycle retries them
+            if isinstance(result, dict) and (result.get('success') is False or 'error' in result
+                                             or result.get('stale')):
+                return result
+            self.mark_run(name, result)
+            return result
+
+        self.skip_counts[name] = self.skip_counts.get(name, 0) + 1
+        previous = self.last_results[name]
+        if isinstance(previous, dict):
+            return {**previous, 'schedule': self.describe(name)}
+        return previous
+
+    def describe(self, name: str) -> Dict:
+        return {
+            'cadence': self.cadences.get(name, self.default_cadence),
+            'next_due_in_seconds': round(self.next_due_in(name), 1),
+            'runs': self.run_counts.get(name, 0),
+            'skips': self.skip_counts.get(name, 0)
+        }
+
+    def get_status(self) -> Dict:
+        names = set(self.cadences) | set(self.last_run)
+        return {
+            'features': {name: self.describe(name) for name in sorted(names)},
+            'timestamp': datetime.now().isoformat()
+        }
@@ -0,0 +1,316 @@
+"""
+Job Manager
+Unified subsystem for long-running API operations: a persistent sqlite job
+table, a worker pool per job class, progress reporting, cooperative
+cancellation and result retention limits
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('queued', 'running')
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled', 'interrupted')
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested"""
+
+
+class JobContext:
+    """Handle passed to job functions for progress reporting and cancellation checks"""
+
+    def __init__(self, manager: 'JobManager', job_id: int, params: Dict):
+        self.manager = manager
+        self.job_id = job_id
+        self.params = params
+        self.cancel_event = threading.Event()
+        self.async_future: Optional[Future] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"Job {self.job_id} cancelled")
+
+    def report_progress(self, progress: float, message: Optional[str] = None):
+        """Record progress (0-100); also a cancellation point"""
+        self.check_cancelled()
+        self.manager.update_progress(self.job_id, progress, message)
+
+
+def iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.utcfromtimestamp(ts).isoformat() + 'Z' if ts else None
+
+
+class JobManager:
+    """Job classes with their own pools; jobs are rows in a sqlite table"""
+
+    DEFAULT_CLASSES = {
+        'analysis': {'workers': 1, 'timeout': 600},
+        'backtest': {'workers': 2, 'timeout': 1800},
+        'maintenance': {'workers': 1, 'timeout': 600}
+    }
+
+    def __init__(self, db_path: str = 'jobs.db', config: Optional[Dict] = None, runtime: Any = None):
+        job_config = (config or {}).get('jobs', {})
+        self.db_path = db_path
+        self.runtime = runtime
+        self.max_finished_per_class = job_config.get('max_finished_per_class', 100)
+        self.retention_seconds = job_config.get('retention_hours', 72) * 3600
+        self.class_settings: Dict[str, Dict] = {
+            name: {**self.DEFAULT_CLASSES.get(name, {}), **settings}
+            for name, settings in {**self.DEFAULT_CLASSES, **job_config.get('classes', {})}.items()
+        }
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.pools: Dict[str, ThreadPoolExecutor] = {}
+        self.contexts: Dict[int, JobContext] = {}
+        self.futures: Dict[int, Future] = {}
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'deduplicated': 0}
+        self.init_db()
+
+    def init_db(self):
+        with self._lock:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_class TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    dedupe_key TEXT,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    message TEXT,
+                    params TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            ''')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_class_status ON jobs(job_class, status)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs(dedupe_key, status)')
+            # Jobs that were in flight when the process stopped cannot resume
+            interrupted = self.conn.execute(
+                "UPDATE jobs SET status = 'interrupted', finished_at = ? WHERE status IN ('queued', 'running')",
+                (time.time(),)
+            ).rowcount
+            self.conn.commit()
+        if interrupted:
+            logger.warning(f"Marked {interrupted} unfinished jobs from a previous run as interrupted")
+
+    def pool_for(self, job_class: str) -> ThreadPoolExecutor:
+        pool = self.pools.get(job_class)
+        if pool is None:
+            workers = self.class_settings.get(job_class, {}).get('workers', 1)
+            pool = self.pools[job_class] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'job-{job_class}')
+        return pool
+
+    def submit(self, job_class: str, fn: Callable, params: Optional[Dict] = None, name: Optional[str] = None,
+               dedupe_key: Optional[str] = None) -> Dict:
+        """Queue fn(context) on the job class's pool; coroutine functions run on the async runtime
+
+        With a dedupe_key, an active job with the same key is returned instead of queueing another.
+        """
+        params = params or {}
+        with self._lock:
+            if dedupe_key:
+                row = self.conn.execute(
+                    "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running') ORDER BY id DESC LIMIT 1",
+                    (dedupe_key,)
+                ).fetchone()
+                if row:
+                    self.stats['deduplicated'] += 1
+                    return self.get(row['id'])
+
+            cursor = self.conn.execute(
+                'INSERT INTO jobs (job_class, name, dedupe_key, status, params, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_class, name or getattr(fn, '__name__', job_class), dedupe_key, 'queued',
+                 json.dumps(params, default=str), time.time())
+            )
+            self.conn.commit()
+            job_id = cursor.lastrowid
+            context = JobContext(self, job_id, params)
+            self.contexts[job_id] = context
+            self.stats['submitted'] += 1
+            self.futures[job_id] = self.pool_for(job_class).submit(self.execute, job_id, job_class, fn, context)
+        return self.get(job_id)
+
+    def execute(self, job_id: int, job_class: str, fn: Callable, context: JobContext):
+        if context.cancelled:
+            self.finish(job_id, 'cancelled')
+            return
+        self.set_status(job_id, 'running', started_at=time.time())
+        # Timeouts bound coroutine jobs; thread jobs stop cooperatively via report_progress
+        timeout = self.class_settings.get(job_class, {}).get('timeout')
+        try:
+            if asyncio.iscoroutinefunction(fn):
+                if self.runtime is None:
+                    raise RuntimeError(f"Job {job_id} is a coroutine but no async runtime is configured")
+                context.async_future = self.runtime.submit(fn(context))
+                result = context.async_future.result(timeout)
+            else:
+                result = fn(context)
+            context.check_cancelled()
+            self.finish(job_id, 'completed', result=result)
+        except (JobCancelled, asyncio.CancelledError):
+            self.finish(job_id, 'cancelled')
+        except Exception as e:
+            if context.async_future is not None and not context.async_future.done():
+                context.async_future.cancel()
+            if context.cancelled:
+                self.finish(job_id, 'cancelled')
+            else:
+                logger.error(f"Job {job_id} ({job_class}) failed: {e}")
+                self.finish(job_id, 'failed', error=str(e) or type(e).__name__)
+
+    def set_status(self, job_id: int, status: str, started_at: Optional[float] = None):
+        with self._lock:
+            self.conn.execute(
+                'UPDATE jobs SET status = ?, started_at = COALESCE(?, started_at) WHERE id = ?',
+                (status, started_at, job_id)
+            )
+            self.conn.commit()
+
+    def update_progress(self, job_id: int, progress: float, message: Optional[str] = None):
+        with self._lock:
+            self.conn.execute(
+                'UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?',
+                (max(0.0, min(100.0, float(progress))), message, job_id)
+            )
+            self.conn.commit()
+
+    def finish(self, job_id: int, status: str, result: Any = None, error: Optional[str] = None):
+        with self._lock:
+            self.conn.execute(
+                '''UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?,
+                   progress = CASE WHEN ? = 'completed' THEN 100 ELSE progress END WHERE id = ?''',
+                (status, json.dumps(result, default=str) if result is not None else None, error,
+                 time.time(), status, job_id)
+            )
+            self.conn.commit()
+            self.stats[status] = self.stats.get(status, 0) + 1
+            self.contexts.pop(job_id, None)
+            self.futures.pop(job_id, None)
+        self.prune()
+
+    def cancel(self, job_id: int) -> Optional[Dict]:
+        """Cancel a queued job immediately or ask a running one to stop at its next progress report"""
+        with self._lock:
+            context = self.contexts.get(job_id)
+            future = self.futures.get(job_id)
+        if context is None:
+            return self.get(job_id)
+
+        context.cancel_event.set()
+        if context.async_future is not None:
+            context.async_future.cancel()
+        if future is not None and future.cancel():
+            # Never started: finalize here since execute() will not run
+            self.finish(job_id, 'cancelled')
+        return self.get(job_id)
+
+    def prune(self, now: Optional[float] = None):
+        """Apply retention: drop finished jobs past retention_hours or beyond max_finished_per_class"""
+        now = now if now is not None else time.time()
+        placeholders = ','.join('?' * len(FINISHED_STATUSES))
+        with self._lock:
+            self.conn.execute(
+                f'DELETE FROM jobs WHERE status IN ({placeholders}) AND finished_at < ?',
+                (*FINISHED_STATUSES, now - self.retention_seconds)
+            )
+            self.conn.execute(f'''
+                DELETE FROM jobs WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (PARTITION BY job_class ORDER BY finished_at DESC, id DESC) AS rank
+                        FROM jobs WHERE status IN ({placeholders})
+                    ) WHERE rank > ?
+                )
+            ''', (*FINISHED_STATUSES, self.max_finished_per_class))
+            self.conn.commit()
+
+    def row_to_job(self, row: sqlite3.Row, include_result: bool = True) -> Dict:
+        job = {
+            'id': row['id'],
+            'job_class': row['job_class'],
+            'name': row['name'],
+            'status': row['status'],
+            'progress': row['progress'],
+            'message': row['message'],
+            'params': json.loads(row['params']) if row['params'] else {},
+            'error': row['error'],
+            'created_at': iso(row['created_at']),
+            'started_at': iso(row['started_at']),
+            'finished_at': iso(row['finished_at'])
+        }
+        if include_result:
+            job['result'] = json.loads(row['result']) if row['result'] else None
+        return job
+
+    def get(self, job_id: int, include_result: bool = True) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self.row_to_job(row, include_result) if row else None
+
+    def list(self, job_class: Optional[str] = None, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        query, args = 'SELECT * FROM jobs WHERE 1=1', []
+        if job_class:
+            query += ' AND job_class = ?'
+            args.append(job_class)
+        if status:
+            query += ' AND status = ?'
+            args.append(status)
+        query += ' ORDER BY id DESC LIMIT ?'
+        args.append(limit)
+        with self._lock:
+            rows = self.conn.execute(query, args).fetchall()
+        return [self.row_to_job(row, include_result=False) for row in rows]
+
+    def wait(self, job_id: int, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Block until a job finishes (mainly for tests and CLI use)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in FINISHED_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                return job
+            time.sleep(0.01)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT job_class, status, COUNT(*) AS n FROM jobs GROUP BY job_class, status'
+            ).fetchall()
+        by_class: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            by_class.setdefault(row['job_class'], {})[row['status']] = row['n']
+        return {
+            **self.stats,
+            'active': len(self.contexts),
+            'classes': {
+                name: {'workers': settings.get('workers', 1), 'jobs': by_class.get(name, {})}
+                for name, settings in self.class_settings.items()
+            }
+        }
+
+    def shutdown(self, wait: bool = False):
+        for job_id in list(self.contexts):
+            self.cancel(job_id)
+        for pool in self.pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,100 @@
+"""
+LLM Stub Server
+Minimal OpenAI-compatible chat completions server for tests and offline
+development. Point an OpenAI client at StubLLMServer().url to use it.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class StubLLMServer:
+    """Serves /v1/chat/completions with deterministic replies and counts requests"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, event_type: str = 'policy_signal',
+                 delay_seconds: float = 0.0):
+        self.event_type = event_type
+        # Simulated upstream latency, for timeout tests
+        self.delay_seconds = delay_seconds
+        self.requests: List[Dict] = []
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_POST(self):
+                if not self.path.endswith('/chat/completions'):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                server.requests.append(body)
+                if server.delay_seconds:
+                    time.sleep(server.delay_seconds)
+
+                reply = server.reply_for(body.get('messages', []))
+                payload = json.dumps({
+                    'id': f"stub-{len(server.requests)}",
+                    'object': 'chat.completion',
+                    'created': 0,
+                    'model': body.get('model', 'stub'),
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': reply},
+                        'finish_reason': 'stop'
+                    }],
+                    'usage': {'prompt_tokens': 10, 'completion_tokens': 10, 'total_tokens': 20}
+                }).encode()
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def reply_for(self, messages: List[Dict]) -> str:
+        """One classification per numbered line in the last user message"""
+        content = messages[-1].get('content', '') if messages else ''
+        indices = [int(n) for n in re.findall(r'^(\d+)\.', content, flags=re.MULTILINE)]
+        if indices:
+            return json.dumps({'results': [
+                {'index': i, 'event_type': self.event_type, 'confidence': 0.8} for i in indices
+            ]})
+        return 'Stub narrative.'
+
+    def start(self) -> 'StubLLMServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    stub = StubLLMServer(port=8089)
+    logger.info(f"Stub LLM server listening on {stub.url}")
+    stub.httpd.serve_forever()
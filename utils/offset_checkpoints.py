@@ -0,0 +1,194 @@
+"""
+Offset Checkpoints
+Per-scanner offsets in a WAL-mode sqlite table. A scanned batch's offset is only
+committed once the decode stage has consumed that batch and every earlier batch
+from the same scanner, so a restart never resumes past unprocessed events. A
+batch that is dropped, or still fails to decode after its retries, is written
+to a dead-letter table and skipped, so one bad batch cannot pin its scanner's
+checkpoint. Commits are batched per flush interval and flushed on a timer and at
+shutdown; a crash loses at most one interval of progress, which only means a
+small re-scan
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OffsetCheckpointStore:
+    """Crash-consistent scanner offsets with batched commits"""
+
+    def __init__(self, db_path: str = 'checkpoints.db', config: Optional[Dict] = None):
+        settings = (config or {}).get('checkpoints', {})
+        self.flush_interval = settings.get('flush_interval_seconds', 2.0)
+        self.flush_every = settings.get('flush_every', 20)
+        self.max_decode_attempts = max(1, settings.get('max_decode_attempts', 3))
+        self.retry_backoff = settings.get('retry_backoff_seconds', 1.0)
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # WAL keeps the table consistent across crashes; NORMAL syncs at WAL checkpoints instead of every commit
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(f"PRAGMA synchronous={settings.get('synchronous', 'NORMAL')}")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS scanner_offsets (
+                source TEXT PRIMARY KEY,
+                offset TEXT,
+                events INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                offset TEXT,
+                reason TEXT,
+                events TEXT NOT NULL,
+                failed_at REAL NOT NULL
+            )
+        ''')
+        self.conn.commit()
+
+        self.pending: Dict[str, Dict] = {}
+        self.inflight: Dict[str, Deque[Dict]] = {}
+        self.last_flush = time.monotonic()
+        self.stats = {'recorded': 0, 'flushes': 0, 'rows_written': 0, 'flush_errors': 0,
+                      'tracked': 0, 'dead_lettered': 0}
+
+    def track(self, source: str, offset: Any) -> Optional[Dict]:
+        """Register a scanned batch; its offset commits once it and all earlier batches are consumed"""
+        with self._lock:
+            token = {'source': source, 'offset': offset, 'events': 0, 'done': False}
+            self.inflight.setdefault(source, deque()).append(token)
+            self.stats['tracked'] += 1
+            return token
+
+    def complete(self, token: Optional[Dict], events: int = 0):
+        """Mark a batch consumed and advance its source's checkpoint as far as consumption is contiguous"""
+        if token is None:
+            return
+        with self._lock:
+            token['done'] = True
+            token['events'] = events
+            queue = self.inflight.get(token['source'])
+            latest, total = None, 0
+            while queue and queue[0]['done']:
+                latest = queue.popleft()
+                total += latest['events']
+            if latest is not None:
+                self.record(latest['source'], latest['offset'], total)
+
+    def dead_letter(self, token: Optional[Dict], events: List[Dict], reason: str = 'dropped'):
+        """Keep a batch that will not be processed for inspection or replay, then let the checkpoint pass it"""
+        if token is None:
+            return
+        with self._lock:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        'INSERT INTO dead_letters (source, offset, reason, events, failed_at) VALUES (?, ?, ?, ?, ?)',
+                        (token['source'], json.dumps(token['offset'], default=str), reason,
+                         json.dumps(events, default=str), time.time())
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"Failed to dead-letter a {token['source']} batch: {e}")
+            self.stats['dead_lettered'] += 1
+            logger.warning(f"Dead-lettered {len(events)} {token['source']} events ({reason}); checkpoint moves past them")
+            self.complete(token)
+
+    def dead_letters(self, source: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Most recent dead-lettered batches"""
+        query = 'SELECT id, source, offset, reason, events, failed_at FROM dead_letters'
+        params: tuple = ()
+        if source is not None:
+            query += ' WHERE source = ?'
+            params = (source,)
+        with self._lock:
+            rows = self.conn.execute(query + ' ORDER BY id DESC LIMIT ?', params + (limit,)).fetchall()
+        return [{'id': row[0], 'source': row[1], 'offset': json.loads(row[2]), 'reason': row[3],
+                 'events': json.loads(row[4]), 'failed_at': row[5]} for row in rows]
+
+    def record(self, source: str, offset: Any, events: int = 0):
+        """Stage a scanner's new offset; committed with the next batched flush"""
+        with self._lock:
+            previous = self.pending.get(source)
+            self.pending[source] = {
+                'offset': json.dumps(offset, default=str),
+                'events': events + (previous['events'] if previous else 0),
+                'updated_at': time.time()
+            }
+            self.stats['recorded'] += 1
+            if (time.monotonic() - self.last_flush >= self.flush_interval
+                    or self.stats['recorded'] % self.flush_every == 0):
+                self.flush()
+
+    def flush_due(self) -> int:
+        """Flush staged offsets once the interval has passed, even if no later record arrives"""
+        with self._lock:
+            if self.pending and time.monotonic() - self.last_flush >= self.flush_interval:
+                return self.flush()
+            return 0
+
+    def flush(self) -> int:
+        """Commit all staged offsets in one transaction"""
+        with self._lock:
+            self.last_flush = time.monotonic()
+            if not self.pending:
+                return 0
+            rows = [(source, item['offset'], item['events'], item['updated_at'])
+                    for source, item in self.pending.items()]
+            try:
+                with self.conn:
+                    self.conn.executemany('''
+                        INSERT INTO scanner_offsets (source, offset, events, updated_at) VALUES (?, ?, ?, ?)
+                        ON CONFLICT(source) DO UPDATE SET
+                            offset = excluded.offset,
+                            events = scanner_offsets.events + excluded.events,
+                            updated_at = excluded.updated_at
+                    ''', rows)
+            except sqlite3.Error as e:
+                # Keep the staged offsets; the next flush retries them
+                self.stats['flush_errors'] += 1
+                logger.error(f"Failed to flush scanner checkpoints: {e}")
+                return 0
+            self.pending.clear()
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += len(rows)
+            return len(rows)
+
+    def get(self, source: str, default: Any = None) -> Any:
+        """Latest offset for a source, including staged updates not yet flushed"""
+        with self._lock:
+            if source in self.pending:
+                return json.loads(self.pending[source]['offset'])
+            row = self.conn.execute('SELECT offset FROM scanner_offsets WHERE source = ?', (source,)).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else default
+
+    def load(self) -> Dict[str, Any]:
+        """All committed offsets, used to resume scanners on startup"""
+        with self._lock:
+            rows = self.conn.execute('SELECT source, offset FROM scanner_offsets').fetchall()
+        return {source: json.loads(offset) for source, offset in rows if offset is not None}
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            rows = self.conn.execute('SELECT source, events, updated_at FROM scanner_offsets').fetchall()
+            return {
+                **self.stats,
+                'pending': len(self.pending),
+                'inflight_batches': sum(len(queue) for queue in self.inflight.values()),
+                'dead_letter_rows': self.conn.execute('SELECT COUNT(*) FROM dead_letters').fetchone()[0],
+                'sources': {source: {'events': events, 'updated_at': updated_at} for source, events, updated_at in rows}
+            }
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self.conn.close()
@@ -0,0 +1,193 @@
+"""
+Scan Scheduler
+Runs every scanner as its own asyncio task with its own interval, jitter and
+error backoff, feeding a shared bounded queue so a slow source never holds
+back a fast one. When decoding falls behind, a full queue applies backpressure
+to the scanners rather than discarding collected events
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.feature_scheduler import parse_cadence
+
+logger = logging.getLogger(__name__)
+
+ScanFn = Callable[[], Awaitable[Optional[List[Dict]]]]
+OVERFLOW_POLICIES = ('block', 'drop_oldest')
+
+
+class ScanSource:
+    """Schedule and health counters for one scanner"""
+
+    def __init__(self, name: str, scan: ScanFn, interval: float, jitter: float = 0.1,
+                 max_backoff: float = 300.0, offset: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.scan = scan
+        # Reads the scanner's resume position right after a scan, for checkpointing
+        self.offset = offset
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+
+        self.consecutive_errors = 0
+        self.runs = 0
+        self.errors = 0
+        self.events = 0
+        self.last_run: Optional[float] = None
+        self.last_duration = 0.0
+        self.last_error: Optional[str] = None
+
+    def next_delay(self) -> float:
+        """Interval with jitter, doubled per consecutive failure up to max_backoff"""
+        delay = self.interval
+        if self.consecutive_errors:
+            delay = min(self.interval * 2 ** self.consecutive_errors, max(self.max_backoff, self.interval))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def get_status(self) -> Dict:
+        return {
+            'interval_seconds': self.interval,
+            'runs': self.runs,
+            'errors': self.errors,
+            'events': self.events,
+            'consecutive_errors': self.consecutive_errors,
+            'last_run': self.last_run,
+            'last_duration_seconds': round(self.last_duration, 3),
+            'last_error': self.last_error
+        }
+
+
+class ScanScheduler:
+    """Independent per-source scan tasks feeding one bounded event queue"""
+
+    def __init__(self, config: Optional[Dict] = None, default_interval: Optional[float] = None,
+                 checkpoints=None):
+        scanner_config = (config or {}).get('scanners', {})
+        # Sources without their own schedule fall back to SCAN_INTERVAL
+        self.default_interval = default_interval or scanner_config.get('scan_interval_seconds', 30)
+        self.schedules: Dict[str, Any] = scanner_config.get('schedules', {})
+        self.queue_size = scanner_config.get('queue_size', 100)
+        self.overflow = scanner_config.get('overflow', 'block')
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown scan queue overflow policy: {self.overflow}")
+
+        self.sources: Dict[str, ScanSource] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.queue: Optional[asyncio.Queue] = None
+        self.running = False
+        self.dropped_batches = 0
+        # OffsetCheckpointStore; batches carry a token the consumer completes once decoded
+        self.checkpoints = checkpoints
+
+    def add_source(self, name: str, scan: ScanFn,
+                   offset: Optional[Callable[[], Any]] = None) -> Optional[ScanSource]:
+        """Register a scanner using its entry under scanners.schedules, if any"""
+        schedule = self.schedules.get(name, {})
+        if not isinstance(schedule, dict):
+            schedule = {'interval': schedule}
+        if not schedule.get('enabled', True):
+            logger.info(f"Scanner {name} disabled by schedule")
+            return None
+
+        try:
+            interval = parse_cadence(schedule.get('interval', self.default_interval))
+        except ValueError as e:
+            logger.warning(f"{e}; scanning {name} every {self.default_interval}s")
+            interval = float(self.default_interval)
+
+        source = ScanSource(
+            name, scan, max(interval, 0.001),
+            jitter=schedule.get('jitter', 0.1),
+            max_backoff=parse_cadence(schedule.get('max_backoff', 300)),
+            offset=offset
+        )
+        self.sources[name] = source
+        return source
+
+    def start(self):
+        """Create one task per source on the running loop"""
+        if self.running:
+            return
+        self.running = True
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        for name, source in self.sources.items():
+            self.tasks[name] = asyncio.get_running_loop().create_task(self.run_source(source))
+        logger.info("⏱️ Scan scheduler started: " + ', '.join(
+            f"{name}={source.interval:g}s" for name, source in self.sources.items()))
+
+    async def run_source(self, source: ScanSource):
+        while self.running:
+            started = time.monotonic()
+            try:
+                events = await source.scan()
+                source.consecutive_errors = 0
+                token = None
+                if self.checkpoints is not None and source.offset is not None:
+                    token = self.checkpoints.track(source.name, source.offset())
+                if events:
+                    source.events += len(events)
+                    await self.publish(source.name, events, token)
+                elif token is not None:
+                    # Nothing to decode; the offset may still advance once earlier batches are consumed
+                    self.checkpoints.complete(token)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                source.errors += 1
+                source.consecutive_errors += 1
+                source.last_error = str(e)
+                logger.error(f"Scanner {source.name} error: {e}")
+            finally:
+                source.runs += 1
+                source.last_run = time.time()
+                source.last_duration = time.monotonic() - started
+
+            # Sleep relative to the start so the cadence does not drift with scan duration
+            await asyncio.sleep(max(0.0, source.next_delay() - (time.monotonic() - started)))
+
+    async def publish(self, name: str, events: List[Dict], token: Optional[Dict] = None):
+        """Enqueue a batch; a full queue blocks the scanner, or with drop_oldest sheds its oldest batch"""
+        if self.overflow == 'block':
+            await self.queue.put((name, events, token))
+            return
+        while True:
+            try:
+                self.queue.put_nowait((name, events, token))
+                return
+            except asyncio.QueueFull:
+                dropped_name, dropped, dropped_token = self.queue.get_nowait()
+                self.queue.task_done()
+                self.dropped_batches += 1
+                # The dropped events were never processed; keep them rather than silently skipping them
+                if self.checkpoints is not None:
+                    self.checkpoints.dead_letter(dropped_token, dropped, reason='dropped from full scan queue')
+                logger.warning(f"Scan queue full; dropped {len(dropped)} {dropped_name} events")
+
+    async def next_batch(self, timeout: Optional[float] = None) -> Optional[Tuple[str, List[Dict], Optional[Dict]]]:
+        """Next (source, events, checkpoint token) batch, or None on timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def stop(self):
+        self.running = False
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.tasks.clear()
+
+    def get_status(self) -> Dict:
+        return {
+            'running': self.running,
+            'queue_depth': self.queue.qsize() if self.queue else 0,
+            'queue_size': self.queue_size,
+            'overflow': self.overflow,
+            'dropped_batches': self.dropped_batches,
+            'sources': {name: source.get_status() for name, source in self.sources.items()}
+        }
@@ -0,0 +1,112 @@
+"""
+Stage Result Cache
+Content-addressed cache for orchestrator stage outputs. Each stage declares the
+inputs it reads and entries are keyed by a hash of their fingerprints (latest bar
+per symbol, sentiment row watermarks, regime version, config version), so an
+output is reused only while those inputs are unchanged. Per-stage TTLs bound how
+long an entry can live for data the fingerprints cannot see
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(inputs: Dict) -> str:
+    """Stable content hash of a stage's declared inputs"""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def table_watermark(db_path: str, table: str) -> Optional[List[int]]:
+    """[row count, max rowid] of a table: changes whenever rows are added or removed; None when unavailable"""
+    try:
+        conn = sqlite3.connect(db_path, timeout=5)
+        try:
+            count, max_rowid = conn.execute(f"SELECT COUNT(*), MAX(rowid) FROM {table}").fetchone()
+            return [count, max_rowid]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+class StageCache:
+    """Reuses a stage's last output while its input fingerprint is unchanged, for at most the stage's TTL"""
+
+    def __init__(self, max_age_seconds: float = 300, enabled: bool = True,
+                 ttl_seconds: Optional[Dict[str, float]] = None):
+        self.max_age_seconds = max_age_seconds
+        self.ttl_seconds = ttl_seconds or {}
+        self.enabled = enabled
+        self.entries: Dict[str, Dict] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _record(self, stage: str, outcome: str):
+        stage_stats = self.stats.setdefault(stage, {'hits': 0, 'misses': 0})
+        stage_stats[outcome] += 1
+
+    def ttl_for(self, stage: str) -> float:
+        """TTL for a cache key; per-symbol keys (stage:symbol) use their stage's TTL"""
+        return self.ttl_seconds.get(stage, self.ttl_seconds.get(stage.split(':', 1)[0], self.max_age_seconds))
+
+    def lookup(self, stage: str, key: str) -> Optional[Any]:
+        """Return the cached output for a stage if its fingerprint matches and it has not expired"""
+        entry = self.entries.get(stage)
+        if not self.enabled or entry is None or entry['fingerprint'] != key:
+            return None
+        if time.monotonic() - entry['stored_at'] > self.ttl_for(stage):
+            return None
+        return entry['result']
+
+    def store(self, stage: str, key: str, result: Any):
+        # Failed stage outputs are never reused
+        if isinstance(result, dict) and 'error' in result:
+            self.entries.pop(stage, None)
+            return
+        self.entries[stage] = {
+            'fingerprint': key,
+            'result': result,
+            'stored_at': time.monotonic()
+        }
+
+    async def get_or_compute(self, stage: str, inputs: Dict,
+                             compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached stage output or await compute() and cache it"""
+        key = fingerprint(inputs)
+        cached = self.lookup(stage, key)
+        if cached is not None:
+            self._record(stage, 'hits')
+            return cached
+
+        self._record(stage, 'misses')
+        result = await compute()
+        self.store(stage, key, result)
+        return result
+
+    def invalidate(self, stage: Optional[str] = None):
+        """Drop one stage's entry, or every entry"""
+        if stage is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(stage, None)
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters per stage and overall"""
+        hits = sum(s['hits'] for s in self.stats.values())
+        misses = sum(s['misses'] for s in self.stats.values())
+        total = hits + misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self.entries),
+            'ttl_seconds': {'default': self.max_age_seconds, **self.ttl_seconds},
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'stages': {stage: dict(stats) for stage, stats in self.stats.items()}
+        }
@@ -0,0 +1,185 @@
+"""
+State Journal
+Incremental platform state persistence: each save appends only the sections
+that changed to a JSON-lines journal, and the journal is periodically compacted
+into a full snapshot (state.json). An in-memory read model serves API handlers
+so requests never re-parse state from disk
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def set_path(state: Dict, path: str, value: Any) -> Dict:
+    """Return a copy of state with the dotted path set, copying only the dicts along the path"""
+    head, _, rest = path.partition('.')
+    updated = dict(state)
+    if rest:
+        child = state.get(head)
+        updated[head] = set_path(child if isinstance(child, dict) else {}, rest, value)
+    else:
+        updated[head] = value
+    return updated
+
+
+def get_path(state: Dict, path: str, default: Any = None) -> Any:
+    node = state
+    for key in path.split('.'):
+        if not isinstance(node, dict) or key not in node:
+            return default
+        node = node[key]
+    return node
+
+
+class StateJournal:
+    """Append-only state deltas with snapshot compaction and a copy-on-write read model"""
+
+    def __init__(self, state_manager=None, config: Optional[Dict] = None,
+                 journal_path: Optional[str] = None, snapshot_path: Optional[str] = None):
+        settings = (config or {}).get('state_journal', {})
+        self.journal_path = journal_path or settings.get('journal_path', 'state.journal')
+        self.snapshot_path = snapshot_path or settings.get('snapshot_path', 'state.json')
+        self.compact_every = settings.get('compact_every', 50)
+        self.compact_bytes = settings.get('compact_bytes', 5 * 1024 * 1024)
+        self.fsync = settings.get('fsync', False)
+
+        # The existing StateManager owns the snapshot format when available
+        self.load_snapshot: Callable[[], Dict] = state_manager.load_state if state_manager else self.read_snapshot
+        self.save_snapshot: Callable[[Dict], Any] = state_manager.save_state if state_manager else self.write_snapshot
+
+        self._lock = threading.Lock()
+        self.state: Dict = {}
+        self.encoded: Dict[str, str] = {}
+        self.entries = 0
+        self.stats = {'records': 0, 'changed_keys': 0, 'unchanged_keys': 0, 'compactions': 0,
+                      'replayed': 0, 'corrupt_lines': 0, 'bytes_written': 0}
+
+    def read_snapshot(self) -> Dict:
+        if not os.path.exists(self.snapshot_path):
+            return {}
+        with open(self.snapshot_path) as f:
+            return json.load(f)
+
+    def write_snapshot(self, state: Dict):
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load(self) -> Dict:
+        """Rebuild the read model from the last snapshot plus any journal entries written after it"""
+        with self._lock:
+            try:
+                state = self.load_snapshot() or {}
+            except Exception as e:
+                logger.warning(f"Failed to read state snapshot: {e}")
+                state = {}
+
+            entries = 0
+            torn = 0
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path) as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A torn final write after a crash; everything before it is intact
+                            torn += 1
+                            continue
+                        for path, value in entry.get('set', {}).items():
+                            state = set_path(state, path, value)
+                        entries += 1
+
+            self.state = state
+            self.encoded = {}
+            self.entries = entries
+            self.stats['replayed'] += entries
+            self.stats['corrupt_lines'] += torn
+            if entries:
+                logger.info(f"Replayed {entries} state journal entries")
+            if torn:
+                # Start a clean journal so new appends do not land on the torn line
+                logger.warning(f"Skipped {torn} corrupt state journal lines")
+                self.entries = max(entries, 1)
+                self.compact_locked()
+            return state
+
+    def record(self, changes: Dict[str, Any]) -> int:
+        """Append the changed dotted-path values as one journal entry; returns how many changed"""
+        with self._lock:
+            delta = {}
+            for path, value in changes.items():
+                encoded = json.dumps(value, sort_keys=True, default=str)
+                if self.encoded.get(path) == encoded:
+                    self.stats['unchanged_keys'] += 1
+                    continue
+                self.encoded[path] = encoded
+                delta[path] = json.loads(encoded)
+
+            self.stats['records'] += 1
+            if not delta:
+                return 0
+
+            line = json.dumps({'ts': time.time(), 'set': delta}, default=str) + '\n'
+            with open(self.journal_path, 'a') as f:
+                f.write(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+            state = self.state
+            for path, value in delta.items():
+                state = set_path(state, path, value)
+            self.state = state
+            self.entries += 1
+            self.stats['changed_keys'] += len(delta)
+            self.stats['bytes_written'] += len(line)
+
+            if self.entries >= self.compact_every or self.journal_size() >= self.compact_bytes:
+                self.compact_locked()
+            return len(delta)
+
+    def journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and truncate it"""
+        with self._lock:
+            self.compact_locked()
+
+    def compact_locked(self):
+        if not self.entries:
+            return
+        self.save_snapshot(self.state)
+        # Truncate only after the snapshot is durable; replaying a journal over its own snapshot is idempotent
+        with open(self.journal_path, 'w'):
+            pass
+        self.entries = 0
+        self.stats['compactions'] += 1
+        logger.info("🗜️ State journal compacted into snapshot")
+
+    def read(self) -> Dict:
+        """Current state; treat as read-only, it is replaced rather than mutated on each record"""
+        return self.state
+
+    def get(self, path: str, default: Any = None) -> Any:
+        return get_path(self.state, path, default)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'pending_entries': self.entries,
+            'journal_bytes': self.journal_size(),
+            'compact_every': self.compact_every
+        }